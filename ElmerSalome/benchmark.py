@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark for the creation of editors
+
+Measures the time to add new boundary conditions through the
+ElmerWindowHandler. Requires ElmerSolver and the ElmerGUI edf-files.
+
+    python benchmark.py [count]
+"""
+import sys
+import time
+try:
+    from PyQt4 import QtGui
+except ImportError:
+    from PyQt5 import QtWidgets as QtGui
+
+
+sys.dont_write_bytecode = True
+
+import elmer_window_handler
+import dynamiceditor
+
+
+def addBoundaryConditions(ewh, count, build=False):
+    """Adds count new boundary conditions.
+
+    Args:
+    -----
+    ewh: ElmerWindowHandler-class
+        window handler the boundary conditions are added to
+    count: int
+        number of boundary conditions
+    build: bool
+        create the widgets of all tabs of each new editor
+
+    Return:
+    -------
+    float
+        elapsed time in seconds
+    """
+    ewh.showAddBoundaryCondition(visible=False)
+    start = time.perf_counter()
+    for i in range(count):
+        ewh.boundaryConditionEditorFinishedSlot(dynamiceditor.MatTypes.MAT_NEW, i)
+        if build:
+            len(ewh.boundaryConditionEditor.editor.qhash)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    app = QtGui.QApplication(sys.argv)
+    count = 100
+    if len(sys.argv) > 1:
+        count = int(sys.argv[1])
+
+    for build in [False, True]:
+        ewh = elmer_window_handler.ElmerWindowHandler()
+        elapsed = addBoundaryConditions(ewh, count, build)
+        print("{} boundary conditions{}: {:.3f} s ({:.2f} ms each)".format(
+            count, " (all tabs built)" if build else "", elapsed,
+            1000. * elapsed / count))
@@ -9,11 +9,11 @@ Body property editor class
 try:
     from PyQt4 import QtGui
     from PyQt4 import QtCore
-    from PyQt4 import uic
 except ImportError:
     from PyQt5 import QtWidgets as QtGui
     from PyQt5 import QtCore
-    from PyQt5 import uic
+
+import uiforms
 
 
 class BodyPropertyEditor(QtGui.QDialog):
@@ -34,7 +34,7 @@ class BodyPropertyEditor(QtGui.QDialog):
         """
         super(BodyPropertyEditor, self).__init__()
 
-        uic.loadUi(path_forms.joinpath("bodypropertyeditor.ui"), self)
+        uiforms.loadUi(path_forms.joinpath("bodypropertyeditor.ui"), self)
 
         # public
         self.material = None
@@ -10,11 +10,11 @@ Boundary property editor class
 try:
     from PyQt4 import QtGui
     from PyQt4 import QtCore
-    from PyQt4 import uic
 except ImportError:
     from PyQt5 import QtWidgets as QtGui
     from PyQt5 import QtCore
-    from PyQt5 import uic
+
+import uiforms
 
 
 class BoundaryPropertyEditor(QtGui.QDialog):
@@ -35,7 +35,7 @@ class BoundaryPropertyEditor(QtGui.QDialog):
         """
         super(BoundaryPropertyEditor, self).__init__()
 
-        uic.loadUi(path_forms.joinpath("boundarypropertyeditor.ui"), self)
+        uiforms.loadUi(path_forms.joinpath("boundarypropertyeditor.ui"), self)
 
         self.bodyCondition = 0
         self.objName = None
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+Bulk edit class
+
+Sets, scales or replaces the value of a keyword for many entities of a
+section (equations, materials, ...) at once. The values are changed in the
+SectionStore, the editor of the section is refreshed once at the end.
+"""
+try:
+    from PyQt4 import QtGui
+except ImportError:
+    from PyQt5 import QtWidgets as QtGui
+
+OPERATIONS = ["Set", "Scale", "Replace"]
+
+
+def setTo(value):
+    """Returns the function setting a parameter to value.
+
+    Args:
+    -----
+    value: str
+        new value, 'True' or 'False' for checkboxes
+    """
+    def function(param, current):
+        if param.widget_type == "CheckBox":
+            return value == "True"
+        elif param.widget_type == "Combo" and value not in param.items:
+            return None
+        return value
+    return function
+
+
+def scaleBy(factor):
+    """Returns the function multiplying a numeric parameter by factor, other
+    values (expressions, tables, ...) are not changed.
+
+    Args:
+    -----
+    factor: float
+        scale factor
+    """
+    def function(param, current):
+        if param.widget_type != "Edit":
+            return None
+        try:
+            number = float(current)
+        except ValueError:
+            return None
+        return '{:.12g}'.format(number * factor)
+    return function
+
+
+def replace(old, new):
+    """Returns the function replacing old by new in the text of a parameter,
+    the item of a combobox is only replaced as a whole.
+
+    Args:
+    -----
+    old: str
+        text to replace
+    new: str
+        replacement
+    """
+    def function(param, current):
+        if param.widget_type in ("Edit", "TextEdit"):
+            if old and old in current:
+                return current.replace(old, new)
+        elif param.widget_type == "Combo":
+            if current == old and new in param.items:
+                return new
+        return None
+    return function
+
+
+def keywords(store):
+    """Returns the sorted sif names of all parameters of a section that can
+    be edited"""
+    names = set()
+    for param in store.params:
+        if param.widget_type in ("Edit", "TextEdit", "Combo", "CheckBox"):
+            names.add(param.sifName)
+    return sorted(names)
+
+
+def bulkEdit(registry, keyword, function, ids=None):
+    """Changes a keyword of many entities in one batch.
+
+    Args:
+    -----
+    registry: EntityRegistry-class
+        registry of the section
+    keyword: str
+        sif name of the parameter or its path ("/PDE/Section/Name")
+    function: callable
+        operation as returned by setTo, scaleBy or replace
+    ids: list, optional
+        IDs of the entities, the entities shown by the browser if not given
+
+    Return:
+    -------
+    list
+        IDs of the changed entities
+    """
+    store = registry.store
+    if ids is None:
+        ids = registry.filtered()
+    if keyword in store.index:
+        pids = [store.index[keyword]]
+    else:
+        pids = store.sifIndex.get(keyword, [])
+    changed = store.updateValues(ids, pids, function)
+    # widgets are only updated once for the whole batch
+    editor = registry.editor
+    if editor is not None and editor.ID in changed:
+        editor.refresh()
+    return changed
+
+
+class BulkEditDialog(QtGui.QDialog):
+    """Dialog to change a keyword for all entities shown by the browser of a
+    section window"""
+
+    def __init__(self, registry):
+        """Constructor.
+
+        Args:
+        -----
+        registry: EntityRegistry-class
+            registry of the section
+        """
+        super(BulkEditDialog, self).__init__()
+        self.setWindowTitle("Bulk edit")
+
+        # public
+        self.registry = registry
+
+        self.keywordCombo = QtGui.QComboBox()
+        self.keywordCombo.setEditable(True)
+        self.keywordCombo.addItems(keywords(registry.store))
+        self.operationCombo = QtGui.QComboBox()
+        self.operationCombo.addItems(OPERATIONS)
+        self.valueEdit = QtGui.QLineEdit()
+        self.replaceEdit = QtGui.QLineEdit()
+        self.replaceEdit.setEnabled(False)
+        self.statusLabel = QtGui.QLabel()
+        self.applyButton = QtGui.QPushButton("&Apply")
+        self.closeButton = QtGui.QPushButton("&Close")
+
+        self.operationCombo.currentIndexChanged.connect(self._operationChanged)
+        self.applyButton.clicked.connect(self.apply)
+        self.closeButton.clicked.connect(self.close)
+
+        form = QtGui.QFormLayout()
+        form.addRow("Keyword:", self.keywordCombo)
+        form.addRow("Operation:", self.operationCombo)
+        form.addRow("Value:", self.valueEdit)
+        form.addRow("Replace with:", self.replaceEdit)
+        buttonLayout = QtGui.QHBoxLayout()
+        buttonLayout.addWidget(self.applyButton)
+        buttonLayout.addWidget(self.closeButton)
+        mainLayout = QtGui.QVBoxLayout()
+        mainLayout.addLayout(form)
+        mainLayout.addWidget(self.statusLabel)
+        mainLayout.addLayout(buttonLayout)
+        self.setLayout(mainLayout)
+
+    def _operationChanged(self, index):
+        self.replaceEdit.setEnabled(OPERATIONS[index] == "Replace")
+
+    def apply(self):
+        """Applies the operation to all entities shown by the browser
+
+        Return:
+        -------
+        list or None
+            IDs of the changed entities, None if the input is invalid
+        """
+        keyword = str(self.keywordCombo.currentText()).strip()
+        operation = OPERATIONS[self.operationCombo.currentIndex()]
+        value = str(self.valueEdit.text()).strip()
+        store = self.registry.store
+        if keyword not in store.sifIndex and keyword not in store.index:
+            QtGui.QMessageBox.warning(self, "Bulk edit", "Unknown keyword " + keyword)
+            return None
+        if operation == "Set":
+            function = setTo(value)
+        elif operation == "Scale":
+            try:
+                function = scaleBy(float(value))
+            except ValueError:
+                QtGui.QMessageBox.warning(self, "Bulk edit", "Scale factor must be a number")
+                return None
+        else:
+            function = replace(value, str(self.replaceEdit.text()).strip())
+        ids = self.registry.filtered()
+        changed = bulkEdit(self.registry, keyword, function, ids)
+        self.statusLabel.setText("{} of {} changed".format(len(changed), len(ids)))
+        return changed
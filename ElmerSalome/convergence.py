@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+"""
+Convergence monitor class
+
+Parses the output of a running ElmerSolver for the ComputeChange lines of the
+nonlinear (NS) and steady state (SS) iterations, the residuals printed by the
+iterative linear solvers and the timestep numbers. The values are kept per
+solver in ring buffers of fixed size and are shown in a small live plot.
+"""
+try:
+    from PyQt4 import QtGui
+    from PyQt4 import QtCore
+except ImportError:
+    from PyQt5 import QtWidgets as QtGui
+    from PyQt5 import QtGui as QtPaint
+    from PyQt5 import QtCore
+else:
+    QtPaint = QtGui
+
+import re
+
+import numpy as np
+
+# number of iterations kept per solver
+DEFAULT_SIZE = 2000
+
+# columns of the ring buffers
+SAMPLE, TIMESTEP, KIND, ITERATION, NORM, CHANGE, LINEAR = range(7)
+COLUMNS = 7
+
+# kinds of the iterations
+NONLINEAR = 0
+STEADY_STATE = 1
+
+# one scan of each output chunk, only the matching lines are handled in Python
+_pattern = re.compile(r"ComputeChange:\s+(?P<kind>NS|SS)\s+\(ITER=(?P<iter>\d+)\)\s+"
+                      r"\(NRM,RELC\):\s+\(\s*(?P<norm>\S+)\s+(?P<change>\S+)\s*\)\s*::\s*(?P<solver>[^\r\n]*?)\s*$"
+                      r"|MAIN:\s+Time:\s+(?P<timestep>\d+)/"
+                      r"|^\s+(?P<linear>\d+)(?:\s+[-+]?\d\.\d+E[-+]\d+){1,2}\s*$",
+                      re.MULTILINE)
+
+
+def _number(text):
+    """Converts a number of the solver output, Fortran may drop the E of
+    three digit exponents"""
+    try:
+        return float(text)
+    except ValueError:
+        match = re.match(r"([-+]?[\d.]+)([-+]\d+)$", text)
+        if match is None:
+            return np.nan
+        return float(match.group(1) + "E" + match.group(2))
+
+
+class RingBuffer():
+    """Fixed number of the last rows of values in a NumPy array"""
+
+    def __init__(self, size=DEFAULT_SIZE, columns=COLUMNS):
+        """Constructor
+
+        Args:
+        -----
+        size: int
+            number of rows kept
+        columns: int
+            number of values per row
+        """
+        # public
+        self.count = 0  # number of rows appended in total
+
+        # private
+        self._data = np.full((size, columns), np.nan)
+
+    def append(self, row):
+        """Appends a row, the oldest row is overwritten if the buffer is
+        full"""
+        self._data[self.count % len(self._data)] = row
+        self.count += 1
+
+    def values(self):
+        """Returns a copy of the rows kept, oldest first"""
+        size = len(self._data)
+        if self.count <= size:
+            return self._data[:self.count].copy()
+        start = self.count % size
+        return np.concatenate((self._data[start:], self._data[:start]))
+
+    def last(self):
+        """Returns the last row, None if the buffer is empty"""
+        if self.count == 0:
+            return None
+        return self._data[(self.count - 1) % len(self._data)]
+
+    def __len__(self):
+        return min(self.count, len(self._data))
+
+
+class ConvergenceMonitor(QtCore.QObject):
+    """Incremental parser of the solver output. Chunks of any size are fed
+    as they arrive, a line split between two chunks is kept until its end
+    has arrived."""
+
+    # signals
+    solverAdded = QtCore.pyqtSignal(str, name="solverAdded")
+
+    def __init__(self, size=DEFAULT_SIZE):
+        """Constructor
+
+        Args:
+        -----
+        size: int
+            number of iterations kept per solver
+        """
+        super(ConvergenceMonitor, self).__init__()
+
+        # public
+        self.size = size
+        self.buffers = {}  # RingBuffer by solver name, in order of appearance
+        self.totals = {}  # [nonlinear, steady state, linear] iterations in total by solver name
+        self.timestep = 0
+        self.version = 0  # incremented with every new value
+
+        # private
+        self._rest = ""
+        self._linear = 0  # iterations of the last linear solve
+        self._sample = 0
+
+    def feed(self, text):
+        """Parses a chunk of the solver output.
+
+        Args:
+        -----
+        text: str
+            output as read from the process
+        """
+        end = text.rfind("\n")
+        if end < 0:
+            self._rest += text
+            return
+        lines = self._rest + text[:end + 1]
+        self._rest = text[end + 1:]
+        for match in _pattern.finditer(lines):
+            linear = match.group("linear")
+            if linear is not None:
+                self._linear = int(linear)
+            elif match.group("timestep") is not None:
+                self.timestep = int(match.group("timestep"))
+            else:
+                self._add(match)
+
+    def _add(self, match):
+        solver = match.group("solver")
+        buffer = self.buffers.get(solver)
+        if buffer is None:
+            buffer = RingBuffer(self.size)
+            self.buffers.update({solver: buffer})
+            self.totals.update({solver: [0, 0, 0]})
+            self.solverAdded.emit(solver)
+        kind = NONLINEAR if match.group("kind") == "NS" else STEADY_STATE
+        totals = self.totals[solver]
+        totals[kind] += 1
+        if kind == NONLINEAR:
+            totals[2] += self._linear
+        buffer.append((self._sample, self.timestep, kind, int(match.group("iter")),
+                       _number(match.group("norm")), _number(match.group("change")),
+                       self._linear if kind == NONLINEAR else np.nan))
+        self._linear = 0
+        self._sample += 1
+        self.version += 1
+
+    def history(self, solver, kind=NONLINEAR):
+        """Returns the iterations of a solver.
+
+        Args:
+        -----
+        solver: str
+            name of the solver as printed by ComputeChange
+        kind: int
+            NONLINEAR or STEADY_STATE
+
+        Return:
+        -------
+        ndarray
+            rows of the iterations kept, see the column constants
+        """
+        values = self.buffers[solver].values()
+        return values[values[:, KIND] == kind]
+
+    def summary(self):
+        """Returns the last values of every solver
+
+        Return:
+        -------
+        dict
+            by solver name a dict with the keys timestep, kind, iteration,
+            norm, change, linear (iterations of the last linear solve) and
+            count (number of iterations in total)
+        """
+        result = {}
+        for solver, buffer in self.buffers.items():
+            last = buffer.last()
+            result.update({solver: {"timestep": int(last[TIMESTEP]), "kind": int(last[KIND]),
+                                    "iteration": int(last[ITERATION]), "norm": float(last[NORM]),
+                                    "change": float(last[CHANGE]), "linear": float(last[LINEAR]),
+                                    "count": buffer.count}})
+        return result
+
+
+class ConvergencePlot(QtGui.QWidget):
+    """Relative change of the nonlinear iterations of every solver on a
+    logarithmic scale over the iterations"""
+
+    COLORS = [QtCore.Qt.blue, QtCore.Qt.red, QtCore.Qt.darkGreen, QtCore.Qt.magenta,
+              QtCore.Qt.darkCyan, QtCore.Qt.darkYellow, QtCore.Qt.black]
+
+    def __init__(self, monitor):
+        super(ConvergencePlot, self).__init__()
+        self.monitor = monitor
+        self.setMinimumSize(400, 250)
+
+    def paintEvent(self, event):
+        painter = QtPaint.QPainter(self)
+        painter.fillRect(self.rect(), QtCore.Qt.white)
+        margin = 40
+        width = self.width() - 2 * margin
+        height = self.height() - 2 * margin
+        painter.drawRect(margin, margin, width, height)
+        curves = []
+        for solver in self.monitor.buffers:
+            values = self.monitor.history(solver)
+            values = values[values[:, CHANGE] > 0]
+            if len(values):
+                curves.append((solver, values[:, SAMPLE], np.log10(values[:, CHANGE])))
+        if not curves:
+            painter.drawText(margin + 5, margin + 15, "No iterations yet")
+            return
+        xmin = min([x.min() for solver, x, y in curves])
+        xmax = max([x.max() for solver, x, y in curves])
+        ymin = np.floor(min([y.min() for solver, x, y in curves]))
+        ymax = np.ceil(max([y.max() for solver, x, y in curves]))
+        xscale = width / max(xmax - xmin, 1.)
+        yscale = height / max(ymax - ymin, 1.)
+        painter.drawText(5, margin + 10, "1e{:.0f}".format(ymax))
+        painter.drawText(5, margin + height, "1e{:.0f}".format(ymin))
+        for number, (solver, x, y) in enumerate(curves):
+            painter.setPen(QtPaint.QPen(self.COLORS[number % len(self.COLORS)]))
+            px = margin + (x - xmin) * xscale
+            py = margin + height - (y - ymin) * yscale
+            painter.drawPolyline(QtPaint.QPolygonF([QtCore.QPointF(a, b) for a, b in zip(px, py)]))
+            painter.drawText(margin + 5, margin + 15 * (number + 1), solver)
+
+
+class ConvergenceView(QtGui.QWidget):
+    """Window with the live plot and the last values of every solver. The
+    window is redrawn by a timer, not for every chunk of output."""
+
+    def __init__(self, monitor, title="Convergence"):
+        """Constructor.
+
+        Args:
+        -----
+        monitor: ConvergenceMonitor-class
+            parser of the output of the run
+        title: str
+            window title
+        """
+        super(ConvergenceView, self).__init__()
+        self.setWindowTitle(title)
+
+        # public
+        self.monitor = monitor
+        self.plot = ConvergencePlot(monitor)
+        self.statusLabel = QtGui.QLabel()
+
+        # private
+        self._version = -1
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(500)
+        self._timer.timeout.connect(self.refresh)
+
+        layout = QtGui.QVBoxLayout()
+        layout.addWidget(self.plot)
+        layout.addWidget(self.statusLabel)
+        self.setLayout(layout)
+
+    def refresh(self):
+        """Redraws the plot if there are new values"""
+        if self._version == self.monitor.version:
+            return
+        self._version = self.monitor.version
+        lines = []
+        for solver, last in self.monitor.summary().items():
+            lines.append("{}: timestep {}, iteration {}, norm {:.4g}, change {:.3g}".format(
+                solver, last["timestep"], last["iteration"], last["norm"], last["change"]))
+        self.statusLabel.setText("\n".join(lines))
+        self.plot.update()
+
+    def showEvent(self, event):
+        self.refresh()
+        self._timer.start()
+        super(ConvergenceView, self).showEvent(event)
+
+    def hideEvent(self, event):
+        self._timer.stop()
+        super(ConvergenceView, self).hideEvent(event)
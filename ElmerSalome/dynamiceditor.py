@@ -27,6 +27,8 @@ except ImportError:
     from PyQt5 import QtXml
     from PyQt5 import QtCore
 
+import valuestore
+
 
 class MatTypes():
     """Enumeration class for signals"""
@@ -52,10 +54,285 @@ class hash_entry_t():
     :widget: type of widget
     :label: label of the corresponding label
     :elem: contains xml-information about the linked elements
+    :hideable: widget may be hidden when deactivated (has Visible-attribute)
+    :pid: parameter-ID of the value in the SectionStore
     """
     widget = None
     label = None
     elem = None
+    hideable = False
+    pid = -1
+
+
+class param_t():
+    """
+    Precomputed description of a parameter of the elmerDefs. Shared by all
+    editors of the same section.
+
+    :path: address of the parameter without the ID ("/PDE/Section/Name")
+    :widget_type: type of the widget
+    :enabled: initial enabled state of the widget
+    :visible: initial visibility of the widget
+    :hideable: widget may be hidden when deactivated (has Visible-attribute)
+    :labelName: name of the parameter
+    :sifName: keyword of the parameter in the sif-file
+    :default: default value of the parameter
+    :whatis: whats-this text of the widget
+    :statusTip: status tip of the widget
+    :items: names of the items of a combo box
+    :active: index of the active item of a combo box
+    :elem: xml-element of the parameter
+    """
+    path = ""
+    widget_type = "Edit"
+    enabled = True
+    visible = True
+    hideable = False
+    labelName = ""
+    sifName = ""
+    default = ""
+    whatis = ""
+    statusTip = ""
+    items = ()
+    active = 0
+    elem = None
+
+
+class SectionLayout():
+    """Layout description of a section (Equation, Material, ...) compiled
+    once from the elmerDefs. Editors of the same section are stamped out
+    from it and only differ in the ID suffix of their addresses."""
+
+    def __init__(self, elmerDefs, Section):
+        """Constructor
+
+        Args:
+        -----
+        elmerDefs: QDomDocument
+            contents of the Elmer edf files in xml-format
+        Section: str
+            Type of base layout
+        """
+        # public
+        self.section = Section
+        self.tabs = []  # list of (tab name, list of param_t)
+        self.activation = {}  # compiled Activate/Deactivate rules by path
+        self.count = 0  # number of PDEs in the elmerDefs
+
+        root = elmerDefs.documentElement()
+        all_stuff = root.firstChildElement("ALL")
+        element = root.firstChildElement("PDE")
+        while(element.isNull() is False):
+            name = str(element.firstChildElement("Name").text()).strip()
+            params = []
+            if(name != "General"):
+                self._addParameters(all_stuff.firstChildElement(Section), name, params)
+            self._addParameters(element.firstChildElement(Section), name, params)
+            if(params):
+                self.tabs.append((name, params))
+            self.count += 1
+            element = element.nextSiblingElement("PDE")
+
+    def _addParameters(self, section, name, params):
+        """Appends the descriptions of all parameters of a section.
+
+        Args:
+        -----
+        section: QDomElement
+            section of the elmerDefs
+        name: str
+            name of the PDE
+        params: list
+            list the param_t-objects are appended to
+        """
+        param = section.firstChildElement("Parameter")
+        while(param.isNull() is False):
+            p = param_t()
+            p.widget_type = param.attribute("Widget", "Edit")
+            p.enabled = param.attribute("Enabled", "True") != "False"
+            p.visible = param.attribute("Visible", "True") != "False"
+            p.hideable = param.hasAttribute("Visible")
+            p.labelName = str(param.firstChildElement("Name").text()).strip()
+            p.sifName = str(param.firstChildElement("SifName").text()).strip()
+            if(p.sifName == ""):
+                p.sifName = p.labelName
+            p.default = str(param.firstChildElement("DefaultValue").text()).strip()
+            p.whatis = str(param.firstChildElement("Whatis").text()).strip()
+            p.statusTip = str(param.firstChildElement("StatusTip").text()).strip()
+            p.path = "/" + name + "/" + self.section + "/" + p.labelName
+            p.elem = param
+            if(p.widget_type == "Combo"):
+                items = []
+                item = param.firstChildElement("Item")
+                while(item.isNull() is False):
+                    if(item.attribute("Type", "") == "Active"):
+                        p.active = len(items)
+                    items.append(str(item.firstChildElement("Name").text()).strip())
+                    item = item.nextSiblingElement("Item")
+                p.items = tuple(items)
+            self._compileActivation(param, p.widget_type, p.path)
+            params.append(p)
+            param = param.nextSiblingElement("Parameter")
+
+    def _compileActivation(self, param, widget_type, pathName):
+        """Compiles the Activate/Deactivate rules of a parameter into the
+        activation table of the section. The table maps the value of the
+        widget to the addresses of the widgets that have to be enabled and
+        disabled, so that the slots do not need to touch the xml-document.
+
+        Args:
+        -----
+        param: QDomElement
+            xml-element of the parameter
+        widget_type: str
+            type of the widget of the parameter
+        pathName: str
+            address of the parameter without the ID
+        """
+        if(widget_type == "CheckBox"):
+            activate = self._collectTargets(param, "Activate")
+            deactivate = self._collectTargets(param, "Deactivate")
+            if(activate or deactivate):
+                self.activation[pathName] = {True: (activate, deactivate),
+                                             False: (deactivate, activate)}
+        elif(widget_type == "Edit"):
+            activate = self._collectTargets(param, "Activate")
+            if(activate):
+                self.activation[pathName] = {True: (activate, ()),
+                                             False: ((), activate)}
+        elif(widget_type == "Combo"):
+            targets = {}
+            item = param.firstChildElement("Item")
+            while(item.isNull() is False):
+                itemName = str(item.firstChildElement("Name").text()).strip()
+                targets[itemName] = self._collectTargets(item, "Activate")
+                item = item.nextSiblingElement("Item")
+            allTargets = set()
+            for activate in targets.values():
+                allTargets.update(activate)
+            if(allTargets):
+                rule = {}
+                for itemName, activate in targets.items():
+                    deactivate = tuple(x for x in sorted(allTargets) if x not in activate)
+                    rule[itemName] = (activate, deactivate)
+                self.activation[pathName] = rule
+
+    def _collectTargets(self, elem, tag):
+        """Returns the addresses given in the child elements 'tag' of elem.
+
+        Args:
+        -----
+        elem: QDomElement
+            xml-element containing the rules
+        tag: str
+            'Activate' or 'Deactivate'
+        """
+        targets = []
+        target = elem.firstChildElement(tag)
+        while(target.isNull() is False):
+            targets.append(str(target.text()).strip())
+            target = target.nextSiblingElement(tag)
+        return tuple(targets)
+
+
+_layouts = {}
+
+
+def sectionLayout(elmerDefs, Section):
+    """Returns the layout description of Section. The description is
+    compiled on first use and cached for the given elmerDefs.
+
+    Args:
+    -----
+    elmerDefs: QDomDocument
+        contents of the Elmer edf files in xml-format
+    Section: str
+        Type of base layout
+    """
+    key = (id(elmerDefs), Section)
+    cached = _layouts.get(key)
+    if cached is None or cached[0] is not elmerDefs:
+        cached = (elmerDefs, SectionLayout(elmerDefs, Section))
+        _layouts.update({key: cached})
+    return cached[1]
+
+
+class DynHash(dict):
+    """
+    Dictionary of the hash_entry_t-objects of a DynamicEditor. Entries of
+    tabs that have not been built yet are created on first access, iterating
+    the dictionary builds all remaining tabs.
+
+    :build: callable creating the tab of a given key
+    :buildAll: callable creating all remaining tabs
+    """
+
+    def __init__(self, build, buildAll):
+        """Constructor"""
+        super(DynHash, self).__init__()
+        self._build = build
+        self._buildAll = buildAll
+
+    def __missing__(self, key):
+        if self._build(key):
+            return dict.__getitem__(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        if dict.__contains__(self, key):
+            return True
+        return self._build(key) and dict.__contains__(self, key)
+
+    def __iter__(self):
+        self._buildAll()
+        return dict.__iter__(self)
+
+    def __len__(self):
+        self._buildAll()
+        return dict.__len__(self)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        self._buildAll()
+        return dict.keys(self)
+
+    def values(self):
+        self._buildAll()
+        return dict.values(self)
+
+    def items(self):
+        self._buildAll()
+        return dict.items(self)
+
+
+class DynTab(QtGui.QScrollArea):
+    """Placeholder of a tab in the DynamicEditor. The widgets are created by
+    the editor the first time the tab is shown."""
+
+    def __init__(self, name, build):
+        """Constructor
+
+        Args:
+        -----
+        name: str
+            name of the tab
+        build: callable
+            creates the widgets of the tab by name
+        """
+        super(DynTab, self).__init__()
+        self.name = name
+        self._build = build
+        self.setMinimumHeight(300)
+        self.setWidgetResizable(True)
+
+    def showEvent(self, event):
+        self._build(self.name)
+        super(DynTab, self).showEvent(event)
 
 
 class DynLineEdit(QtGui.QWidget):
@@ -139,7 +416,9 @@ class DynamicEditor(QtGui.QWidget):
         self.applyButton = None
         self.spareButton = None
         self.discardButton = None
-        self.qhash = {}
+        self.qhash = DynHash(self._buildTabOf, self._buildAllTabs)
+        self.store = None
+        self.cache = None  # EditorCache the built tabs are registered in
 
         self.tabWidget = None
         self.nameEdit = None
@@ -149,14 +428,13 @@ class DynamicEditor(QtGui.QWidget):
         self.spareScroll = None
 
         # private
-        self._root = None
-        self._all_stuff = None
-        self._element = None
-        self._name = None
-        self._section = None
-        self._param = None
-
-    def setupTabs(self, elmerDefs, Section, ID):
+        self._layout = None
+        self._activation = {}
+        self._pending = {}
+        self._tabs = {}  # placeholders by name
+        self._holdTabs = False  # prevents the release of tabs while building
+
+    def setupTabs(self, elmerDefs, Section, ID, store=None):
         """Creates the tabs of the dynamic widget according to the elmerDefs
 
         Args:
@@ -167,9 +445,40 @@ class DynamicEditor(QtGui.QWidget):
             Type of base layout
         ID: int
             ID of the dynamiceditor-instance        
+        store: SectionStore-class, optional
+            store keeping the values of the section, a private store is
+            created if not provided
         """
+        self.setupLayout(sectionLayout(elmerDefs, Section), ID, store)
+
+    def setupLayout(self, sectionLayout, ID, store=None):
+        """Creates the tabs of the dynamic widget according to a precomputed
+        layout description. Only placeholders are created here, the widgets
+        of a tab are created when the tab is shown for the first time or one
+        of its entries is requested from the qhash.
+
+        Args:
+        -----
+        sectionLayout: SectionLayout-class
+            layout description of the section
+        ID: int
+            ID of the dynamiceditor-instance
+        store: SectionStore-class, optional
+            store keeping the values of the section, a private store is
+            created if not provided
+        """
+        Section = sectionLayout.section
         self.ID = ID
         self.qhash.clear()
+        if store is None:
+            store = valuestore.SectionStore(sectionLayout)
+        if not store.hasEntity(ID):
+            store.addEntity(ID, Section + " " + str(ID+1))
+        self.store = store
+        self._layout = sectionLayout
+        self._activation = sectionLayout.activation
+        self._pending.clear()
+        self._tabs.clear()
 
         layout = self.layout()
         if(layout is not None):
@@ -182,161 +491,23 @@ class DynamicEditor(QtGui.QWidget):
                 item = layout.takeAt(0)
             self.layout = None
 
-        # get root element
-        self._root = elmerDefs.documentElement()
-
         self.tabWidget = QtGui.QTabWidget()
         self.tabWidget.setUsesScrollButtons(True)
         self.tabWidget.setElideMode(QtCore.Qt.ElideNone)
 
-        self._all_stuff = self._root.firstChildElement("ALL")
-        self._element = self._root.firstChildElement("PDE")
-
-        self.tabs = 0
-
-        while(self._element.isNull() is False):
-            self._name = self._element.firstChildElement("Name")
-            grid = QtGui.QGridLayout()
-            params = 0
-            for x in range(0, 2):
-                if(x == 0):
-                    if(str(self._name.text()).strip() == "General"):
-                        continue
-                    self._section = self._all_stuff.firstChildElement(Section)
-                else:
-                    self._section = self._element.firstChildElement(Section)
-
-                self._param = self._section.firstChildElement("Parameter")
-
-                while(self._param.isNull() is False):
-                    h = hash_entry_t()
-                    # label
-                    widget_type = self._param.attribute("Widget", "Edit")
-                    widget_enabled = self._param.attribute("Enabled", "True")
-                    widget_visible = self._param.attribute("Visible", "True")
-                    paramType = str(self._param.firstChildElement("Type").text()).strip()
-                    labelName = str(self._param.firstChildElement("Name").text()).strip()
-                    sifName   = str(self._param.firstChildElement("SifName").text()).strip()
-                    if(sifName == ""):
-                        sifName = labelName
-                    paramDefault = str(self._param.firstChildElement("DefaultValue").text()).strip()
-                    whatis = str(self._param.firstChildElement("Whatis").text()).strip()
-                    statusTip = str(self._param.firstChildElement("StatusTip").text()).strip()
-                    fullName = "/" + str(self._name.text()).strip() + "/"
-                    fullName = fullName + Section + "/" + labelName + "/" + str(ID)
-                    h.widget = None
-                    if(widget_type == "Edit"):
-                        edit = DynLineEdit()
-                        h.widget = edit.lineEdit
-                        edit.lineEdit.setText(paramDefault)
-                        edit.name = fullName
-                        edit.lineEdit.returnPressed.connect(edit.editSlot)
-                        edit.lineEdit.textChanged.connect(self._textChangedSlot)
-
-                    elif(widget_type == "TextEdit"):
-                        textEdit = QtGui.QTextEdit()
-                        currentFont = textEdit.currentFont()
-                        fontMetrics = QFontMetrics(currentFont)
-                        fontHeight = fontMetrics.height()
-                        textEdit.setMinimumHeight(5*fontHeight)
-                        textEdit.setMaximumHeight(8*fontHeight)
-                        h.widget = textEdit
-
-                    elif(widget_type == "Combo"):
-                        combo = QtGui.QComboBox()
-                        h.widget = combo
-                        count = 0
-                        active = 0
-                        item = self._param.firstChildElement("Item")
-                        while (item.isNull() is False):
-                            itemType = item.attribute("Type", "")
-                            if(itemType == "Active"):
-                                active = count
-                            itemName = item.firstChildElement("Name")
-                            count += 1
-                            combo.insertItem(count,str(itemName.text()).strip())
-                            item = item.nextSiblingElement("Item")
-                        combo.setCurrentIndex(active)
-                        combo.currentIndexChanged.connect(self._comboSlot)
-
-                    elif(widget_type == "CheckBox"):
-                        l = QtGui.QCheckBox()
-                        h.widget = l
-                        l.setText("")
-                        l.setChecked(False)
-                        if(paramDefault == "True"):
-                            l.setChecked(True)
-                        l.stateChanged.connect(self._lSlot)
-
-                    elif(widget_type == "Label"):
-                        label = QtGui.QLabel()
-                        font = QFont()
-                        font.setBold(True)
-                        font.setUnderline(True)
-                        label.setFont(font)
-                        label.setText(labelName)
-                        h.widget = label
-
-                    if(h.widget):
-                        h.widget.setWhatsThis(whatis)
-                        h.widget.setStatusTip(statusTip)
-                        h.widget.setProperty("dom address", fullName)
-                        h.elem = self._param
-                        if(widget_enabled == "False"):
-                            h.widget.setEnabled(False)
-                        if(widget_type != "TextEdit"):
-                            h.widget.setFixedHeight(18)
-                        if(widget_type == "TextEdit"):
-                            textEditLabel = QtGui.QLabel()
-                            textEditLabel.setText(labelName)
-                            h.label = textEditLabel
-                            grid.addWidget(h.widget, params, 0, 1, 2)
-
-                            if(widget_visible == "False"):
-                                h.label.hide()
-                                h.widget.hide()
-
-                        elif(widget_type != "Label"):
-                            label = QtGui.QLabel()
-                            label.setText(labelName)
-                            h.label = label
-                            grid.addWidget(h.label,  params, 0)
-                            grid.addWidget(h.widget, params, 1)
-
-                            if(widget_visible == "False"):
-                                h.label.hide()
-                                h.widget.hide()
-                        else:
-                            h.label = None
-                            grid.addWidget(h.widget, params, 0)
-                        self.qhash.update({fullName: h})
-
-                    self._param = self._param.nextSiblingElement("Parameter")
-                    params += 1
-
-            dummyWidget = QtGui.QWidget()
-            grid.addWidget(dummyWidget, params, 0)
-            grid.setRowStretch(params, 1)
-
-            frmWidget = QtGui.QWidget()
-            frmWidget.setLayout(grid)
-
-            src = QtGui.QScrollArea()
-            src.setWidget(frmWidget)
-            src.setMinimumHeight(300)
-            src.setWidgetResizable(True)
-
-            if(params > 0):
-                self.tabWidget.addTab(src, str(self._name.text()).strip())
-
-            self.tabs += 1
-            self._element = self._element.nextSiblingElement("PDE")
+        for name, params in sectionLayout.tabs:
+            src = DynTab(name, self._showTab)
+            self._pending.update({name: (src, params)})
+            self._tabs.update({name: src})
+            self.tabWidget.addTab(src, name)
+        self.tabs = sectionLayout.count
 
         # Buttons:
         lbl = QtGui.QLabel()
         lbl.setText("Name:")
         self.nameEdit = QtGui.QLineEdit()
-        self.nameEdit.setText(Section + " " + str(ID+1))
+        self.nameEdit.setText(store.name(ID))
+        self.nameEdit.textChanged.connect(self._nameChangedSlot)
 
         self.applyButton = QtGui.QPushButton("&Apply")
         # applyButton.setIcon(addIcon)
@@ -383,48 +554,290 @@ class DynamicEditor(QtGui.QWidget):
 
         self.setWindowTitle(Section)
 
-    def _lSlot(self, state):
-        """Event when CheckBox changed
+    def _buildTab(self, name):
+        """Creates the widgets of a not yet built tab.
 
         Args:
         -----
-        state: bool
-            check state of the CheckBox
+        name: str
+            name of the tab (PDE-name in the elmerDefs)
+
+        Return:
+        -------
+        bool
+            True if the tab has been built
+        """
+        if name not in self._pending:
+            return False
+        src, params = self._pending.pop(name)
+        ids = "/" + str(self.ID)
+        store = self.store
+
+        grid = QtGui.QGridLayout()
+        for row, param in enumerate(params):
+            fullName = param.path + ids
+            h = hash_entry_t()
+            h.pid = store.index[param.path]
+            value = store.value(self.ID, h.pid)
+            widget_type = param.widget_type
+            h.widget = None
+            if(widget_type == "Edit"):
+                edit = DynLineEdit()
+                h.widget = edit.lineEdit
+                edit.lineEdit.setText(value)
+                edit.name = fullName
+                edit.lineEdit.returnPressed.connect(edit.editSlot)
+                edit.lineEdit.textChanged.connect(self._textChangedSlot)
+
+            elif(widget_type == "TextEdit"):
+                textEdit = QtGui.QTextEdit()
+                currentFont = textEdit.currentFont()
+                fontMetrics = QFontMetrics(currentFont)
+                fontHeight = fontMetrics.height()
+                textEdit.setMinimumHeight(5*fontHeight)
+                textEdit.setMaximumHeight(8*fontHeight)
+                textEdit.setPlainText(value)
+                textEdit.textChanged.connect(self._textEditSlot)
+                h.widget = textEdit
+
+            elif(widget_type == "Combo"):
+                combo = QtGui.QComboBox()
+                h.widget = combo
+                combo.addItems(param.items)
+                combo.setCurrentIndex(combo.findText(value))
+                combo.currentIndexChanged.connect(self._comboSlot)
+
+            elif(widget_type == "CheckBox"):
+                l = QtGui.QCheckBox()
+                h.widget = l
+                l.setText("")
+                l.setChecked(value)
+                l.stateChanged.connect(self._lSlot)
+
+            elif(widget_type == "Label"):
+                label = QtGui.QLabel()
+                font = QFont()
+                font.setBold(True)
+                font.setUnderline(True)
+                label.setFont(font)
+                label.setText(param.labelName)
+                h.widget = label
+
+            if(h.widget):
+                h.widget.setWhatsThis(param.whatis)
+                h.widget.setStatusTip(param.statusTip)
+                h.widget.setProperty("dom address", fullName)
+                h.elem = param.elem
+                h.hideable = param.hideable
+                if(not param.enabled):
+                    h.widget.setEnabled(False)
+                if(widget_type != "TextEdit"):
+                    h.widget.setFixedHeight(18)
+                if(widget_type == "TextEdit"):
+                    textEditLabel = QtGui.QLabel()
+                    textEditLabel.setText(param.labelName)
+                    h.label = textEditLabel
+                    grid.addWidget(h.widget, row, 0, 1, 2)
+
+                    if(not param.visible):
+                        h.label.hide()
+                        h.widget.hide()
+
+                elif(widget_type != "Label"):
+                    label = QtGui.QLabel()
+                    label.setText(param.labelName)
+                    h.label = label
+                    grid.addWidget(h.label,  row, 0)
+                    grid.addWidget(h.widget, row, 1)
+
+                    if(not param.visible):
+                        h.label.hide()
+                        h.widget.hide()
+                else:
+                    h.label = None
+                    grid.addWidget(h.widget, row, 0)
+                self.qhash.update({fullName: h})
+
+        dummyWidget = QtGui.QWidget()
+        grid.addWidget(dummyWidget, len(params), 0)
+        grid.setRowStretch(len(params), 1)
+
+        frmWidget = QtGui.QWidget()
+        frmWidget.setLayout(grid)
+        src.setWidget(frmWidget)
+
+        # values set before the widgets existed have to be applied to the
+        # depending widgets
+        for param in params:
+            if param.path not in self._activation:
+                continue
+            pid = store.index[param.path]
+            value = store.value(self.ID, pid)
+            if value != store.defaults[pid]:
+                self._applyActivation(param.path, self._activationKey(param, value), ids)
+        self._touchTab(name, src, params)
+        return True
+
+    def _showTab(self, name):
+        """Creates the widgets of a tab when it is shown, marks built tabs as
+        viewed"""
+        if not self._buildTab(name) and name not in self._pending:
+            self._touchTab(name, self._tabs[name], None)
+
+    def _touchTab(self, name, src, params):
+        """Registers a built tab as viewed in the editor cache"""
+        if self.cache is None:
+            return
+        if params is None:
+            params = dict(self._layout.tabs)[name]
+        self.cache.touch((id(self), name), len(params),
+                         lambda: self.releaseTab(name),
+                         lambda: self._holdTabs or src.isVisible())
+
+    def releaseTab(self, name):
+        """Tears down the widgets of a built tab. The values are kept in the
+        store, the widgets are created again when the tab is shown or one of
+        its entries is requested from the qhash.
+
+        Args:
+        -----
+        name: str
+            name of the tab (PDE-name in the elmerDefs)
+        """
+        if name in self._pending or name not in self._tabs:
+            return
+        params = dict(self._layout.tabs)[name]
+        ids = "/" + str(self.ID)
+        for param in params:
+            h = dict.pop(self.qhash, param.path + ids, None)
+            if h is not None:
+                h.elem = None
+        src = self._tabs[name]
+        widget = src.takeWidget()
+        if widget is not None:
+            widget.deleteLater()
+        self._pending.update({name: (src, params)})
+        if self.cache is not None:
+            self.cache.forget((id(self), name))
+
+    def dispose(self):
+        """Releases the editor: disconnects its signals, drops the widgets
+        and the references to the store and the layout description of the
+        elmerDefs and schedules the editor for deletion. The values are kept
+        in the store."""
+        for name in list(self._tabs.keys()):
+            if self.cache is not None:
+                self.cache.forget((id(self), name))
+        for signal in [self.dynamicEditorReady, self.dynamicEditorSpareButtonClicked]:
+            try:
+                signal.disconnect()
+            except TypeError:
+                # nothing connected
+                pass
+        if self.nameEdit is not None:
+            self.nameEdit.textChanged.disconnect()
+        for h in dict.values(self.qhash):
+            h.elem = None
+        dict.clear(self.qhash)
+        self._pending.clear()
+        self._tabs.clear()
+        self._activation = {}
+        self._layout = None
+        self.store = None
+        self.cache = None
+        self.deleteLater()
+
+    def _buildTabOf(self, key):
+        """Creates the tab containing the hash entry key.
+
+        Args:
+        -----
+        key: str
+            address of the hash entry ("/PDE/Section/Name/ID")
+
+        Return:
+        -------
+        bool
+            True if a tab has been built
         """
-        self._param = QtXml.QDomElement()
+        if not isinstance(key, str) or not key.startswith("/"):
+            return False
+        return self._buildTab(key.split("/")[1])
+
+    def _buildAllTabs(self):
+        """Creates all tabs that have not been built yet"""
+        self._holdTabs = True
+        for name in list(self._pending.keys()):
+            self._buildTab(name)
+        self._holdTabs = False
+        if self.cache is not None:
+            self.cache.trim()
+
+    def _senderAddress(self):
+        """Returns the address of the sending widget split into the path and
+        the ID-suffix"""
         if qt4:
             qs = str(self.sender().property("dom address").toPyObject())
         else:
             qs = str(self.sender().property("dom address"))
-
         ind = qs.rfind('/')
-        ids = qs[ind:]
-
-        self._param = self.qhash[qs].elem.firstChildElement("Activate")
-        while(self._param.isNull() is False):
-            qs = str(self._param.text()).strip() + ids
-            self.qhash[qs].widget.setEnabled(state)
-            widget_visible = self.qhash[qs].elem.attribute("Visible", "Unknown")
-            if(state is False & widget_visible != "Unknown"):
-                self.qhash[qs].label.hide()
-                self.qhash[qs].widget.hide()
-            else:
-                self.qhash[qs].label.show()
-                self.qhash[qs].widget.show()
-            self._param = self._param.nextSiblingElement("Activate")
-
-        self._param = self.qhash[qs].elem.firstChildElement("Deactivate")
-        while(self._param.isNull() is False):
-            qs = str(self._param.text()).strip() + ids
-            self.qhash[qs].widget.setEnabled(-state)
-            widget_visible = self.qhash[qs].elem.attribute("Visible", "Unknown")
-            if(state is True & widget_visible != "Unknown"):
-                self.qhash[qs].label.hide()
-                self.qhash[qs].widget.hide()
-            else:
-                self.qhash[qs].label.show()
-                self.qhash[qs].widget.show()
-            self._param = self._param.nextSiblingElement("Deactivate")
+        return qs[:ind], qs[ind:]
+
+    def _applyActivation(self, pathName, value, ids):
+        """Enables/disables the widgets depending on the parameter pathName
+        according to the compiled activation table.
+
+        Args:
+        -----
+        pathName: str
+            address of the parameter without the ID of the editor
+        value: bool or str
+            current value of the widget of the parameter
+        ids: str
+            ID-suffix of the addresses
+        """
+        rule = self._activation.get(pathName)
+        if rule is None:
+            return
+        targets = rule.get(value)
+        if targets is None:
+            return
+        activate, deactivate = targets
+        for target in deactivate:
+            h = self.qhash.get(target + ids)
+            if h is None:
+                continue
+            h.widget.setEnabled(False)
+            if h.hideable:
+                if h.label is not None:
+                    h.label.hide()
+                h.widget.hide()
+        for target in activate:
+            h = self.qhash.get(target + ids)
+            if h is None:
+                continue
+            h.widget.setEnabled(True)
+            if h.label is not None:
+                h.label.show()
+            h.widget.show()
+
+    def _activationKey(self, param, value):
+        """Returns the key of a value in the activation table"""
+        if(param.widget_type == "Edit"):
+            return value != ""
+        return value
+
+    def _lSlot(self, state):
+        """Event when CheckBox changed
+
+        Args:
+        -----
+        state: int
+            check state of the CheckBox
+        """
+        pathName, ids = self._senderAddress()
+        self.store.setValueOf(self.ID, pathName, bool(state))
+        self._applyActivation(pathName, bool(state), ids)
 
     def _textChangedSlot(self, text):
         """Event when TextBox changed
@@ -434,29 +847,14 @@ class DynamicEditor(QtGui.QWidget):
         text: str
             new contents of text box
         """
-        self._param = QtXml.QDomElement()
-        if qt4:
-            qs = str(self.sender().property("dom address").toPyObject())
-        else:
-            qs = str(self.sender().property("dom address"))
+        pathName, ids = self._senderAddress()
+        self.store.setValueOf(self.ID, pathName, str(text))
+        self._applyActivation(pathName, text != "", ids)
 
-        ind = qs.rfind('/')
-        ids = qs[ind:]
-
-        self._param = self.qhash[qs].elem.firstChildElement("Activate")
-        while(self._param.isNull() is False):
-            qs = str(self._param.text()).strip() + ids
-            widget_visible = self.qhash[qs].elem.attribute("Visible", "Uknown")
-            if(text != ""):
-                self.qhash[qs].widget.setEnabled(True)
-                self.qhash[qs].widget.show()
-                self.qhash[qs].label.show()
-            else:
-                self.qhash[qs].widget.setEnabled(False)
-                if(widget_visible != "Unknown"):
-                    self.qhash[qs].label.hide()
-                    self.qhash[qs].widget.hide()
-            self._param = self._param.nextSiblingElement("Activate")
+    def _textEditSlot(self):
+        """Event when multiline TextEdit changed"""
+        pathName, ids = self._senderAddress()
+        self.store.setValueOf(self.ID, pathName, str(self.sender().toPlainText()))
 
     def _comboSlot(self, select):
         """Event when comboBox changend
@@ -464,46 +862,67 @@ class DynamicEditor(QtGui.QWidget):
         select: int
             index of the selection
         """
-        select = self.sender().itemText(select)
-        if qt4:
-            qs = str(self.sender().property("dom address").toPyObject())
-        else:
-            qs = str(self.sender().property("dom address"))
-        item = QtXml.QDomElement()
+        select = str(self.sender().itemText(select)).strip()
+        pathName, ids = self._senderAddress()
+        self.store.setValueOf(self.ID, pathName, select)
+        self._applyActivation(pathName, select, ids)
 
-        ind = qs.rfind('/')
-        ids = qs[ind:]
-
-        item = self.qhash[qs].elem.firstChildElement("Item")
-        while(item.isNull() is False):
-            itemName = item.firstChildElement("Name")
-            if(str(itemName.text()).strip() != select):
-                activ = item.firstChildElement("Activate")
-                while(activ.isNull() is False):
-                    s = str(activ.text()).strip() + ids
-                    h = self.qhash[s]
-                    widget_enabled = h.elem.attribute("Enabled", "True")
-                    widget_visible = h.elem.attribute("Visible", "Unknown")
-                    h.widget.setEnabled(False)
-                    if(widget_visible != "Unknown"):
-                        h.label.hide()
-                        h.widget.hide()
-                    activ = activ.nextSiblingElement("Activate")
-            item = item.nextSiblingElement("Item")
-
-        item = self.qhash[qs].elem.firstChildElement("Item")
-        while(item.isNull() is False):
-            itemName = item.firstChildElement("Name")
-            if(str(itemName.text()).strip() == select):
-                activ = item.firstChildElement("Activate")
-                while(activ.isNull() is False):
-                    s = str(activ.text()).strip() + ids
-                    h = self.qhash[s]
-                    h.widget.setEnabled(True)
-                    h.label.show()
-                    h.widget.show()
-                    activ = activ.nextSiblingElement("Activate")
-            item = item.nextSiblingElement("Item")
+    def _nameChangedSlot(self, text):
+        """Event when the name of the editor changed"""
+        self.store.setName(self.ID, str(text))
+
+    def bind(self, ID):
+        """Shows the values of another entity of the store. The widgets that
+        have already been built are reused, only their addresses and values
+        are updated.
+
+        Args:
+        -----
+        ID: int
+            ID of the entity, added to the store if not present
+        """
+        if not self.store.hasEntity(ID):
+            self.store.addEntity(ID, self._layout.section + " " + str(ID+1))
+        if ID != self.ID:
+            old = len(str(self.ID)) + 1
+            ids = "/" + str(ID)
+            entries = list(dict.items(self.qhash))
+            dict.clear(self.qhash)
+            for key, h in entries:
+                key = key[:-old] + ids
+                h.widget.setProperty("dom address", key)
+                dict.update(self.qhash, {key: h})
+            self.ID = ID
+        self.refresh()
+
+    def refresh(self):
+        """Updates the name and the widgets already built from the values in
+        the store. Has to be called after the store has been changed without
+        the editor, e.g. by the sif reader or the material library."""
+        name = self.store.name(self.ID)
+        if(str(self.nameEdit.text()) != name):
+            self.nameEdit.setText(name)
+        for h in list(dict.values(self.qhash)):
+            value = self.store.value(self.ID, h.pid)
+            widget_type = self.store.params[h.pid].widget_type
+            if(widget_type == "Edit"):
+                if(str(h.widget.text()) != value):
+                    h.widget.setText(value)
+            elif(widget_type == "TextEdit"):
+                if(str(h.widget.toPlainText()) != value):
+                    h.widget.setPlainText(value)
+            elif(widget_type == "Combo"):
+                index = h.widget.findText(value)
+                if(index < 0):
+                    # no selection for a value that is not an item, the
+                    # change slot would write "" back into the store
+                    h.widget.blockSignals(True)
+                    h.widget.setCurrentIndex(-1)
+                    h.widget.blockSignals(False)
+                elif(index != h.widget.currentIndex()):
+                    h.widget.setCurrentIndex(index)
+            elif(widget_type == "CheckBox"):
+                h.widget.setChecked(value)
 
     def minimumSizeHint(self):
         return QtCore.QSize(128, 128)
@@ -529,120 +948,3 @@ class DynamicEditor(QtGui.QWidget):
     def _newButtonClicked(self):
         self.touched = False
         self.dynamicEditorReady.emit(MatTypes.MAT_NEW, self.ID)
-
-    def dumpHash(self, projectDoc, item):
-        for j in range(0, self.qhash.count()):
-            key = self.qhash.keys()[j]
-            value = self.qhash.values()[j]
-            elem = value.elem
-            widget = value.widget
-
-            itemWidget = projectDoc.createElement("widget")
-            item.appendChild(itemWidget)
-
-            itemKey = projectDoc.createElement("key")
-            itemKeyValue = projectDoc.createTextNode(key)
-            itemKey.appendChild(itemKeyValue)
-            itemWidget.appendChild(itemKey)
-
-            if(elem.attribute("Widget") == "CheckBox"):
-                checkBox = widget
-                itemCheckBox = projectDoc.createElement("value")
-                itemCheckBoxValue = projectDoc.createTextNode(int(checkBox.isChecked))
-                itemCheckBox.appendChild(itemCheckBoxValue)
-                itemWidget.appendChild(itemCheckBox)
-                itemWidget.setAttribute("type", "CheckBox")
-
-            elif(elem.attribute("Widget") == "Edit"):
-                lineEdit = widget
-                itemLineEdit = projectDoc.createElement("value")
-                itemLineEditValue = projectDoc.createTextNode(str(lineEdit.text()).strip())
-                itemLineEdit.appendChild(itemLineEditValue)
-                itemWidget.appendChild(itemLineEdit)
-                itemWidget.setAttribute("type", "Edit")
-
-            elif(elem.attribute("Widget") == "TextEdit"):
-                textEdit = widget
-                itemTextEdit = projectDoc.createElement("value")
-                itemTextEditValue = projectDoc.createTextNode(textEdit.toPlainText())
-                itemTextEdit.appendChild(itemTextEditValue)
-                itemWidget.appendChild(itemTextEdit)
-                itemWidget.setAttribute("type", "TextEdit")
-
-            elif(elem.attribute("Widget") == "Combo"):
-                comboBox = widget
-                itemComboBox = projectDoc.createElement("value")
-                itemComboBoxValue = projectDoc.createTextNode(str(comboBox.currentText()).strip())
-                itemComboBox.appendChild(itemComboBoxValue)
-                itemWidget.appendChild(itemComboBox)
-                itemWidget.setAttribute("type", "Combo")
-
-            elif(elem.attribute("Widget") == "Label"):
-                label = widget
-                itemLabel = projectDoc.createElement("value")
-                itemLabelValue = projectDoc.createTextNode(str(label.text()).strip())
-                itemLabel.appendChild(itemLabelValue)
-                itemWidget.appendChild(itemLabel)
-                itemWidget.setAttribute("type", "Label")
-
-    def populateHash(self, item):
-        widget = item.firstChildElement("widget")
-
-        while(widget.isNull() is not False):
-            qtype = str(widget.attribute("type")).strip()
-            key = str(widget.firstChildElement("key").text()).strip()
-            value = str(widget.firstChildElement("value").text()).strip()
-
-            if(value.isEmpty()):
-                continue
-
-            splittedKey = key.split("/")
-
-            # Compare with current hash:
-            match_found = False
-            for j in range(0, self.qhash.count()):
-                hashkey = self.qhash.keys()[j]
-                splittedHashKey = hashkey.split("/")
-                hashvalue = self.qhash.values()[j]
-                widget = hashvalue.widget
-                elem = hashvalue.elem
-
-                if((splittedKey[1] == splittedHashKey[1]) &
-                   (splittedKey[2] == splittedHashKey[2]) &
-                   (splittedKey[3] == splittedHashKey[3])):
-                    match_found = True
-
-                    if(elem.attribute("Widget") == "CheckBox"):
-                        if(qtype != "CheckBox"):
-                            print("Load project: type mismatch with checkBox")
-                        checkBox = widget
-                        if(value.toInt() == 1):
-                            checkBox.setChecked(True)
-                        else:
-                            checkBox.setChecked(False)
-
-                    elif(elem.attribute("Widget") == "Edit"):
-                        if(qtype != "Edit"):
-                            print("Load project: type mismatch with Edit")
-                        lineEdit = widget
-                        lineEdit.setText(value)
-
-                    elif(elem.attribute("Widget") == "TextEdit"):
-                        if(qtype != "TextEdit"):
-                            print("Load project: type mismatch with TextEdit")
-                        textEdit = widget
-                        textEdit.clear()
-                        textEdit.append(value)
-
-                    elif(elem.attribute("Widget") == "Combo"):
-                        if(qtype != "Combo"):
-                            print("Load project: type mismatch with Combo")
-                        comboBox = widget
-                        for k in range(0, comboBox.count()):
-                            current = str(comboBox.itemText(k)).strip()
-                            if(current == str(value).strip()):
-                                comboBox.setCurrentIndex(k)
-
-            if(match_found is False):
-                print("Error: Unable to set menu entry: key: " + key.toAscii().data())
-        widget = widget.nextSiblingElement("widget")
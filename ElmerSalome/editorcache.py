@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Editor cache class
+
+Keeps the widget trees of the editors (tabs of the DynamicEditors, solver
+parameter dialogs) within a memory budget. The trees not viewed for the
+longest time are torn down first, their values are kept in the stores and
+settings records and the widgets are recreated when they are viewed again.
+"""
+from collections import OrderedDict
+
+# default budget, number of input widgets kept alive
+DEFAULT_BUDGET = 3000
+
+
+class EditorCache():
+    """Least recently used list of the built widget trees. The number of input
+    widgets is used as a measure of the memory of a tree."""
+
+    def __init__(self, budget=DEFAULT_BUDGET):
+        """Constructor
+
+        Args:
+        -----
+        budget: int
+            maximum number of input widgets kept alive
+        """
+        # public
+        self.budget = budget
+
+        # private
+        self._entries = OrderedDict()  # (size, release, busy) by key
+        self._size = 0
+
+    def setBudget(self, budget):
+        """Changes the maximum number of input widgets kept alive, the trees
+        exceeding a smaller budget are released"""
+        self.budget = budget
+        self.trim()
+
+    def touch(self, key, size, release, busy=None):
+        """Marks a widget tree as viewed and releases the least recently viewed
+        trees if the budget is exceeded.
+
+        Args:
+        -----
+        key: hashable
+            identifies the widget tree
+        size: int
+            number of input widgets of the tree
+        release: callable
+            tears down the widget tree
+        busy: callable, optional
+            returns True while the tree must not be released, e.g. if it is
+            visible
+        """
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry[0]
+        self._entries.update({key: (size, release, busy)})
+        self._size += size
+        self.trim()
+
+    def forget(self, key):
+        """Removes a widget tree that has been released by its owner"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry[0]
+
+    def trim(self):
+        """Releases the least recently viewed widget trees until the budget
+        is met. The most recently viewed tree and busy trees are kept."""
+        for key in list(self._entries.keys())[:-1]:
+            if self._size <= self.budget:
+                break
+            size, release, busy = self._entries[key]
+            if busy is not None and busy():
+                continue
+            del self._entries[key]
+            self._size -= size
+            release()
+
+    def size(self):
+        """Returns the number of input widgets kept alive"""
+        return self._size
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
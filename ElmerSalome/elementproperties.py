@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Element properties class
+
+Assignment table of the equations, materials, ... to the bodies and of the
+boundary conditions to the faces of the mesh. Only the IDs of the entities
+are kept, the property dialogs are used as transient editors.
+"""
+
+
+class ElementProperties():
+    """Assignments by the name of the element as provided in the Salome
+    Object Browser. Bodies map to (equation, material, body force,
+    initial condition), boundaries map to (boundary condition, boundary as a
+    body). The values are entity IDs or None if nothing is assigned."""
+
+    def __init__(self):
+        """Constructor"""
+        # private
+        self._bodies = {}
+        self._boundaries = {}
+
+    def setBody(self, name, equation=None, material=None, force=None, initial=None):
+        """Assigns entities to a body.
+
+        Args:
+        -----
+        name: str
+            name of the body
+        equation, material, force, initial: int or None
+            IDs of the assigned equation, material, body force and initial
+            condition
+        """
+        self._boundaries.pop(name, None)
+        self._bodies.update({name: (equation, material, force, initial)})
+
+    def setBoundary(self, name, condition=None, asBody=0):
+        """Assigns a boundary condition to a boundary.
+
+        Args:
+        -----
+        name: str
+            name of the boundary
+        condition: int or None
+            ID of the assigned boundary condition
+        asBody: int
+            check state of 'boundary as a body'
+        """
+        self._bodies.pop(name, None)
+        self._boundaries.update({name: (condition, asBody)})
+
+    def body(self, name):
+        """Returns (equation, material, force, initial) of a body, None if
+        the body has no properties"""
+        return self._bodies.get(name)
+
+    def boundary(self, name):
+        """Returns (condition, asBody) of a boundary, None if the boundary has
+        no properties"""
+        return self._boundaries.get(name)
+
+    def bodies(self):
+        """Returns (name, (equation, material, force, initial)) of all bodies"""
+        return list(self._bodies.items())
+
+    def boundaries(self):
+        """Returns (name, (condition, asBody)) of all boundaries"""
+        return list(self._boundaries.items())
+
+    def remove(self, name):
+        """Removes the properties of an element"""
+        self._bodies.pop(name, None)
+        self._boundaries.pop(name, None)
+
+    def clear(self):
+        """Removes all properties"""
+        self._bodies = {}
+        self._boundaries = {}
+
+    def __contains__(self, name):
+        return name in self._bodies or name in self._boundaries
+
+    def __len__(self):
+        return len(self._bodies) + len(self._boundaries)
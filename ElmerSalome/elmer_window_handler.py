@@ -37,6 +37,17 @@ import sifwrite
 import sifreader
 import parallelsettings
 import runsolver
+import valuestore
+import projectio
+import entityregistry
+import elementproperties
+import bulkedit
+import editorcache
+import keywordindex
+import jobqueue
+import convergence
+import resultcache
+import runhistory
 
 main = None
 
@@ -46,8 +57,15 @@ class ElmerWindowHandler():
     windows. References to the windows have to be kept in memory otherwise
     they will not be shown properly."""
 
-    def __init__(self):
-        """Constructor"""
+    def __init__(self, session=None):
+        """Constructor
+
+        Args:
+        -----
+        session: Session-class, optional
+            session providing the compiled elmerDefs and the material
+            library, both are created for this instance if not given
+        """
         # check python version
         if sys.version_info.major < 3:
             print("Requires Python > 3.3")
@@ -56,44 +74,56 @@ class ElmerWindowHandler():
             print("Requires Python > 3.3")
             sys.exit(1)
 
-        path = shutil.which('ElmerSolver')
-        path = path[:-19]
-        path += r"share/ElmerGUI/edf/"
-        self._path_edfs = Path(path)
-
-        path = os.path.dirname(os.path.abspath(__file__))
-        path += r"/forms"
-        self._path_forms = Path(path)
+        self._path_edfs, self._path_forms = elmerPaths()
+        self._session = session
 
         # public fields
         self.meshDirectory = ''
         self.sifFile = ''
         self.gsWindow = None
         self.psWindow = None
-        self.equationEditor = []  # stores the equations sets
-        self.materialEditor = []  # stores the defined materials
-        self.solverParameterEditor = []  # stores the specific solver settings
-        self.bodyForceEditor = []  # stores the body forces
-        self.initialConditionEditor = []  # stores the initial conditions
-        self.boundaryConditionEditor = []  # stores the boundary conditions
-        self.elementProperties = {}  # stores the properties of bodies/faces by name
+        self.equationEditor = entityregistry.EntityRegistry("Equation")  # stores the equations sets
+        self.materialEditor = entityregistry.EntityRegistry("Material")  # stores the defined materials
+        self.solverSettings = []  # stores the specific solver settings by tab index
+        self.bodyForceEditor = entityregistry.EntityRegistry("BodyForce")  # stores the body forces
+        self.initialConditionEditor = entityregistry.EntityRegistry("InitialCondition")  # stores the initial conditions
+        self.boundaryConditionEditor = entityregistry.EntityRegistry("BoundaryCondition")  # stores the boundary conditions
+        self.elementProperties = elementproperties.ElementProperties()  # stores the properties of bodies/faces by name
+        self.solverRun = None  # runElmerSolver-class of the last run
+        if session is None:
+            self.editorCache = editorcache.EditorCache()  # memory budget of the widgets of the editors
+            self.runHistory = runhistory.RunHistory()  # records of the solver runs
+            self.jobQueue = jobqueue.JobQueue(history=self.runHistory)  # queue of the solver runs
+            self.resultCache = resultcache.ResultCache()  # results of previous runs
+        else:
+            self.editorCache = session.editorCache
+            self.runHistory = session.runHistory
+            self.jobQueue = session.jobQueue
+            self.resultCache = session.resultCache
         # private fields
-        self._materialLibrary = materiallibrary.MaterialLibrary(self._path_forms, self._path_edfs)
+        if session is None:
+            self._materialLibrary = materiallibrary.MaterialLibrary(self._path_forms, self._path_edfs)
+        else:
+            self._materialLibrary = session.materialLibrary
+        self._stores = {}  # value stores by section
         # storage variables to to keep track of windows
         self._elmerDefs = None
-        self._listview = None
         self._window = None
         self._eqWindow = None
         self._matWindow = None
         self._bfWindow = None
         self._bcWindow = None
         self._icWindow = None
-        self._matCurrent = 0
-        self._eqCurrent = 0
-        self._bfCurrent = 0
-        self._bcCurrent = 0
-        self._icCurrent = 0
-        self._xmlMerge(self._path_edfs)
+        self._bulkEdit = None
+        self._keywordIndex = None
+        self._keywordSearch = None
+        self._jobQueueView = None
+        self._convergenceView = None
+        self._runHistoryView = None
+        if session is None:
+            self._xmlMerge(self._path_edfs)
+        else:
+            self._elmerDefs = session.elmerDefs
         self._parent = self
 
         # set the default general settings
@@ -126,22 +156,15 @@ class ElmerWindowHandler():
         be.objName = objName
         be.setWindowTitle("Boundary property for boundary {}".format(objName))
 
-        # populate comboboxes
-        count = 1
-        be.boundaryConditionCombo.addItem("", "Empty")
-        count += 1
-        for element in self.boundaryConditionEditor:
-            name = str(element.nameEdit.text()).strip()
-            be.boundaryConditionCombo.addItem(name, name)
-            count += 1
-        # select first entry
-        count = 1
+        # bind comboboxes to the shared models
+        be.boundaryConditionCombo.setModel(self.boundaryConditionEditor.model)
 
         # check if element already has properties
-        if objName in self.elementProperties:
-            properties = self.elementProperties[objName]
-            be.boundaryConditionCombo.setCurrentIndex(be.boundaryConditionCombo.findText(properties.boundaryProperties))
-            be.boundaryAsABody.setCheckState(properties.bodyCondition)
+        properties = self.elementProperties.boundary(objName)
+        if properties is not None:
+            condition, asBody = properties
+            be.boundaryConditionCombo.setCurrentIndex(self.boundaryConditionEditor.model.row(condition))
+            be.boundaryAsABody.setCheckState(asBody)
 
         # connect to slot
         be.boundaryPropertyEditorApply.connect(self._boundaryPropertyChanged)
@@ -170,47 +193,20 @@ class ElmerWindowHandler():
         be.nameEdit.setText(objName)
         be.setWindowTitle("Body property for body {}".format(objName))
 
-        # populate comboboxes
-        count = 1
-        # equations
-        be.equationCombo.addItem("", "Empty")
-        count += 1
-        for element in self.equationEditor:
-            name = str(element.nameEdit.text()).strip()
-            be.equationCombo.addItem(name, name)
-            count += 1
-        count = 1
-        # materials
-        be.materialCombo.addItem("", "Empty")
-        count += 1
-        for element in self.materialEditor:
-            name = str(element.nameEdit.text()).strip()
-            be.materialCombo.addItem(name, name)
-            count += 1
-        count = 1
-        # body forces
-        be.bodyForceCombo.addItem("", "Empty")
-        count += 1
-        for element in self.bodyForceEditor:
-            name = str(element.nameEdit.text()).strip()
-            be.bodyForceCombo.addItem(name, name)
-            count += 1
-        count = 1
-        # initial conditions
-        be.initialConditionCombo.addItem("", "Empty")
-        count += 1
-        for element in self.initialConditionEditor:
-            name = str(element.nameEdit.text()).strip()
-            be.initialConditionCombo.addItem(name, name)
-            count += 1
+        # bind comboboxes to the shared models
+        be.equationCombo.setModel(self.equationEditor.model)
+        be.materialCombo.setModel(self.materialEditor.model)
+        be.bodyForceCombo.setModel(self.bodyForceEditor.model)
+        be.initialConditionCombo.setModel(self.initialConditionEditor.model)
 
         # check if element has properties already
-        if objName in self.elementProperties:
-            properties = self.elementProperties[objName]
-            be.equationCombo.setCurrentIndex(be.equationCombo.findText(properties.equation))
-            be.materialCombo.setCurrentIndex(be.materialCombo.findText(properties.material))
-            be.bodyForceCombo.setCurrentIndex(be.bodyForceCombo.findText(properties.force))
-            be.initialConditionCombo.setCurrentIndex(be.initialConditionCombo.findText(properties.initial))
+        properties = self.elementProperties.body(objName)
+        if properties is not None:
+            equation, material, force, initial = properties
+            be.equationCombo.setCurrentIndex(self.equationEditor.model.row(equation))
+            be.materialCombo.setCurrentIndex(self.materialEditor.model.row(material))
+            be.bodyForceCombo.setCurrentIndex(self.bodyForceEditor.model.row(force))
+            be.initialConditionCombo.setCurrentIndex(self.initialConditionEditor.model.row(initial))
 
         # connect to slot
         be.bodyPropertyEditorApply.connect(self._bodyPropertyChanged)
@@ -231,6 +227,98 @@ class ElmerWindowHandler():
         self.gsWindow.show()
         return self.gsWindow
 
+    def showKeywordSearch(self):
+        """Shows the dialog to search keywords in all editors
+
+        Return:
+        -------
+        _keywordSearch: KeywordSearch-class
+            search dialog
+        """
+        if self._keywordSearch is None:
+            self._keywordSearch = keywordindex.KeywordSearch(self.keywordIndex(), self.jumpTo)
+        self._keywordSearch.show()
+        return self._keywordSearch
+
+    def keywordIndex(self):
+        """Returns the keyword index of all parameters, built on first use
+
+        Return:
+        -------
+        _keywordIndex: KeywordIndex-class
+            index of the parameters of all sections and the solver form
+        """
+        if self._keywordIndex is None and self._session is not None:
+            self._keywordIndex = self._session.keywordIndex
+        if self._keywordIndex is None:
+            index = keywordindex.KeywordIndex()
+            for section in ["Equation", "Material", "BodyForce", "InitialCondition",
+                            "BoundaryCondition", "Solver"]:
+                index.addLayout(dynamiceditor.sectionLayout(self._elmerDefs, section))
+            index.addSolverForm(self._path_forms)
+            self._keywordIndex = index
+            if self._session is not None:
+                self._session.keywordIndex = index
+        return self._keywordIndex
+
+    def jumpTo(self, entry):
+        """Opens the editor of a keyword and shows the tab and widget.
+
+        Args:
+        -----
+        entry: entry_t
+            entry of the keyword index
+
+        Return:
+        -------
+        widget: QWidget or None
+            input widget of the keyword
+        """
+        show = {"Equation": (self.equationEditor, self.showAddEquation, self.pdeEditorFinishedSlot),
+                "Material": (self.materialEditor, self.showAddMaterial, self.matEditorFinishedSlot),
+                "BodyForce": (self.bodyForceEditor, self.showAddBodyForce, self.bodyForceEditorFinishedSlot),
+                "InitialCondition": (self.initialConditionEditor, self.showAddInitialCondition,
+                                     self.initialConditionEditorFinishedSlot),
+                "BoundaryCondition": (self.boundaryConditionEditor, self.showAddBoundaryCondition,
+                                      self.boundaryConditionEditorFinishedSlot)}
+        if entry.section in show:
+            registry, showMethod, slot = show[entry.section]
+            showMethod()
+            if registry.editor is None:
+                slot(dynamiceditor.MatTypes.MAT_NEW, 0)
+            registry.window.show()
+            de = registry.editor
+            tabs = de.tabWidget
+            h = de.qhash.get(entry.key + "/" + str(de.ID))
+        else:
+            # solver settings: the solver of the tab, the current solver of
+            # the equation editor for the widgets of the solver form
+            self.showAddEquation(visible=False)
+            titles = [str(self.equationEditor.editor.tabWidget.tabText(i))
+                      for i in range(self.equationEditor.editor.tabWidget.count())]
+            if entry.section == "Solver":
+                current = titles.index(entry.tab)
+            else:
+                current = max(1, self.equationEditor.editor.tabWidget.currentIndex())
+            self._editNumericalMethods(current, 0)
+            spe = self.solverSettings[current].editor
+            tabs = spe.solverControlTabs
+            if entry.section == "Solver":
+                h = spe.generalOptions.qhash.get(entry.key + "/" + str(current))
+            else:
+                h = None
+                widget = getattr(spe, entry.key)
+        if h is not None:
+            widget = h.widget
+        elif entry.section != keywordindex.SOLVER_FORM:
+            return None
+        for i in range(tabs.count()):
+            if tabs.widget(i).isAncestorOf(widget):
+                tabs.setCurrentIndex(i)
+                break
+        widget.setFocus()
+        return widget
+
     def showParallelSettings(self):
         """Show parallel settings window
 
@@ -268,19 +356,11 @@ class ElmerWindowHandler():
         """
         if not self._eqWindow:
             # create a horizontal split layout
-            self._eqWindow = QtGui.QWidget()
-            layout = QtGui.QHBoxLayout()
-            # create a listview-object
-            self._listview = QtGui.QListWidget()
-            self._listview.clicked[QtCore.QModelIndex].connect(self._eqItemChanged)
-            self._listview.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOn)
-            # add listview to left layout-side
-            layout.addWidget(self._listview, stretch=1)
-            self._eqWindow.setLayout(layout)
+            self._eqWindow = self._sectionWindow(self.equationEditor, self._eqItemChanged)
             self.pdeEditorFinishedSlot(dynamiceditor.MatTypes.MAT_NEW, 0)
             # create default solver settings
-            for idx in range(self.equationEditor[0].tabWidget.count()):
-                self._editNumericalMethods(idx, 0, False)
+            for idx in range(self.equationEditor.editor.tabWidget.count()):
+                self._getSolverSettings(idx, self.equationEditor.editor.tabWidget.tabText(idx))
             if visible:
                 self._eqWindow.show()
         else:
@@ -299,15 +379,8 @@ class ElmerWindowHandler():
         """
         if not self._matWindow:
             # create a horizontal split layout
-            self._matWindow = QtGui.QWidget()
-            layout = QtGui.QHBoxLayout()
-            self._listview = QtGui.QListWidget()
-            self._listview.clicked[QtCore.QModelIndex].connect(self._matItemChanged)
-            self._listview.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOn)
-            # add listview to left layout-side
-            layout.addWidget(self._listview, stretch=1)
+            self._matWindow = self._sectionWindow(self.materialEditor, self._matItemChanged)
             self._matWindow.setWindowTitle("Material Library")
-            self._matWindow.setLayout(layout)
             self.matEditorFinishedSlot(dynamiceditor.MatTypes.MAT_NEW, 0)
             if visible:
                 self._matWindow.show()
@@ -327,14 +400,8 @@ class ElmerWindowHandler():
         """
         if not self._bfWindow:
             # create a horizontal split layout
-            self._bfWindow = QtGui.QWidget()
-            layout = QtGui.QHBoxLayout()
-            self._listview = QtGui.QListWidget()
-            self._listview.clicked[QtCore.QModelIndex].connect(self._bfItemChanged)
-            self._listview.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOn)
-            layout.addWidget(self._listview, stretch=1)
+            self._bfWindow = self._sectionWindow(self.bodyForceEditor, self._bfItemChanged)
             self._bfWindow.setWindowTitle("Body force settings")
-            self._bfWindow.setLayout(layout)
             self.bodyForceEditorFinishedSlot(dynamiceditor.MatTypes.MAT_NEW, 0)
             if visible:
                 self._bfWindow.show()
@@ -354,14 +421,8 @@ class ElmerWindowHandler():
         """
         if not self._icWindow:
             # create a horizontal split layout
-            self._icWindow = QtGui.QWidget()
-            layout = QtGui.QHBoxLayout()
-            listview = QtGui.QListWidget()
-            listview.clicked[QtCore.QModelIndex].connect(self._icItemChanged)
-            listview.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOn)
-            layout.addWidget(listview, stretch=1)
+            self._icWindow = self._sectionWindow(self.initialConditionEditor, self._icItemChanged)
             self._icWindow.setWindowTitle("Initial Condition settings")
-            self._icWindow.setLayout(layout)
             self.initialConditionEditorFinishedSlot(dynamiceditor.MatTypes.MAT_NEW, 0)
             if visible:
                 self._icWindow.show()
@@ -381,14 +442,8 @@ class ElmerWindowHandler():
         """
         if not self._bcWindow:
             # create a horizontal split layout
-            self._bcWindow = QtGui.QWidget()
-            layout = QtGui.QHBoxLayout()
-            listview = QtGui.QListWidget()
-            listview.clicked[QtCore.QModelIndex].connect(self._bcItemChanged)
-            listview.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOn)
-            layout.addWidget(listview, stretch=1)
+            self._bcWindow = self._sectionWindow(self.boundaryConditionEditor, self._bcItemChanged)
             self._bcWindow.setWindowTitle("Boundary Condition settings")
-            self._bcWindow.setLayout(layout)
             self.boundaryConditionEditorFinishedSlot(dynamiceditor.MatTypes.MAT_NEW, 0)
             if visible:
                 self._bcWindow.show()
@@ -408,92 +463,7 @@ class ElmerWindowHandler():
         ids: int
             ID of the body force set
         """
-        # check if already in the storage and retrieve it
-        for bf in self.bodyForceEditor:
-            temp = bf.ID
-            if temp == ids:
-                ids = self.bodyForceEditor.index(bf)
-                break
-
-        listview = self._bfWindow.layout().itemAt(0).widget()
-
-        # check OK-Button or Apply-Button
-        signalOK = False
-        if(signal == dynamiceditor.MatTypes.MAT_OK or
-           signal == dynamiceditor.MatTypes.MAT_APPLY):
-            signalOK = True
-
-        # OK or Apply
-        if(signalOK):
-            item = listview.item(ids)
-            de = self.bodyForceEditor[ids]
-            bfName = str(de.nameEdit.text()).strip()
-            if not bfName:
-                sys.stdout.write("Body force\n")
-                sys.stdout.flush()
-                return
-            else:
-                item.setText(bfName)
-                self._bfWindow.setWindowTitle(bfName)
-                # hide window, when OK
-                if signal == dynamiceditor.MatTypes.MAT_OK:
-                    self._bfWindow.hide()
-        # New -> create new Body Force
-        elif(signal == dynamiceditor.MatTypes.MAT_NEW):
-            # get window and layout
-            window = self._bfWindow
-            layout = window.layout()
-
-            # new instance of the dynamic editor
-            current = self._bfCurrent
-            de = dynamiceditor.DynamicEditor()
-            # put new instance into storage
-            self.bodyForceEditor.append(de)
-            # populate tabs
-            de.setupTabs(self._elmerDefs, "BodyForce", current)
-            de.applyButton.setText("Apply")
-            de.discardButton.setText("Delete")
-            de.dynamicEditorReady[int, int].connect(self.bodyForceEditorFinishedSlot)
-
-            # clear right side of layout and at the new dynamic editor
-            item = layout.takeAt(1)
-            if item is not None:
-                item.widget().close()
-            layout.addWidget(de, stretch=5)
-            # add item to list
-            item = QtGui.QListWidgetItem()
-            item.setText(de.nameEdit.text())
-            listview.addItem(item)
-            self._bfWindow.setWindowTitle(de.nameEdit.text())
-            # set new as selected
-            count = len(self.bodyForceEditor)
-            listview.item(count - 1).setSelected(True)
-            self._bfCurrent += 1
-        # Delete
-        elif(signal == dynamiceditor.MatTypes.MAT_DELETE):
-            # remove the current body force
-            if len(self.bodyForceEditor) > 1:
-                # remove the current element
-                item = listview.takeItem(ids)
-                del self.bodyForceEditor[ids]
-
-                # show the previous element
-                if ids > 0:
-                    ids -= 1
-                listview.item(ids).setSelected(True)
-                layout = self._bfWindow.layout()
-                item = layout.takeAt(1)
-                item.widget().close()
-                de = self.bodyForceEditor[ids]
-                layout.insertWidget(1, de, stretch=5)
-                de.show()
-                self._bfWindow.setWindowTitle(de.nameEdit.text())
-            else:
-                # remove the last element
-                del self.bodyForceEditor[ids]
-                self.bodyForceEditor = []
-                # close the window
-                self._bfWindow.hide()
+        self._editorFinished(self.bodyForceEditor, self.bodyForceEditorFinishedSlot, signal, ids)
 
     def initialConditionEditorFinishedSlot(self, signal, ids):
         """Method for handling the button events in the initial condition
@@ -504,94 +474,9 @@ class ElmerWindowHandler():
         signal: int
             Type of button clicked
         ids: int
-            ID of the body force set
+            ID of the initial condition set
         """
-        # check if already in the storage and retrieve it
-        for ic in self.initialConditionEditor:
-            temp = ic.ID
-            if temp == ids:
-                ids = self.initialConditionEditor.index(ic)
-                break
-
-        listview = self._icWindow.layout().itemAt(0).widget()
-
-        # check OK-Button or Apply-Button
-        signalOK = False
-        if(signal == dynamiceditor.MatTypes.MAT_OK or
-           signal == dynamiceditor.MatTypes.MAT_APPLY):
-            signalOK = True
-
-        # OK or Apply
-        if(signalOK):
-            item = listview.item(ids)
-            de = self.initialConditionEditor[ids]
-            icName = str(de.nameEdit.text()).strip()
-            if not icName:
-                sys.stdout.write("Initial Condition\n")
-                sys.stdout.flush()
-                return
-            else:
-                item.setText(icName)
-                self._icWindow.setWindowTitle(icName)
-                # hide window, when OK
-                if signal == dynamiceditor.MatTypes.MAT_OK:
-                    self._icWindow.hide()
-        # New -> create new Initial condition
-        elif(signal == dynamiceditor.MatTypes.MAT_NEW):
-            # get window and layout
-            window = self._icWindow
-            layout = window.layout()
-
-            # new instance of the dynamic editor
-            current = self._icCurrent
-            de = dynamiceditor.DynamicEditor()
-            # put new instance into storage
-            self.initialConditionEditor.append(de)
-            # populate tabs
-            de.setupTabs(self._elmerDefs, "InitialCondition", current)
-            de.applyButton.setText("Apply")
-            de.discardButton.setText("Delete")
-            de.dynamicEditorReady[int, int].connect(self.initialConditionEditorFinishedSlot)
-
-            # clear right side of layout and at the new dynamic editor
-            item = layout.takeAt(1)
-            if item is not None:
-                item.widget().close()
-            layout.addWidget(de, stretch=5)
-            # add item to list
-            item = QtGui.QListWidgetItem()
-            item.setText(de.nameEdit.text())
-            listview.addItem(item)
-            self._icWindow.setWindowTitle(de.nameEdit.text())
-            # set new as selected
-            count = len(self.initialConditionEditor)
-            listview.item(count - 1).setSelected(True)
-            self._icCurrent += 1
-        # Delete
-        elif(signal == dynamiceditor.MatTypes.MAT_DELETE):
-            # remove the current initial condition
-            if len(self.initialConditionEditor) > 1:
-                # remove the current equation
-                item = listview.takeItem(ids)
-                del self.initialConditionEditor[ids]
-
-                # show the previous element
-                if ids > 0:
-                    ids -= 1
-                listview.item(ids).setSelected(True)
-                layout = self._icWindow.layout()
-                item = layout.takeAt(1)
-                item.widget().close()
-                de = self.initialConditionEditor[ids]
-                layout.insertWidget(1, de, stretch=5)
-                de.show()
-                self._icWindow.setWindowTitle(de.nameEdit.text())
-            else:
-                # remove the last element
-                del self.initialConditionEditor[ids]
-                self.initialConditionEditor = []
-                # close the window
-                self._icWindow.hide()
+        self._editorFinished(self.initialConditionEditor, self.initialConditionEditorFinishedSlot, signal, ids)
 
     def boundaryConditionEditorFinishedSlot(self, signal, ids):
         """Method for handling the button events in the boundary condition
@@ -602,94 +487,9 @@ class ElmerWindowHandler():
         signal: int
             Type of button clicked
         ids: int
-            ID of the body force set
+            ID of the boundary condition set
         """
-        # check if already in the storage and retrieve it
-        for bc in self.boundaryConditionEditor:
-            temp = bc.ID
-            if temp == ids:
-                ids = self.boundaryConditionEditor.index(bc)
-                break
-
-        listview = self._bcWindow.layout().itemAt(0).widget()
-
-        # check OK-Button or Apply-Button
-        signalOK = False
-        if(signal == dynamiceditor.MatTypes.MAT_OK or
-           signal == dynamiceditor.MatTypes.MAT_APPLY):
-            signalOK = True
-
-        # OK or Apply
-        if(signalOK):
-            item = listview.item(ids)
-            de = self.boundaryConditionEditor[ids]
-            bcName = str(de.nameEdit.text()).strip()
-            if not bcName:
-                sys.stdout.write("Boundary Condition\n")
-                sys.stdout.flush()
-                return
-            else:
-                item.setText(bcName)
-                self._bcWindow.setWindowTitle(bcName)
-                # hide window, when OK
-                if signal == dynamiceditor.MatTypes.MAT_OK:
-                    self._bcWindow.hide()
-        # New -> create new boundary condition
-        elif(signal == dynamiceditor.MatTypes.MAT_NEW):
-            # get window and layout
-            window = self._bcWindow
-            layout = window.layout()
-
-            # new instance of the dynamic editor
-            current = self._bcCurrent
-            de = dynamiceditor.DynamicEditor()
-            # put new instance into storage
-            self.boundaryConditionEditor.append(de)
-            # populate tabs
-            de.setupTabs(self._elmerDefs, "BoundaryCondition", current)
-            de.applyButton.setText("Apply")
-            de.discardButton.setText("Delete")
-            de.dynamicEditorReady[int, int].connect(self.boundaryConditionEditorFinishedSlot)
-
-            # clear right side of layout and at the new dynamic editor
-            item = layout.takeAt(1)
-            if item is not None:
-                item.widget().close()
-            layout.addWidget(de, stretch=5)
-            # add item to list
-            item = QtGui.QListWidgetItem()
-            item.setText(de.nameEdit.text())
-            listview.addItem(item)
-            self._bcWindow.setWindowTitle(de.nameEdit.text())
-            # set new as selected
-            count = len(self.boundaryConditionEditor)
-            listview.item(count - 1).setSelected(True)
-            self._bcCurrent += 1
-        # Delete
-        elif(signal == dynamiceditor.MatTypes.MAT_DELETE):
-            # remove the current boundary condition
-            if len(self.boundaryConditionEditor) > 1:
-                # remove the current equation
-                item = listview.takeItem(ids)
-                del self.boundaryConditionEditor[ids]
-
-                # show the previous element
-                if ids > 0:
-                    ids -= 1
-                listview.item(ids).setSelected(True)
-                layout = self._bcWindow.layout()
-                item = layout.takeAt(1)
-                item.widget().close()
-                de = self.boundaryConditionEditor[ids]
-                layout.insertWidget(1, de, stretch=5)
-                de.show()
-                self._bcWindow.setWindowTitle(de.nameEdit.text())
-            else:
-                # remove the last element
-                del self.boundaryConditionEditor[ids]
-                self.boundaryConditionEditor = []
-                # close the window
-                self._bcWindow.hide()
+        self._editorFinished(self.boundaryConditionEditor, self.boundaryConditionEditorFinishedSlot, signal, ids)
 
     def matEditorFinishedSlot(self, signal, ids):
         """Method for handling the button events in the material settings.
@@ -699,97 +499,10 @@ class ElmerWindowHandler():
         signal: int
             Type of button clicked
         ids: int
-            ID of the body force set
+            ID of the material set
         """
-        # check if already in the storage and retrieve it
-        for mat in self.materialEditor:
-            temp = mat.ID
-            if temp == ids:
-                ids = self.materialEditor.index(mat)
-                break
-
-        listview = self._matWindow.layout().itemAt(0).widget()
-
-        # check OK-Button or Apply-Button
-        signalOK = False
-        if(signal == dynamiceditor.MatTypes.MAT_OK or
-           signal == dynamiceditor.MatTypes.MAT_APPLY):
-            signalOK = True
-
-        # OK or Apply
-        if(signalOK):
-            item = listview.item(ids)
-            de = self.materialEditor[ids]
-            matName = str(de.nameEdit.text()).strip()
-            if not matName:
-                sys.stdout.write("Material Name\n")
-                sys.stdout.flush()
-                return
-            else:
-                item.setText(matName)
-                self._matWindow.setWindowTitle(matName)
-                # hide window, when OK
-                if signal == dynamiceditor.MatTypes.MAT_OK:
-                    self._matWindow.hide()
-        # New -> create new Material
-        elif(signal == dynamiceditor.MatTypes.MAT_NEW):
-            # get window and layout
-            window = self._matWindow
-            layout = window.layout()
-
-            # new instance of the dynamic editor
-            current = self._matCurrent
-            de = dynamiceditor.DynamicEditor()
-            # put new instance into storage
-            self.materialEditor.append(de)
-            # populate tabs
-            de.setupTabs(self._elmerDefs, "Material", current)
-            de.applyButton.setText("Apply")
-            de.discardButton.setText("Delete")
-            de.dynamicEditorReady[int, int].connect(self.matEditorFinishedSlot)
-            de.spareButton.setText("Show Material Library")
-            de.spareButton.show()
-            de.dynamicEditorSpareButtonClicked[int, int].connect(self._showMaterialLibrary)
-
-            # clear right side of layout and at the new dynamic editor
-            item = layout.takeAt(1)
-            if item is not None:
-                item.widget().close()
-            layout.addWidget(de, stretch=5)
-            # add item to list
-            item = QtGui.QListWidgetItem()
-            item.setText(de.nameEdit.text())
-            listview.addItem(item)
-            self._matWindow.setWindowTitle(de.nameEdit.text())
-            # set new as selected
-            count = len(self.materialEditor)
-            listview.item(count - 1).setSelected(True)
-            self._matCurrent += 1
-        # Delete
-        elif(signal == dynamiceditor.MatTypes.MAT_DELETE):
-            # remove the current material
-            if len(self.materialEditor) > 1:
-                # remove the current element
-                item = listview.takeItem(ids)
-                del self.materialEditor[ids]
-
-                # show the previous element
-                if ids > 1:
-                    ids -= 1
-                listview.item(ids).setSelected(True)
-                layout = self._matWindow.layout()
-                item = layout.takeAt(1)
-                item.widget().close()
-                de = self.materialEditor[ids]
-                layout.insertWidget(1, de, stretch=5)
-                de.show()
-                self._matWindow.setWindowTitle(de.nameEdit.text())
-            else:
-                # remove the current element
-                del self.materialEditor[ids]
-                self.materialEditor = []
-                # close the window
-                self._matWindow.hide()
+        self._editorFinished(self.materialEditor, self.matEditorFinishedSlot, signal, ids,
+                             ("Show Material Library", self._showMaterialLibrary))
 
     def pdeEditorFinishedSlot(self, signal, ids):
         """Method for handling the button events in the equation settings.
@@ -799,97 +512,167 @@ class ElmerWindowHandler():
         signal: int
             Type of button clicked
         ids: int
-            ID of the body force set
+            ID of the equation set
         """
-        # check if already in the storage and retrieve it
-        for eq in self.equationEditor:
-            temp = eq.ID
-            if temp == ids:
-                ids = self.equationEditor.index(eq)
-                break
+        self._editorFinished(self.equationEditor, self.pdeEditorFinishedSlot, signal, ids,
+                             ("Edit Solver Settings", self._editNumericalMethods))
 
-        listview = self._eqWindow.layout().itemAt(0).widget()
+    def _editorFinished(self, registry, slot, signal, ids, spare=None):
+        """Handles the button events of the editor of a section.
 
-        # check OK-Button or Apply-Button
-        signalOK = False
-        if(signal == dynamiceditor.MatTypes.MAT_OK or
-           signal == dynamiceditor.MatTypes.MAT_APPLY):
-            signalOK = True
+        Args:
+        -----
+        registry: EntityRegistry-class
+            registry of the section
+        slot: method
+            slot of the section the button events of the editor are connected to
+        signal: int
+            Type of button clicked
+        ids: int
+            ID of the entity
+        spare: tuple
+            text of the spare button and slot it is connected to, optional
+        """
+        window = registry.window
 
         # OK or Apply
-        if(signalOK):
-            item = listview.item(ids)
-            de = self.equationEditor[ids]
-            equationName = str(de.nameEdit.text()).strip()
-            if not equationName:
-                sys.stdout.write("No equation name\n")
+        if(signal == dynamiceditor.MatTypes.MAT_OK or
+           signal == dynamiceditor.MatTypes.MAT_APPLY):
+            name = str(registry.name(ids)).strip()
+            if not name:
+                sys.stdout.write("No {} name\n".format(registry.section))
                 sys.stdout.flush()
                 return
             else:
-                item.setText(equationName)
-                self._eqWindow.setWindowTitle(equationName)
+                registry.setName(ids, name)
+                window.setWindowTitle(name)
                 # hide window, when OK
                 if signal == dynamiceditor.MatTypes.MAT_OK:
-                    self._eqWindow.hide()
-        # New -> create new Equation
+                    window.hide()
+        # New -> create new entity
         elif(signal == dynamiceditor.MatTypes.MAT_NEW):
-            # get window and layout
-            window = self._eqWindow
-            layout = window.layout()
-
-            # new instance of the dynamic editor
-            current = self._eqCurrent
-            de = dynamiceditor.DynamicEditor()
-            # put new instance into storage
-            self.equationEditor.append(de)
-            # populate tabs
-            de.setupTabs(self._elmerDefs, "Equation", current)
-            de.applyButton.setText("Apply")
-            de.discardButton.setText("Delete")
-            de.dynamicEditorReady[int, int].connect(self.pdeEditorFinishedSlot)
-            de.spareButton.setText("Edit Solver Settings")
-            de.spareButton.show()
-            de.dynamicEditorSpareButtonClicked[int, int].connect(self._editNumericalMethods)
-
-            # clear right side of layout and at the new dynamic editor
-            item = layout.takeAt(1)
-            if item is not None:
-                item.widget().close()
-            layout.addWidget(de, stretch=5)
-            # add item to list
-            item = QtGui.QListWidgetItem()
-            item.setText(de.nameEdit.text())
-            listview.addItem(item)
-            # set new as selected
-            count = len(self.equationEditor)
-            listview.item(count - 1).setSelected(True)
-            self._eqWindow.setWindowTitle(de.nameEdit.text())
-            self._eqCurrent += 1
+            ID = registry.nextID()
+            if registry.editor is None:
+                # the one editor of the section, bound to the selected entity
+                de = dynamiceditor.DynamicEditor()
+                de.setupTabs(self._elmerDefs, registry.section, ID, registry.store)
+                de.cache = self.editorCache
+                de.applyButton.setText("Apply")
+                de.discardButton.setText("Delete")
+                de.dynamicEditorReady[int, int].connect(slot)
+                if spare is not None:
+                    de.spareButton.setText(spare[0])
+                    de.spareButton.show()
+                    de.dynamicEditorSpareButtonClicked[int, int].connect(spare[1])
+                # keep the name in the browser and the comboboxes up to date
+                de.nameEdit.textChanged.connect(lambda text: registry.setName(de.ID, str(text).strip()))
+                registry.editor = de
+            else:
+                registry.store.addEntity(ID, registry.section + " " + str(ID+1))
+            registry.add(ID)
+            self._showEditor(registry, ID)
         # Delete
         elif(signal == dynamiceditor.MatTypes.MAT_DELETE):
-            # remove the current equation editor
-            if len(self.equationEditor) > 1:
-                # remove the current equation
-                item = listview.takeItem(ids)
-                del self.equationEditor[ids]
-
-                # show the previous equation
-                if ids > 0:
-                    ids -= 1
-                listview.item(ids).setSelected(True)
-                layout = self._eqWindow.layout()
-                item = layout.takeAt(1)
-                item.widget().close()
-                de = self.equationEditor[ids]
-                layout.insertWidget(1, de, stretch=5)
-                de.show()
-                self._eqWindow.setWindowTitle(de.nameEdit.text())
+            # show the previous element
+            ID = registry.remove(ids)
+            registry.store.removeEntity(ids)
+            if ID is not None:
+                self._showEditor(registry, ID)
             else:
-                # remove the current equation
-                del self.equationEditor[ids]
-                self.equationEditor = []
-                # close the window
-                self._eqWindow.hide()
+                # close the window and release the editor, a new one is
+                # created with the next new element
+                window.layout().takeAt(1)
+                registry.editor.dispose()
+                registry.editor = None
+                window.hide()
+
+    def _sectionWindow(self, registry, itemChanged):
+        """Creates the window of a section with the browser of the entities
+        on the left and the editor on the right side.
+
+        Args:
+        -----
+        registry: EntityRegistry-class
+            registry of the section
+        itemChanged: method
+            slot called when an entity is clicked in the browser
+
+        Return:
+        -------
+        window: QtWidget
+            QtWidget with the browser, the editor is added by _showEditor
+        """
+        window = QtGui.QWidget()
+        layout = QtGui.QHBoxLayout()
+        filterEdit = QtGui.QLineEdit()
+        filterEdit.setPlaceholderText("Filter")
+        listview = QtGui.QListView()
+        listview.setEditTriggers(QtGui.QAbstractItemView.NoEditTriggers)
+        listview.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOn)
+        registry.store = self.getStore(registry.section)
+        registry.window = window
+        registry.setView(listview, filterEdit)
+        listview.clicked[QtCore.QModelIndex].connect(itemChanged)
+        bulkButton = QtGui.QPushButton("Bulk edit...")
+        bulkButton.clicked.connect(lambda: self._showBulkEdit(registry))
+        browser = QtGui.QVBoxLayout()
+        browser.addWidget(filterEdit)
+        browser.addWidget(listview)
+        browser.addWidget(bulkButton)
+        # add browser to left layout-side
+        layout.addLayout(browser, stretch=1)
+        window.setLayout(layout)
+        return window
+
+    def _showBulkEdit(self, registry):
+        """Opens the bulk edit dialog for the entities shown by the browser of
+        a section window.
+
+        Args:
+        -----
+        registry: EntityRegistry-class
+            registry of the section
+        """
+        self._bulkEdit = bulkedit.BulkEditDialog(registry)
+        self._bulkEdit.show()
+
+    def _showEditor(self, registry, ID):
+        """Binds the editor of a section to an entity and shows it on the
+        right side of the section window.
+
+        Args:
+        -----
+        registry: EntityRegistry-class
+            registry of the section
+        ID: int
+            ID of the entity to show
+        """
+        de = registry.editor
+        de.bind(ID)
+        layout = registry.window.layout()
+        if layout.count() < 2:
+            layout.addWidget(de, stretch=5)
+        registry.select(ID)
+        de.show()
+        registry.window.setWindowTitle(de.nameEdit.text())
+
+    def getStore(self, Section):
+        """Returns the store keeping the values of all editors of a section.
+
+        Args:
+        -----
+        Section: str
+            Type of base layout (Equation, Material, ...)
+
+        Return:
+        -------
+        store: SectionStore-class
+            value store of the section
+        """
+        if Section not in self._stores:
+            layout = dynamiceditor.sectionLayout(self._elmerDefs, Section)
+            self._stores.update({Section: valuestore.SectionStore(layout)})
+        return self._stores[Section]
 
     def sif_write(self):
         """Sif file generator"""
@@ -912,30 +695,132 @@ class ElmerWindowHandler():
             QtGui.QMessageBox.warning(None, 'Error',
                                           "An error occured while writing the sif-file. {}".format(e))
 
-    def start_Solver(self):
-        """start ElmerSolver"""
-        # create new instance of runElmerSolver-class
-        rES = runsolver.runElmerSolver(self)
-        rES.start_Solver()
+    def start_Solver(self, force=False):
+        """start ElmerSolver
+
+        Args:
+        -----
+        force: bool
+            run the solver even if the results are in the result cache
+        """
+        # the run reports to its instance of the runElmerSolver-class, it is
+        # kept until the run has finished
+        if self.solverRunning():
+            QtGui.QMessageBox.warning(None, "Solver",
+                                      "ElmerSolver is still running or waiting for this case. Stop it or use the job queue.")
+            return
+        self.solverRun = runsolver.runElmerSolver(self)
+        self.solverRun.start_Solver(force)
         # QtGui.QMessageBox.information(None, 'Success', "ElmerSolver has terminated")
 
-    def sif_read(self):
-        """Sif reader"""
+    def solverRunning(self):
+        """Checks if the run started by start_Solver is waiting or running"""
+        return self.solverRun is not None and self.solverRun.isRunning()
+
+    def stop_Solver(self):
+        """Stops the solver run started by start_Solver, jobs of the queue are
+        cancelled in the job queue window"""
+        if self.solverRun is None or not self.solverRun.stop_Solver():
+            QtGui.QMessageBox.information(None, "Solver", "No solver run active.")
+
+    def queueSolver(self, priority=0, name=None, force=False):
+        """Adds a solver run of the current sif-file with the current parallel
+        settings to the job queue.
+
+        Args:
+        -----
+        priority: int
+            jobs with a higher priority are started first
+        name: str, optional
+            name of the job, the name of the sif-file if not given
+        force: bool
+            run the solver even if the results are in the result cache
+
+        Return:
+        -------
+        int or None
+            ID of the job, None if there is no sif-file
+        """
+        if self.sifFile == '' or self.meshDirectory == '':
+            QtGui.QMessageBox.warning(None, "Job queue",
+                                      "No sif-file or mesh-file name present in memory. Write sif or create mesh.")
+            return None
+        ps = self.psWindow
+        commands = ps.commands() if ps.parallelActiveCheckBox.isChecked() else None
+        return self.jobQueue.submit(self.sifFile, self.meshDirectory, ps.nofProcessorsSpinBox.value(),
+                                    priority, commands, str(self.gsWindow.postFileEdit.text()), name,
+                                    ps.scratchDirectory(), ps.copyBackCheckBox.isChecked(), None,
+                                    ps.resultCache(self.resultCache), force, ps.watchdog())
+
+    def showConvergence(self):
+        """Shows the convergence of the last solver run started by
+        start_Solver
+
+        Return:
+        -------
+        _convergenceView: ConvergenceView-class or None
+            window with the live plot, None if no run has been started
+        """
+        if self.solverRun is None or self.solverRun.monitor is None:
+            QtGui.QMessageBox.information(None, "Convergence", "No solver run started.")
+            return None
+        if self._convergenceView is None or self._convergenceView.monitor is not self.solverRun.monitor:
+            self._convergenceView = convergence.ConvergenceView(self.solverRun.monitor)
+        self._convergenceView.show()
+        return self._convergenceView
+
+    def showJobQueue(self):
+        """Shows the state of the job queue
+
+        Return:
+        -------
+        _jobQueueView: JobQueueView-class
+            window of the job queue
+        """
+        if self._jobQueueView is None:
+            self._jobQueueView = jobqueue.JobQueueView(self.jobQueue)
+        self._jobQueueView.show()
+        return self._jobQueueView
+
+    def showRunHistory(self):
+        """Shows the recorded solver runs
+
+        Return:
+        -------
+        _runHistoryView: RunHistoryView-class
+            window of the run history
+        """
+        if self._runHistoryView is None:
+            self._runHistoryView = runhistory.RunHistoryView(self.runHistory)
+        self._runHistoryView.show()
+        return self._runHistoryView
+
+    def sif_read(self, file=None):
+        """Sif reader, should be called with a new instance.
+
+        Args:
+        -----
+        file: str, optional
+            sif-file, selected by the user if not given
+
+        Return:
+        -------
+        bool
+            True if the sif-file has been read
+        """
         # create new instance of SifReader-class
         sr = sifreader.SifReader(self)
         # get the sif-file to read
-        file = QtGui.QFileDialog.getOpenFileName(parent=None, caption="Select sif-File", filter='*.sif')
-        if qt4:
-            file = str(file)
-        else:
-            file = str(file[0])
+        if file is None:
+            file = selectSifFile()
         if file == '':
-            return
+            return False
         try:
             sr.readSif(file)
             self.sifFile = file
             self.meshDirectory = os.path.dirname(file)
             QtGui.QMessageBox.information(None, 'Success', "Sif-File loaded.")
+            return True
         except Exception as e:
             if sr.errormsg:
                 QtGui.QMessageBox.warning(None, 'Error',
@@ -943,6 +828,61 @@ class ElmerWindowHandler():
             else:
                 QtGui.QMessageBox.warning(None, 'Error',
                                           "An error occured while reading the sif-file: {}".format(e))
+            return False
+
+    def project_save(self):
+        """Saves the complete settings into a project file"""
+        # create new instance of ProjectIO-class
+        pio = projectio.ProjectIO(self)
+        file = QtGui.QFileDialog.getSaveFileName(parent=None, caption="Save Elmer project",
+                                                 directory=self.meshDirectory, filter='*.xml')
+        if qt4:
+            file = str(file)
+        else:
+            file = str(file[0])
+        if file == '':
+            return
+        try:
+            pio.write(file)
+            QtGui.QMessageBox.information(None, 'Success', "Project saved.")
+        except Exception as e:
+            QtGui.QMessageBox.warning(None, 'Error',
+                                      "An error occured while saving the project: {}".format(e))
+
+    def project_load(self, file=None):
+        """Restores the complete settings from a project file. Should be
+        called with a new instance, the settings are partially restored if
+        the file cannot be read.
+
+        Args:
+        -----
+        file: str, optional
+            project file, selected by the user if not given
+
+        Return:
+        -------
+        bool
+            True if the project has been loaded
+        """
+        # create new instance of ProjectIO-class
+        pio = projectio.ProjectIO(self)
+        if file is None:
+            file = selectProjectFile()
+        if file == '':
+            return False
+        try:
+            pio.read(file)
+            self.meshDirectory = os.path.dirname(file)
+            QtGui.QMessageBox.information(None, 'Success', "Project loaded.")
+            return True
+        except Exception as e:
+            if pio.errormsg:
+                QtGui.QMessageBox.warning(None, 'Error',
+                                          pio.errormsg)
+            else:
+                QtGui.QMessageBox.warning(None, 'Error',
+                                          "An error occured while loading the project: {}".format(e))
+            return False
 
     def _initGeneralSetup(self):
         """Load the default general settings.
@@ -979,19 +919,26 @@ class ElmerWindowHandler():
         name: str
             Name of the object whose boundary properties have been changed.
         """
-        self.elementProperties.update({str(name): boundaryPropertyEditor})
+        condition = self.boundaryConditionEditor.model.ID(boundaryPropertyEditor.boundaryConditionCombo.currentIndex())
+        asBody = int(boundaryPropertyEditor.boundaryAsABody.checkState())
+        self.elementProperties.setBoundary(str(name), condition, asBody)
 
     def _bodyPropertyChanged(self, bodyPropertyEditor, name):
         """Signal when body properties of 'name' have changed.
 
         Args:
         -----
-        boundaryPropertyEditor: BodyPropertyEditor-class
+        bodyPropertyEditor: BodyPropertyEditor-class
             The current Body property
         name: str
             Name of the object whose body properties have been changed.
         """
-        self.elementProperties.update({str(name): bodyPropertyEditor})
+        be = bodyPropertyEditor
+        self.elementProperties.setBody(str(name),
+                                       self.equationEditor.model.ID(be.equationCombo.currentIndex()),
+                                       self.materialEditor.model.ID(be.materialCombo.currentIndex()),
+                                       self.bodyForceEditor.model.ID(be.bodyForceCombo.currentIndex()),
+                                       self.initialConditionEditor.model.ID(be.initialConditionCombo.currentIndex()))
 
     def _eqItemChanged(self, index):
         """Method for changing the selected item in the equation editor view
@@ -1001,16 +948,7 @@ class ElmerWindowHandler():
         index: QModelIndex
             index of the newly selected item.
         """
-        # 'hide' the old editor == second element in layout
-        layout = self._eqWindow.layout()
-        item = layout.takeAt(1)
-        if item:
-            item.widget().close()
-        # 'show' the new editor == insert the selected editor
-        de = self.equationEditor[index.row()]
-        de.show()
-        layout.insertWidget(1, de, stretch=5)
-        self._eqWindow.setWindowTitle(de.nameEdit.text())
+        self._showEditor(self.equationEditor, self.equationEditor.IDAt(index))
 
     def _matItemChanged(self, index):
         """Method for changing the selected item in the material editor view
@@ -1020,15 +958,7 @@ class ElmerWindowHandler():
         index: QModelIndex
             index of the newly selected item.
         """
-        # 'hide' the old editor == second element in layout
-        layout = self._matWindow.layout()
-        item = layout.takeAt(1)
-        item.widget().close()
-        # 'show' the new editor == insert the selected editor
-        de = self.materialEditor[index.row()]
-        layout.insertWidget(1, de, stretch=5)
-        de.show()
-        self._matWindow.setWindowTitle(de.nameEdit.text())
+        self._showEditor(self.materialEditor, self.materialEditor.IDAt(index))
 
     def _bfItemChanged(self, index):
         """Method for changing the selected item in the body force editor view
@@ -1038,33 +968,18 @@ class ElmerWindowHandler():
         index: QModelIndex
             index of the newly selected item.
         """
-        # 'hide' the old editor == second element in layout
-        layout = self._bfWindow.layout()
-        item = layout.takeAt(1)
-        item.widget().close()
-        # 'show' the new editor == insert the selected editor
-        de = self.bodyForceEditor[index.row()]
-        layout.insertWidget(1, de, stretch=5)
-        de.show()
-        self._bfWindow.setWindowTitle(de.nameEdit.text())
+        self._showEditor(self.bodyForceEditor, self.bodyForceEditor.IDAt(index))
 
     def _icItemChanged(self, index):
-        """Method for changing the selected item in the body force editor view
+        """Method for changing the selected item in the initial condition
+        editor view
 
         Args:
         -----
         index: QModelIndex
             index of the newly selected item.
         """
-        # 'hide' the old editor == second element in layout
-        layout = self._icWindow.layout()
-        item = layout.takeAt(1)
-        item.widget().close()
-        # 'show' the new editor == insert the selected editor
-        de = self.initialConditionEditor[index.row()]
-        layout.insertWidget(1, de, stretch=5)
-        de.show()
-        self._icWindow.setWindowTitle(de.nameEdit.text())
+        self._showEditor(self.initialConditionEditor, self.initialConditionEditor.IDAt(index))
 
     def _bcItemChanged(self, index):
         """Method for changing the selected item in the boundary condition
@@ -1075,15 +990,7 @@ class ElmerWindowHandler():
         index: QModelIndex
             index of the newly selected item.
         """
-        # 'hide' the old editor == second element in layout
-        layout = self._bcWindow.layout()
-        item = layout.takeAt(1)
-        item.widget().close()
-        # 'show' the new editor == insert the selected editor
-        de = self.boundaryConditionEditor[index.row()]
-        layout.insertWidget(1, de, stretch=5)
-        de.show()
-        self._bcWindow.setWindowTitle(de.nameEdit.text())
+        self._showEditor(self.boundaryConditionEditor, self.boundaryConditionEditor.IDAt(index))
 
     def _showMaterialLibrary(self, current, ids):
         """Opens the material library and connects it to the currently
@@ -1096,10 +1003,42 @@ class ElmerWindowHandler():
         ids: int
             ID of the current material
         """
-        self._materialLibrary.editor = self.materialEditor[ids]
+        self._materialLibrary.editor = self.materialEditor.editor
         self._materialLibrary.elmerDefs = self._elmerDefs
         self._materialLibrary.show()
 
+    def _getSolverSettings(self, current, title):
+        """Returns the settings of a solver, creates them if necessary.
+
+        Args:
+        -----
+        current: int
+            tab-index of the solver
+        title: str
+            name of the solver
+
+        Return:
+        -------
+        SolverSettings-class or None
+            settings of the solver, None for the 'General' tab
+        """
+        if(title == "General"):
+            return None
+
+        # if tab is not yet in list, resize list and copy previous items
+        if(current >= len(self.solverSettings)):
+            tmp = (current + 1) * [None]
+            for idx, element in enumerate(self.solverSettings):
+                tmp[idx] = element
+            self.solverSettings = tmp
+        # create a new record of the solver settings and put it into storage
+        if not self.solverSettings[current]:
+            self.solverSettings[current] = solverparameters.SolverSettings(self._path_forms, title, current)
+            store = self.getStore("Solver")
+            if not store.hasEntity(current):
+                store.addEntity(current, "Solver " + str(current + 1))
+        return self.solverSettings[current]
+
     def _editNumericalMethods(self, current, ids, show=True):
         """Edit the solver specific properties
 
@@ -1113,50 +1052,42 @@ class ElmerWindowHandler():
             flag to show window or not
         """
 
-        title = ""
         # get active tab in the currently opened equation set
-        for eq in self.equationEditor:
-            if eq.ID == ids:
-                title = eq.tabWidget.tabText(current)
-                break
+        title = self.equationEditor.editor.tabWidget.tabText(current)
 
         if(title == "General"):
             sys.stdout.write("No solver controls for 'General' equation options")
             sys.stdout.flush()
             return
 
-        # if tab is not yet in list, resize list and copy previous items
-        if(current >= len(self.solverParameterEditor)):
-            tmp = (current + 1) * [None]
-            for idx, element in enumerate(self.solverParameterEditor):
-                tmp[idx] = element
-            self.solverParameterEditor = tmp
-        # create a new instane of the Solver settings and put it into storage
-        if not self.solverParameterEditor[current]:
-            self.solverParameterEditor[current] = solverparameters.SolverParameterEditor(self._path_forms)
+        settings = self._getSolverSettings(current, title)
 
-        spe = self.solverParameterEditor[current]
-        spe.setWindowTitle("Solver control for {}".format(title))
-        spe.solverName = title
+        # the dialog is only created when it is opened the first time
+        if settings.editor is None:
+            spe = solverparameters.SolverParameterEditor(self._path_forms)
+            spe.setWindowTitle("Solver control for {}".format(title))
+            spe.solverName = title
 
-        if(spe.generalOptions is None):
             spe.generalOptions = dynamiceditor.DynamicEditor()
-            spe.generalOptions.setupTabs(self._elmerDefs, "Solver", current)
-            spe.solverControlTabs.insertTab(0, spe.generalOptions.tabWidget.widget(current),
-                                            "Solver specific options")
-
-        for i in range(0, spe.generalOptions.tabWidget.count()):
-            if(spe.generalOptions.tabWidget.tabText(i) == title):
-                spe.solverControlTabs.insertTab(0, spe.generalOptions.tabWidget.widget(i),
-                                                "Solver specific options")
-                break
-
+            spe.generalOptions.setupTabs(self._elmerDefs, "Solver", current, self.getStore("Solver"))
+            for i in range(0, spe.generalOptions.tabWidget.count()):
+                if(spe.generalOptions.tabWidget.tabText(i) == title):
+                    spe.solverControlTabs.insertTab(0, spe.generalOptions.tabWidget.widget(i),
+                                                    "Solver specific options")
+                    break
+            settings.attach(spe)
+
+        # the dialog is released again when it has not been used for a while
+        spe = settings.editor
+        # the settings are kept alive by the cache, their id is unique
+        self.editorCache.touch(("Solver", id(settings)), len(solverparameters.formDefaults(self._path_forms)[0]),
+                               settings.detach, spe.isVisible)
         if show:
             spe.show()
 
     def _xmlMerge(self, path):
-        """Merges all edf-xml files in the given directory into a temporary
-        file
+        """Merges all edf-xml files in the given directory into the
+        elmerDefs
 
         Args:
         -----
@@ -1164,27 +1095,105 @@ class ElmerWindowHandler():
             path to the Elmer xml-files configuration files
 
         """
-        # create a temporary file
-        mybuf = tempfile.TemporaryFile()
-
-        gen_file = path.joinpath("edf.xml")
-
-        # general settings
-        first = et.parse(gen_file).getroot()
-
-        # solver settings
-        xml_files = glob.glob(str(path.joinpath("*.xml")))
-        xml_files = [file for file in xml_files if not os.path.basename(file).startswith("edf")]
-        xml_files = [file for file in xml_files if not os.path.basename(file).startswith("eg")]
-
-        for xml_file in xml_files:
-            data = et.parse(xml_file).getroot()
-            first.extend(data)
-
-        mybuf.write(et.tostring(first))
-        mybuf.seek(0)
-        temp = mybuf.read().decode()
-        mybuf.close()
-
-        self._elmerDefs = QtXml.QDomDocument()
-        self._elmerDefs.setContent(temp)
+        self._elmerDefs = mergeEdfs(path)
+
+    def hideWindows(self):
+        """Hides all windows of this instance, e.g. when another case of the
+        session becomes the current one"""
+        for window in [self.gsWindow, self.psWindow, self._eqWindow, self._matWindow,
+                       self._bfWindow, self._bcWindow, self._icWindow, self._window,
+                       self._bulkEdit, self._keywordSearch, self._jobQueueView,
+                       self._convergenceView, self._runHistoryView]:
+            if window is not None:
+                window.hide()
+        for settings in self.solverSettings:
+            if settings is not None and settings.editor is not None:
+                settings.editor.hide()
+
+
+def selectSifFile():
+    """Asks the user for the sif-file to read.
+
+    Return:
+    -------
+    str
+        path to the sif-file, empty if the dialog was cancelled
+    """
+    file = QtGui.QFileDialog.getOpenFileName(parent=None, caption="Select sif-File", filter='*.sif')
+    if qt4:
+        return str(file)
+    return str(file[0])
+
+
+def selectProjectFile():
+    """Asks the user for the project file to load.
+
+    Return:
+    -------
+    str
+        path to the project file, empty if the dialog was cancelled
+    """
+    file = QtGui.QFileDialog.getOpenFileName(parent=None, caption="Select Elmer project",
+                                             filter='*.xml')
+    if qt4:
+        return str(file)
+    return str(file[0])
+
+
+def elmerPaths():
+    """Returns the paths to the Elmer xml-files and to the ui-files.
+
+    Return:
+    -------
+    tuple
+        pathlib Path-objects of the edf- and the forms-directory
+    """
+    path = shutil.which('ElmerSolver')
+    path = path[:-19]
+    path += r"share/ElmerGUI/edf/"
+    path_edfs = Path(path)
+
+    path = os.path.dirname(os.path.abspath(__file__))
+    path += r"/forms"
+    path_forms = Path(path)
+    return path_edfs, path_forms
+
+
+def mergeEdfs(path):
+    """Merges all edf-xml files in the given directory.
+
+    Args:
+    -----
+    path: pathlib PurePath-object
+        path to the Elmer xml-files configuration files
+
+    Return:
+    -------
+    elmerDefs: QDomDocument
+        contents of the Elmer edf files in xml-format
+    """
+    # create a temporary file
+    mybuf = tempfile.TemporaryFile()
+
+    gen_file = path.joinpath("edf.xml")
+
+    # general settings
+    first = et.parse(gen_file).getroot()
+
+    # solver settings
+    xml_files = glob.glob(str(path.joinpath("*.xml")))
+    xml_files = [file for file in xml_files if not os.path.basename(file).startswith("edf")]
+    xml_files = [file for file in xml_files if not os.path.basename(file).startswith("eg")]
+
+    for xml_file in xml_files:
+        data = et.parse(xml_file).getroot()
+        first.extend(data)
+
+    mybuf.write(et.tostring(first))
+    mybuf.seek(0)
+    temp = mybuf.read().decode()
+    mybuf.close()
+
+    elmerDefs = QtXml.QDomDocument()
+    elmerDefs.setContent(temp)
+    return elmerDefs
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+Session class
+
+Keeps several independent cases (ElmerWindowHandler instances) in one
+Salome session. The immutable data, i.e. the compiled elmerDefs with their
+section layouts, the material library, the keyword index and the compiled
+ui-forms, is loaded once and shared by all cases, as are the memory budget
+of the editor widgets, the job queue and the result cache and the run history
+of the solver runs.
+"""
+import editorcache
+import elmer_window_handler
+import jobqueue
+import resultcache
+import runhistory
+import materiallibrary
+
+
+class Session():
+    """Cases by name, one of them is the current case"""
+
+    def __init__(self, editorBudget=editorcache.DEFAULT_BUDGET):
+        """Constructor
+
+        Args:
+        -----
+        editorBudget: int
+            number of input widgets of the editors of all cases kept alive
+        """
+        path_edfs, path_forms = elmer_window_handler.elmerPaths()
+
+        # public
+        self.elmerDefs = elmer_window_handler.mergeEdfs(path_edfs)
+        self.materialLibrary = materiallibrary.MaterialLibrary(path_forms, path_edfs)
+        self.keywordIndex = None  # built by the first case that needs it
+        self.editorCache = editorcache.EditorCache(editorBudget)  # widgets of the editors of all cases
+        self.runHistory = runhistory.RunHistory()
+        self.jobQueue = jobqueue.JobQueue(history=self.runHistory)  # solver runs of all cases
+        self.resultCache = resultcache.ResultCache()
+        self.current = None
+
+        # private
+        self._cases = {}  # ElmerWindowHandler by name, in order of creation
+        self._currentName = None
+        self._count = 0
+
+    def newCase(self, name=None):
+        """Creates a new case and makes it the current one.
+
+        Args:
+        -----
+        name: str, optional
+            name of the case, 'Case <n>' if not given
+
+        Return:
+        -------
+        ElmerWindowHandler-class
+            the new case
+        """
+        if name is not None and name in self._cases:
+            raise ValueError("Case {} exists already".format(name))
+        return self._add(elmer_window_handler.ElmerWindowHandler(self), name)
+
+    def resetCase(self, load=None):
+        """Replaces the current case by an empty one with the same name, e.g.
+        to read a sif or project file into. Raises a RuntimeError if the
+        solver of the current case is running, its run would be orphaned.
+
+        Args:
+        -----
+        load: method, optional
+            called with the new case before it replaces the current one,
+            e.g. reads a file into it. If it returns False, the new case is
+            discarded and the current case is kept.
+
+        Return:
+        -------
+        ElmerWindowHandler-class
+            the current case
+        """
+        if self.current is not None:
+            self._checkIdle(self._currentName)
+        case = elmer_window_handler.ElmerWindowHandler(self)
+        if load is not None and not load(case):
+            case.hideWindows()
+            return self.current
+        if self.current is None:
+            return self._add(case)
+        self.current.hideWindows()
+        self._cases.update({self._currentName: case})
+        self.current = case
+        return case
+
+    def switch(self, name):
+        """Makes another case the current one. The windows of the previous
+        case are hidden, nothing is reloaded.
+
+        Args:
+        -----
+        name: str
+            name of the case
+
+        Return:
+        -------
+        ElmerWindowHandler-class
+            the current case
+        """
+        case = self._cases[name]
+        if self.current is not None and self.current is not case:
+            self.current.hideWindows()
+        self.current = case
+        self._currentName = name
+        return case
+
+    def closeCase(self, name):
+        """Removes a case from the session. If it was the current case, the
+        previous case becomes the current one. Raises a RuntimeError if the
+        solver of the case is running.
+
+        Args:
+        -----
+        name: str
+            name of the case
+
+        Return:
+        -------
+        ElmerWindowHandler-class or None
+            the current case
+        """
+        self._checkIdle(name)
+        case = self._cases.pop(name)
+        case.hideWindows()
+        if case is self.current:
+            self.current = None
+            self._currentName = None
+            if self._cases:
+                self.switch(list(self._cases.keys())[-1])
+        return self.current
+
+    def currentName(self):
+        """Returns the name of the current case"""
+        return self._currentName
+
+    def names(self):
+        """Returns the names of all cases in order of creation"""
+        return list(self._cases.keys())
+
+    def _add(self, case, name=None):
+        self._count += 1
+        if name is None:
+            name = "Case " + str(self._count)
+        self._cases.update({name: case})
+        return self.switch(name)
+
+    def _checkIdle(self, name):
+        if self._cases[name].solverRunning():
+            raise RuntimeError("ElmerSolver is still running for case {}. Stop it first.".format(name))
+
+    def __getitem__(self, name):
+        return self._cases[name]
+
+    def __contains__(self, name):
+        return name in self._cases
+
+    def __len__(self):
+        return len(self._cases)
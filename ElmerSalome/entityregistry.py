@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+Entity registry class
+
+Keeps the entities (equations, materials, ...) of a section by their stable
+ID together with the item model shared by the browser of the section window
+and the comboboxes of the property dialogs. The values of the entities are
+kept in the SectionStore, a single DynamicEditor per section is bound to the
+entity selected in the browser.
+"""
+try:
+    from PyQt4 import QtCore
+    from PyQt4.QtGui import QSortFilterProxyModel
+except ImportError:
+    from PyQt5 import QtCore
+    from PyQt5.QtCore import QSortFilterProxyModel
+
+
+class EntityRegistry():
+    """Registry of the entities of a section. The order of creation is kept
+    in the rows of the shared EntityModel, which knows the row of each ID, so
+    adding and looking up an entity does not depend on the number of
+    entities. Positional access (registry[0], len, iteration) returns IDs and
+    is provided for the sif reader and the project files."""
+
+    def __init__(self, section):
+        """Constructor
+
+        Args:
+        -----
+        section: str
+            Type of base layout (Equation, Material, ...)
+        """
+        # public
+        self.section = section
+        self.store = None  # SectionStore of the section
+        self.editor = None  # DynamicEditor bound to the selected entity
+        self.window = None
+        self.listview = None
+        self.model = EntityModel()  # names for the browser and the comboboxes
+        self.filterModel = EntityFilterModel()
+        self.filterModel.setSourceModel(self.model)
+
+        # private
+        self._nextID = 0
+
+    def nextID(self):
+        """Returns the ID for the next entity, IDs are never reused"""
+        return self._nextID
+
+    def setView(self, listview, filterEdit=None):
+        """Shows the entities in a listview.
+
+        Args:
+        -----
+        listview: QListView
+            browser of the section window
+        filterEdit: QLineEdit, optional
+            the browser only shows the entities containing its text
+        """
+        self.listview = listview
+        listview.setUniformItemSizes(True)
+        listview.setModel(self.filterModel)
+        if filterEdit is not None:
+            filterEdit.textChanged.connect(self.filterModel.setFilterFixedString)
+
+    def add(self, ID):
+        """Appends an entity that has already been added to the store.
+
+        Args:
+        -----
+        ID: int
+            new ID
+        """
+        self._nextID = max(self._nextID, ID + 1)
+        self.model.append(ID, str(self.store.name(ID)).strip())
+
+    def remove(self, ID):
+        """Removes an entity from the registry, the store is not changed.
+
+        Args:
+        -----
+        ID: int
+            ID of the entity
+
+        Return:
+        -------
+        int or None
+            previous ID, or the next one if the first entity was removed
+        """
+        row = self.model.row(ID)
+        self.model.remove(ID)
+        # the row of the empty entry gives None
+        prev = self.model.ID(row - 1)
+        return prev if prev is not None else self.model.ID(row)
+
+    def select(self, ID):
+        """Makes entity ID the current item of the browser"""
+        if self.listview is None:
+            return
+        index = self.filterModel.mapFromSource(self.model.index(self.model.row(ID), 0))
+        if index.isValid():
+            self.listview.setCurrentIndex(index)
+        else:
+            self.listview.clearSelection()
+
+    def name(self, ID):
+        """Returns the name of entity ID"""
+        return self.store.name(ID)
+
+    def setName(self, ID, name):
+        """Changes the name of entity ID in the store and in the shared item
+        model"""
+        if self.store.name(ID) != name:
+            self.store.setName(ID, name)
+        self.model.rename(ID, name)
+
+    def refresh(self, ID):
+        """Updates the editor if it is bound to entity ID, has to be called
+        after the values of the entity have been changed in the store"""
+        name = str(self.store.name(ID)).strip()
+        self.model.rename(ID, name)
+        if self.editor is not None and self.editor.ID == ID:
+            self.editor.refresh()
+            if self.window is not None:
+                self.window.setWindowTitle(name)
+
+    def IDAt(self, index):
+        """Returns the ID of the entity of a browser index.
+
+        Args:
+        -----
+        index: QModelIndex
+            index of the item in the listview
+        """
+        ID = index.data(QtCore.Qt.UserRole)
+        if hasattr(ID, 'toPyObject'):
+            ID = ID.toPyObject()
+        return int(ID)
+
+    def filtered(self):
+        """Returns the IDs of the entities shown by the browser, i.e. matching
+        the current filter, in order of creation"""
+        model = self.filterModel
+        return [self.IDAt(model.index(row, 0)) for row in range(model.rowCount())]
+
+    def ids(self):
+        """Returns the IDs of all entities in order of creation"""
+        return self.model.ids()
+
+    def __contains__(self, ID):
+        return self.model.row(ID) > 0
+
+    def __len__(self):
+        return self.model.rowCount() - 1
+
+    def __iter__(self):
+        return iter(self.model.ids())
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return self.model.ids()[position]
+        count = len(self)
+        if position < 0:
+            position += count
+        if position < 0 or position >= count:
+            raise IndexError("{} index out of range".format(self.section))
+        return self.model.ID(position + 1)
+
+
+class EntityModel(QtCore.QAbstractListModel):
+    """Item model of the names of the entities of a section, shared by the
+    browser of the section window and the comboboxes of all property
+    dialogs. The first row is the empty entry, UserRole of each row is the ID
+    of the entity (None for the empty entry)."""
+
+    def __init__(self):
+        super(EntityModel, self).__init__()
+        self._ids = [None]
+        self._names = [""]
+        self._rows = {}  # row by ID
+        self._valid = 1  # the rows are correct up to this one, see row
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._ids)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (QtCore.Qt.DisplayRole, QtCore.Qt.EditRole):
+            return self._names[index.row()]
+        if role == QtCore.Qt.UserRole:
+            return self._ids[index.row()]
+        return None
+
+    def row(self, ID):
+        """Returns the row of entity ID, 0 (empty entry) if there is none"""
+        row = self._rows.get(ID, 0)
+        if row >= self._valid:
+            # a removal moved the rows behind it up by one, they are indexed
+            # again from the first removed row on
+            count = len(self._ids)
+            self._rows.update(zip(self._ids[self._valid:], range(self._valid, count)))
+            self._valid = count
+            row = self._rows.get(ID, 0)
+        return row
+
+    def ID(self, row):
+        """Returns the ID of the entity in row, None for the empty entry"""
+        if row < 0 or row >= len(self._ids):
+            return None
+        return self._ids[row]
+
+    def ids(self):
+        """Returns the IDs of all entities in order of the rows"""
+        return self._ids[1:]
+
+    def find(self, name):
+        """Returns the ID of the first entity with the given name, None if
+        there is none"""
+        try:
+            return self._ids[self._names.index(name, 1)]
+        except ValueError:
+            return None
+
+    def append(self, ID, name):
+        """Appends a row for entity ID"""
+        row = len(self._ids)
+        self.beginInsertRows(QtCore.QModelIndex(), row, row)
+        self._ids.append(ID)
+        self._names.append(name)
+        self._rows.update({ID: row})
+        if self._valid == row:
+            self._valid += 1
+        self.endInsertRows()
+
+    def rename(self, ID, name):
+        """Changes the name of entity ID"""
+        row = self.row(ID)
+        if row > 0 and self._names[row] != name:
+            self._names[row] = name
+            index = self.index(row, 0)
+            self.dataChanged.emit(index, index)
+
+    def remove(self, ID):
+        """Removes the row of entity ID"""
+        row = self.row(ID)
+        if row > 0:
+            self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+            del self._ids[row]
+            del self._names[row]
+            del self._rows[ID]
+            self._valid = min(self._valid, row)
+            self.endRemoveRows()
+
+
+class EntityFilterModel(QSortFilterProxyModel):
+    """Proxy model of the browser of a section window. Hides the empty entry
+    of the EntityModel and filters the entities by name, case insensitive."""
+
+    def __init__(self):
+        super(EntityFilterModel, self).__init__()
+        self.setFilterCaseSensitivity(QtCore.Qt.CaseInsensitive)
+
+    def filterAcceptsRow(self, row, parent):
+        if row == 0:
+            return False
+        return super(EntityFilterModel, self).filterAcceptsRow(row, parent)
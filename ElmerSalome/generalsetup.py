@@ -8,10 +8,10 @@ General setup class
 """
 try:
     from PyQt4 import QtGui
-    from PyQt4 import uic
 except ImportError:
     from PyQt5 import QtWidgets as QtGui
-    from PyQt5 import uic
+
+import uiforms
 
 
 class GeneralSetup(QtGui.QDialog):
@@ -27,7 +27,7 @@ class GeneralSetup(QtGui.QDialog):
             window.
         """
         super(GeneralSetup, self).__init__()
-        uic.loadUi(path_forms.joinpath("generalsetup.ui"), self)
+        uiforms.loadUi(path_forms.joinpath("generalsetup.ui"), self)
         self.simulationFreeTextEdit.setText("Use Mesh Names = Logical True")
         self.acceptButton.clicked.connect(self.applyChanges)
 
@@ -0,0 +1,434 @@
+# -*- coding: utf-8 -*-
+"""
+Job queue class
+
+Runs the solver for many cases or variants of a case. Jobs are started in
+order of their priority, jobs of the same priority in order of submission,
+as long as the number of processes of the running jobs stays within the core
+budget of the machine.
+"""
+try:
+    from PyQt4 import QtGui
+    from PyQt4 import QtCore
+except ImportError:
+    from PyQt5 import QtWidgets as QtGui
+    from PyQt5 import QtCore
+
+import heapq
+import multiprocessing
+import os
+import sqlite3
+import time
+
+import convergence
+import loganalyzer
+import runhistory
+import runsolver
+import watchdog
+import workspace
+
+# states of a job
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+class job_t():
+    """
+    Job of the queue.
+
+    :ID: number of the job, in order of submission
+    :name: name shown in the queue view
+    :sifFile: sif-file of the case
+    :meshDirectory: mesh directory of the case
+    :nprocs: number of processes (cores) used by the job
+    :priority: jobs with a higher priority are started first
+    :commands: command templates of the parallel settings, None for single
+               core operation
+    :postFile: post file name of the case
+    :workspace: Workspace-class, working directory and environment of the job
+    :state: QUEUED, RUNNING, DONE, FAILED or CANCELLED
+    :submitted, started, ended: times of the job, None if not yet reached
+    :pipeline: Pipeline-class of the running or finished job
+    :monitor: ConvergenceMonitor-class parsing the output of the job
+    :summary: summary_t of the log file of the finished job
+    :sampler: ProcessSampler-class measuring CPU time and memory of the job
+    :cache: ResultCache-class of the job, None if the results are not cached
+    :force: run the solver even if the results are in the cache
+    :watchdogSettings: keyword arguments of the watchdog, None if the job is
+                       not watched
+    :watchdog: Watchdog-class of the running or finished job
+    :message: reason if the job could not be started or the watchdog was
+              triggered
+    """
+    ID = 0
+    name = ""
+    sifFile = ""
+    meshDirectory = ""
+    nprocs = 1
+    priority = 0
+    commands = None
+    postFile = ""
+    workspace = None
+    state = QUEUED
+    submitted = None
+    started = None
+    ended = None
+    pipeline = None
+    monitor = None
+    summary = None
+    sampler = None
+    cache = None
+    force = False
+    watchdogSettings = None
+    watchdog = None
+    message = ""
+
+    def wallTime(self):
+        """Returns the wall time of the job in seconds, up to now for a
+        running job"""
+        if self.started is None:
+            return 0.
+        return (self.ended or time.time()) - self.started
+
+
+class JobQueue(QtCore.QObject):
+    """Priority queue of the jobs and scheduler of the cores. A job needs as
+    many free cores as it has processes, a job needing more cores than the
+    budget is started when no other job is running. The first job waiting is
+    never overtaken by jobs of lower priority or submitted later, unless it
+    waits for a running job working in the same case or mesh directory, see
+    Workspace.sharedDirectories."""
+
+    # signals
+    changed = QtCore.pyqtSignal(name="changed")
+    jobStarted = QtCore.pyqtSignal(int, name="jobStarted")
+    jobFinished = QtCore.pyqtSignal(int, str, name="jobFinished")
+
+    def __init__(self, budget=None, history=None):
+        """Constructor
+
+        Args:
+        -----
+        budget: int, optional
+            number of cores available for the jobs, the number of cores of
+            the machine if not given
+        history: RunHistory-class, optional
+            database recording the finished jobs, not recorded if not given
+        """
+        super(JobQueue, self).__init__()
+
+        # public
+        self.budget = budget or multiprocessing.cpu_count()
+        self.history = history
+
+        # private
+        self._jobs = {}  # job_t by ID, in order of submission
+        self._waiting = []  # heap of (-priority, ID)
+        self._nextID = 1
+
+    def submit(self, sifFile, meshDirectory, nprocs=1, priority=0, commands=None,
+               postFile="", name=None, scratch=None, copyBack=True, env=None, cache=None,
+               force=False, watchdog=None):
+        """Adds a job to the queue and starts it if there are enough free
+        cores.
+
+        Args:
+        -----
+        sifFile: str
+            sif-file of the case
+        meshDirectory: str
+            mesh directory of the case
+        nprocs: int
+            number of processes
+        priority: int
+            jobs with a higher priority are started first
+        commands: dict, optional
+            command templates as returned by ParallelSettings.commands, single
+            core operation if None
+        postFile: str
+            post file name of the case
+        name: str, optional
+            name of the job, the name of the sif-file if not given
+        scratch: str, optional
+            the job works in a copy of the case in this directory
+        copyBack: bool
+            copy the results from the scratch directory back to the case
+        env: dict, optional
+            environment variables of the job
+        cache: ResultCache-class, optional
+            the results are restored from and stored in this cache
+        force: bool
+            run the solver even if the results are in the cache
+        watchdog: dict, optional
+            keyword arguments of the watchdog as returned by
+            ParallelSettings.watchdog, the job is not watched if not given
+
+        Return:
+        -------
+        int
+            ID of the job
+        """
+        job = job_t()
+        job.ID = self._nextID
+        self._nextID += 1
+        job.name = name or os.path.basename(sifFile)
+        job.sifFile = sifFile
+        job.meshDirectory = meshDirectory
+        job.nprocs = max(1, nprocs) if commands is not None else 1
+        job.priority = priority
+        job.commands = commands
+        job.postFile = postFile
+        job.workspace = workspace.Workspace(sifFile, meshDirectory, scratch, copyBack, env)
+        job.monitor = convergence.ConvergenceMonitor()
+        job.cache = cache
+        job.force = force
+        job.watchdogSettings = watchdog
+        job.submitted = time.time()
+        self._jobs.update({job.ID: job})
+        heapq.heappush(self._waiting, (-priority, job.ID))
+        self._schedule()
+        self.changed.emit()
+        return job.ID
+
+    def nextID(self):
+        """Returns the ID of the next job submitted"""
+        return self._nextID
+
+    def topPriority(self):
+        """Returns a priority higher than the ones of all waiting jobs, e.g.
+        for a run started directly by the user"""
+        return max([job.priority for job in self.waiting()] + [0]) + 1
+
+    def cancel(self, ID):
+        """Cancels a job. A waiting job is removed from the queue, the
+        process trees of a running job are terminated.
+
+        Args:
+        -----
+        ID: int
+            ID of the job
+
+        Return:
+        -------
+        bool
+            False if the job has already finished
+        """
+        job = self._jobs[ID]
+        if job.state == QUEUED:
+            # removed from the heap when it comes up
+            job.state = CANCELLED
+            job.ended = time.time()
+            self.jobFinished.emit(job.ID, job.state)
+            self._schedule()
+        elif job.state == RUNNING:
+            job.state = CANCELLED
+            job.pipeline.kill()
+        else:
+            return False
+        self.changed.emit()
+        return True
+
+    def setBudget(self, budget):
+        """Changes the number of cores available for the jobs, running jobs
+        are not affected"""
+        self.budget = max(1, budget)
+        self._schedule()
+        self.changed.emit()
+
+    def job(self, ID):
+        """Returns the job with the given ID"""
+        return self._jobs[ID]
+
+    def jobs(self):
+        """Returns all jobs in order of submission"""
+        return list(self._jobs.values())
+
+    def waiting(self):
+        """Returns the waiting jobs in the order they will be started"""
+        return [self._jobs[ID] for priority, ID in sorted(self._waiting)
+                if self._jobs[ID].state == QUEUED]
+
+    def running(self):
+        """Returns the running jobs"""
+        return [job for job in self._jobs.values() if job.state == RUNNING]
+
+    def usedCores(self):
+        """Returns the number of cores used by the running jobs"""
+        return sum([job.nprocs for job in self.running()])
+
+    def clearFinished(self):
+        """Removes the finished and cancelled jobs from the queue"""
+        for ID in [ID for ID, job in self._jobs.items() if job.state not in (QUEUED, RUNNING)]:
+            del self._jobs[ID]
+        self.changed.emit()
+
+    def _schedule(self):
+        busy = set()  # directories of the running jobs
+        for job in self.running():
+            busy.update(job.workspace.sharedDirectories())
+        blocked = []  # waiting for a job of the same directory
+        while(self._waiting):
+            job = self._jobs.get(self._waiting[0][1])
+            if job is None or job.state != QUEUED:
+                heapq.heappop(self._waiting)
+                continue
+            directories = job.workspace.sharedDirectories()
+            if busy & directories:
+                blocked.append(heapq.heappop(self._waiting))
+                continue
+            used = self.usedCores()
+            if used > 0 and used + job.nprocs > self.budget:
+                break
+            heapq.heappop(self._waiting)
+            self._start(job)
+            if job.state == RUNNING:
+                # not if it has already finished, e.g. restored from the cache
+                busy.update(directories)
+        for item in blocked:
+            heapq.heappush(self._waiting, item)
+
+    def _start(self, job):
+        job.state = RUNNING
+        job.started = time.time()
+        try:
+            job.pipeline = runsolver.createRun(job.workspace, job.nprocs, job.commands, job.postFile,
+                                               job.cache, job.force)
+        except OSError as e:
+            # e.g. the scratch directory does not exist
+            job.message = str(e)
+            self._jobFinished(job, False)
+            return
+        job.pipeline.output.connect(job.monitor.feed)
+        job.sampler = runhistory.ProcessSampler(job.pipeline)
+        if job.watchdogSettings is not None:
+            job.watchdog = watchdog.Watchdog(job.pipeline, job.monitor, **job.watchdogSettings)
+            job.watchdog.triggered.connect(lambda reason, job=job: self._watchdogTriggered(job, reason))
+        job.pipeline.finished.connect(lambda success, job=job: self._jobFinished(job, success))
+        self.jobStarted.emit(job.ID)
+        job.pipeline.start()
+
+    def _watchdogTriggered(self, job, reason):
+        # an aborted job finishes as failed
+        job.message = reason
+        self.changed.emit()
+
+    def _jobFinished(self, job, success):
+        job.ended = time.time()
+        if job.pipeline is not None:
+            if runsolver.solverStarted(job.pipeline):
+                job.summary = loganalyzer.analyzeRun(job.workspace.sifFile, job.workspace.meshDirectory)
+            if self.history is not None and not job.pipeline.cached:
+                try:
+                    self.history.record(job.name, job.workspace.sifFile, job.workspace.meshDirectory,
+                                        job.nprocs, job.pipeline, job.sampler, job.summary)
+                except (OSError, sqlite3.Error) as e:
+                    job.message = "; ".join([text for text in [job.message, "not recorded in the run history: {}".format(e)]
+                                             if text])
+        if job.state != CANCELLED:
+            job.state = DONE if success else FAILED
+        self.jobFinished.emit(job.ID, job.state)
+        self._schedule()
+        self.changed.emit()
+
+
+class JobQueueView(QtGui.QWidget):
+    """Window showing the state of the job queue"""
+
+    COLUMNS = ["ID", "Case", "Processes", "Priority", "State", "Wall time", "Message"]
+
+    def __init__(self, queue):
+        """Constructor.
+
+        Args:
+        -----
+        queue: JobQueue-class
+            the queue shown
+        """
+        super(JobQueueView, self).__init__()
+        self.setWindowTitle("Job queue")
+
+        # public
+        self.queue = queue
+
+        # private
+        self._convergenceViews = {}  # ConvergenceView by job ID
+
+        self.table = QtGui.QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setSelectionBehavior(QtGui.QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QtGui.QAbstractItemView.NoEditTriggers)
+        self.budgetSpinBox = QtGui.QSpinBox()
+        self.budgetSpinBox.setRange(1, 4096)
+        self.budgetSpinBox.setValue(queue.budget)
+        self.coresLabel = QtGui.QLabel()
+        self.cancelButton = QtGui.QPushButton("&Cancel job")
+        self.clearButton = QtGui.QPushButton("C&lear finished")
+        self.convergenceButton = QtGui.QPushButton("C&onvergence")
+
+        self.budgetSpinBox.valueChanged.connect(queue.setBudget)
+        self.cancelButton.clicked.connect(self.cancelSelected)
+        self.clearButton.clicked.connect(queue.clearFinished)
+        self.convergenceButton.clicked.connect(self.showConvergence)
+        self.table.cellDoubleClicked.connect(lambda row, column: self.showConvergence())
+        queue.changed.connect(self.refresh)
+        # the wall time of running jobs is updated while the window is shown
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(1000)
+        self._timer.timeout.connect(self.refresh)
+
+        budgetLayout = QtGui.QHBoxLayout()
+        budgetLayout.addWidget(QtGui.QLabel("Core budget:"))
+        budgetLayout.addWidget(self.budgetSpinBox)
+        budgetLayout.addWidget(self.coresLabel)
+        buttonLayout = QtGui.QHBoxLayout()
+        buttonLayout.addWidget(self.cancelButton)
+        buttonLayout.addWidget(self.clearButton)
+        buttonLayout.addWidget(self.convergenceButton)
+        mainLayout = QtGui.QVBoxLayout()
+        mainLayout.addLayout(budgetLayout)
+        mainLayout.addWidget(self.table)
+        mainLayout.addLayout(buttonLayout)
+        self.setLayout(mainLayout)
+        self.refresh()
+
+    def refresh(self):
+        """Updates the table from the queue"""
+        jobs = self.queue.jobs()
+        self.table.setRowCount(len(jobs))
+        for row, job in enumerate(jobs):
+            values = [job.ID, job.name, job.nprocs, job.priority, job.state,
+                      "{:.0f} s".format(job.wallTime()), job.message]
+            for column, value in enumerate(values):
+                self.table.setItem(row, column, QtGui.QTableWidgetItem(str(value)))
+        self.coresLabel.setText("{} of {} cores in use".format(self.queue.usedCores(), self.queue.budget))
+
+    def cancelSelected(self):
+        """Cancels the jobs of the selected rows"""
+        rows = set([index.row() for index in self.table.selectedIndexes()])
+        for row in rows:
+            self.queue.cancel(int(self.table.item(row, 0).text()))
+
+    def showConvergence(self):
+        """Shows the convergence of the job of the current row"""
+        row = self.table.currentRow()
+        if row < 0:
+            return None
+        job = self.queue.job(int(self.table.item(row, 0).text()))
+        view = self._convergenceViews.get(job.ID)
+        if view is None:
+            view = convergence.ConvergenceView(job.monitor, "Convergence of " + job.name)
+            self._convergenceViews.update({job.ID: view})
+        view.show()
+        return view
+
+    def showEvent(self, event):
+        self.refresh()
+        self._timer.start()
+        super(JobQueueView, self).showEvent(event)
+
+    def hideEvent(self, event):
+        self._timer.stop()
+        super(JobQueueView, self).hideEvent(event)
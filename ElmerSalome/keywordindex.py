@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""
+Keyword index class
+
+Inverted index over the parameters of the compiled elmerDefs and the widgets
+of the solver parameter form. The parameter names, sif names, whatis and
+status-tip texts are split into words, a query matches words exactly, by
+prefix or, if nothing else matches, fuzzy by shared trigrams.
+"""
+try:
+    from PyQt4 import QtGui
+except ImportError:
+    from PyQt5 import QtWidgets as QtGui
+
+import bisect
+import re
+
+import solverparameters
+
+# section of the widgets of the solver parameter form
+SOLVER_FORM = "SolverParameters"
+
+_word = re.compile(r"[a-z0-9]+")
+_camel = re.compile(r"[A-Z]?[a-z0-9]+|[A-Z]+(?![a-z])")
+
+
+def words(text):
+    """Returns the lower case words of a text"""
+    return _word.findall(text.lower())
+
+
+def _trigrams(word):
+    padded = " " + word + " "
+    return set([padded[i:i + 3] for i in range(len(padded) - 2)])
+
+
+class entry_t():
+    """
+    Entry of the keyword index.
+
+    :section: section of the parameter (Material, Solver, ...) or
+              SOLVER_FORM for the widgets of the solver parameter form
+    :tab: name of the tab of the parameter
+    :key: path of the parameter ("/PDE/Section/Name") or objectName of the
+          widget of the solver parameter form
+    :label: label of the parameter
+    :sifName: keyword of the parameter in the sif-file
+    """
+    section = ""
+    tab = ""
+    key = ""
+    label = ""
+    sifName = ""
+
+    def __str__(self):
+        return "{} ({} / {}: {})".format(self.label or self.sifName, self.section,
+                                         self.tab, self.sifName)
+
+
+class KeywordIndex():
+    """Inverted index of the parameters. Words are mapped to the entries
+    containing them, the sorted list of words is used for prefix queries and
+    the trigrams of the words for fuzzy queries."""
+
+    def __init__(self):
+        """Constructor"""
+        # public
+        self.entries = []
+
+        # private
+        self._postings = {}  # set of entry numbers by word
+        self._words = []  # sorted words for prefix queries
+        self._trigrams = {}  # set of words by trigram
+        self._exact = {}  # entry numbers by lower case label and sif name
+
+    def add(self, section, tab, key, label, sifName, *texts):
+        """Adds an entry to the index.
+
+        Args:
+        -----
+        section: str
+            section of the parameter
+        tab: str
+            name of the tab of the parameter
+        key: str
+            path of the parameter or objectName of the widget
+        label: str
+            label of the parameter
+        sifName: str
+            keyword of the parameter in the sif-file
+        texts: str
+            further searchable texts, e.g. whatis and status-tip
+        """
+        e = entry_t()
+        e.section = section
+        e.tab = tab
+        e.key = key
+        e.label = label
+        e.sifName = sifName
+        number = len(self.entries)
+        self.entries.append(e)
+        for text in (label, sifName) + texts:
+            for word in words(text):
+                self._postings.setdefault(word, set()).add(number)
+        for text in (label, sifName):
+            if text:
+                self._exact.setdefault(text.lower().strip(), []).append(number)
+        self._words = None
+
+    def addLayout(self, sectionLayout):
+        """Adds all parameters of a section.
+
+        Args:
+        -----
+        sectionLayout: SectionLayout-class
+            layout description of the section
+        """
+        for name, params in sectionLayout.tabs:
+            for param in params:
+                if param.widget_type == "Label":
+                    continue
+                self.add(sectionLayout.section, name, param.path, param.labelName,
+                         param.sifName, param.whatis, param.statusTip)
+
+    def addSolverForm(self, path_forms):
+        """Adds the widgets of the solver parameter form.
+
+        Args:
+        -----
+        path_forms: str
+            String containing the path to the ui-files
+        """
+        sifNames = {}
+        for sifName, name in solverparameters.SIF_KEYWORDS.items():
+            sifNames.update({name: sifName})
+        for name, (tab, text) in solverparameters.formPages(path_forms).items():
+            self.add(SOLVER_FORM, tab, name, text, sifNames.get(name, ""),
+                     " ".join(_camel.findall(name)))
+
+    def _finish(self):
+        """Sorts the words and collects their trigrams after entries have
+        been added"""
+        self._words = sorted(self._postings.keys())
+        self._trigrams = {}
+        for word in self._words:
+            for trigram in _trigrams(word):
+                self._trigrams.setdefault(trigram, set()).add(word)
+
+    def _matches(self, word, fuzzy):
+        """Returns the score of the entries matching a word: 3 for exact, 2
+        for prefix and up to 1 for fuzzy matches"""
+        scores = {}
+        position = bisect.bisect_left(self._words, word)
+        while(position < len(self._words) and self._words[position].startswith(word)):
+            candidate = self._words[position]
+            position += 1
+            score = 3. if candidate == word else 2.
+            for number in self._postings[candidate]:
+                if scores.get(number, 0.) < score:
+                    scores.update({number: score})
+        if scores or not fuzzy:
+            return scores
+
+        # fuzzy: similarity of the trigrams of the words
+        trigrams = _trigrams(word)
+        common = {}
+        for trigram in trigrams:
+            for candidate in self._trigrams.get(trigram, ()):
+                common.update({candidate: common.get(candidate, 0) + 1})
+        for candidate, count in common.items():
+            similarity = float(count) / (len(trigrams) + len(candidate) - count)
+            if similarity < 0.4:
+                continue
+            for number in self._postings[candidate]:
+                if scores.get(number, 0.) < similarity:
+                    scores.update({number: similarity})
+        return scores
+
+    def search(self, query, limit=50, fuzzy=True):
+        """Returns the entries matching all words of a query, best first.
+
+        Args:
+        -----
+        query: str
+            words to search for, the last word may be incomplete
+        limit: int
+            maximum number of entries returned
+        fuzzy: bool
+            allow fuzzy matches for words without exact or prefix match
+
+        Return:
+        -------
+        list
+            list of entry_t
+        """
+        if self._words is None:
+            self._finish()
+        total = None
+        for word in words(query):
+            scores = self._matches(word, fuzzy)
+            if total is None:
+                total = scores
+            else:
+                total = dict([(number, score + scores[number])
+                              for number, score in total.items() if number in scores])
+            if not total:
+                return []
+        if total is None:
+            return []
+        # the complete label or sif name is the best match
+        for number in self._exact.get(query.lower().strip(), []):
+            if number in total:
+                total[number] += 10.
+        best = sorted(total.items(), key=lambda x: (-x[1], x[0]))[:limit]
+        return [self.entries[number] for number, score in best]
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class KeywordSearch(QtGui.QDialog):
+    """Dialog to search a keyword and to jump to its widget"""
+
+    def __init__(self, index, jump):
+        """Constructor.
+
+        Args:
+        -----
+        index: KeywordIndex-class
+            index to search in
+        jump: callable
+            called with the entry_t of the selected result
+        """
+        super(KeywordSearch, self).__init__()
+        self.setWindowTitle("Search keyword")
+
+        # public
+        self.index = index
+        self.results = []
+
+        # private
+        self._jump = jump
+
+        self.searchEdit = QtGui.QLineEdit()
+        self.resultList = QtGui.QListWidget()
+        self.searchEdit.textChanged.connect(self._search)
+        self.searchEdit.returnPressed.connect(self._jumpFirst)
+        self.resultList.itemActivated.connect(self._itemActivated)
+
+        layout = QtGui.QVBoxLayout()
+        layout.addWidget(self.searchEdit)
+        layout.addWidget(self.resultList)
+        self.setLayout(layout)
+
+    def _search(self, text):
+        self.results = self.index.search(str(text))
+        self.resultList.clear()
+        for e in self.results:
+            item = QtGui.QListWidgetItem(str(e))
+            self.resultList.addItem(item)
+
+    def _jumpFirst(self):
+        if self.results:
+            self._jump(self.results[0])
+
+    def _itemActivated(self, item):
+        self._jump(self.results[self.resultList.row(item)])
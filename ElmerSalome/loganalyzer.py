@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+"""
+Log analyzer
+
+Extracts a run summary from the log file of ElmerSolver (serial or MPI):
+total, mesh loading and solver-by-solver assembly, linear solve and total
+times, nonlinear, steady state and linear iteration counts and the size of
+the mesh and of its partitions. The solver times are printed by ElmerSolver
+if "Solver Timing" and "Linear System Timing" are set in the solver
+sections. The summary is stored next to the log file as json-file, so runs
+with different settings or numbers of processes can be compared.
+"""
+from collections import OrderedDict
+import json
+import os
+import re
+
+import convergence
+
+# lines of the solver output, times in (CPU, REAL)
+_total = re.compile(r"SOLVER TOTAL TIME\(CPU,REAL\):\s+(\S+)\s+(\S+)")
+_mesh = re.compile(r"LoadMesh:\s+Elapsed REAL time:\s+(\S+)")
+_tasks = re.compile(r"Running in parallel using\s+(\d+)\s+tasks")
+_timing = re.compile(r"(?P<what>Solver|Linear system|Assembly) time \(CPU,REAL\) for\s+(?P<solver>.*?):"
+                     r"\s+(?P<cpu>\S+)\s+(?P<real>\S+)", re.IGNORECASE)
+_count = re.compile(r"Number of (?:bulk )?(?P<what>nodes|elements|dofs)\b[^:\n]*:\s*(?P<count>\d+)",
+                    re.IGNORECASE)
+
+
+class solver_t():
+    """
+    Summary of a solver.
+
+    :name: equation name as printed by the solver
+    :time, assemblyTime, linearTime: (CPU, REAL) in seconds, None if not
+                                      printed
+    :nonlinearIterations: number of nonlinear iterations in total
+    :steadyStateIterations: number of steady state iterations in total
+    :linearIterations: number of iterations of the iterative linear solver
+                       in total
+    """
+    name = ""
+    time = None
+    assemblyTime = None
+    linearTime = None
+    nonlinearIterations = 0
+    steadyStateIterations = 0
+    linearIterations = 0
+
+
+class summary_t():
+    """
+    Summary of a run.
+
+    :logFile: analyzed log file
+    :tasks: number of MPI processes, 1 for serial runs
+    :cpuTime, realTime: total times of the solver in seconds, None if the
+                        run did not finish
+    :meshTime: time to load the mesh in seconds
+    :nodes, elements, boundaryElements: size of the mesh
+    :dofs: degrees of freedom, if printed by the solver
+    :partitions: list of (nodes, elements, boundary elements) per partition
+    :solvers: solver_t by name in order of appearance
+    """
+    logFile = ""
+    tasks = 1
+    cpuTime = None
+    realTime = None
+    meshTime = None
+    nodes = 0
+    elements = 0
+    boundaryElements = 0
+    dofs = 0
+    partitions = None
+    solvers = None
+
+
+def _header(path):
+    """Returns (nodes, elements, boundary elements) of a mesh header file"""
+    try:
+        with open(path) as f:
+            return tuple([int(x) for x in f.readline().split()[:3]])
+    except (OSError, ValueError):
+        return None
+
+
+def _solver(summary, name):
+    s = summary.solvers.get(name)
+    if s is None:
+        s = solver_t()
+        s.name = name
+        summary.solvers.update({name: s})
+    return s
+
+
+def analyze(logFile, meshDirectory=None):
+    """Analyzes the log file of a run.
+
+    Args:
+    -----
+    logFile: str
+        log file of ElmerSolver
+    meshDirectory: str, optional
+        mesh directory of the run, the size of the mesh and of the partitions
+        are read from the header files
+
+    Return:
+    -------
+    summary_t
+        summary of the run
+    """
+    summary = summary_t()
+    summary.logFile = logFile
+    summary.partitions = []
+    summary.solvers = OrderedDict()
+    monitor = convergence.ConvergenceMonitor(1)
+
+    with open(logFile, errors='replace') as f:
+        text = f.read()
+    # iterations of the solvers
+    monitor.feed(text + "\n")
+    for name, totals in monitor.totals.items():
+        s = _solver(summary, name)
+        s.nonlinearIterations, s.steadyStateIterations, s.linearIterations = totals
+
+    for match in _timing.finditer(text):
+        s = _solver(summary, match.group("solver").strip())
+        value = (float(match.group("cpu")), float(match.group("real")))
+        what = match.group("what").lower()
+        previous = {"solver": s.time, "linear system": s.linearTime, "assembly": s.assemblyTime}[what]
+        if previous is not None:
+            # printed for every call of the solver
+            value = (previous[0] + value[0], previous[1] + value[1])
+        if what == "solver":
+            s.time = value
+        elif what == "linear system":
+            s.linearTime = value
+        else:
+            s.assemblyTime = value
+    for match in _count.finditer(text):
+        what = match.group("what").lower()
+        count = int(match.group("count"))
+        if what == "nodes":
+            summary.nodes = max(summary.nodes, count)
+        elif what == "elements":
+            summary.elements = max(summary.elements, count)
+        else:
+            summary.dofs = max(summary.dofs, count)
+    match = _tasks.search(text)
+    if match is not None:
+        summary.tasks = int(match.group(1))
+    match = _mesh.search(text)
+    if match is not None:
+        summary.meshTime = float(match.group(1))
+    match = _total.search(text)
+    if match is not None:
+        summary.cpuTime, summary.realTime = float(match.group(1)), float(match.group(2))
+
+    if meshDirectory is not None:
+        header = _header(os.path.join(meshDirectory, "mesh.header"))
+        if header is not None:
+            summary.nodes, summary.elements, summary.boundaryElements = header
+        if summary.tasks > 1:
+            directory = os.path.join(meshDirectory, "partitioning." + str(summary.tasks))
+            for number in range(1, summary.tasks + 1):
+                header = _header(os.path.join(directory, "part.{}.header".format(number)))
+                if header is not None:
+                    summary.partitions.append(header)
+    return summary
+
+
+def analyzeRun(sifFile, meshDirectory=None):
+    """Analyzes the log file of the run of a sif-file and stores the summary
+    as json-file next to it.
+
+    Args:
+    -----
+    sifFile: str
+        sif-file of the run, the log file has the same name
+    meshDirectory: str, optional
+        mesh directory of the run
+
+    Return:
+    -------
+    summary_t or None
+        summary of the run, None if there is no log file
+    """
+    base = os.path.splitext(sifFile)[0]
+    if not os.path.exists(base + ".log"):
+        return None
+    summary = analyze(base + ".log", meshDirectory)
+    write(summary, base + ".summary.json")
+    return summary
+
+
+def toDict(summary):
+    """Returns the summary as dictionary of plain values"""
+    d = dict([(key, getattr(summary, key)) for key in
+              ["logFile", "tasks", "cpuTime", "realTime", "meshTime", "nodes", "elements",
+               "boundaryElements", "dofs", "partitions"]])
+    d.update({"solvers": [dict([(key, getattr(s, key)) for key in
+                                ["name", "time", "assemblyTime", "linearTime", "nonlinearIterations",
+                                 "steadyStateIterations", "linearIterations"]])
+                          for s in summary.solvers.values()]})
+    return d
+
+
+def fromDict(d):
+    """Returns the summary of a dictionary created by toDict"""
+    summary = summary_t()
+    for key, value in d.items():
+        if key != "solvers":
+            setattr(summary, key, value)
+    summary.partitions = [tuple(x) for x in d.get("partitions", [])]
+    summary.solvers = OrderedDict()
+    for values in d.get("solvers", []):
+        s = solver_t()
+        for key, value in values.items():
+            setattr(s, key, tuple(value) if isinstance(value, list) else value)
+        summary.solvers.update({s.name: s})
+    return summary
+
+
+def write(summary, path):
+    """Writes the summary to a json-file"""
+    with open(path, 'w') as f:
+        json.dump(toDict(summary), f, indent=1)
+
+
+def read(path):
+    """Reads a summary from a json-file"""
+    with open(path) as f:
+        return fromDict(json.load(f))
+
+
+def compare(a, b):
+    """Compares the times and iterations of two runs.
+
+    Args:
+    -----
+    a, b: summary_t
+        summaries of the runs
+
+    Return:
+    -------
+    list
+        (solver name or '' for the run, quantity, value of a, value of b)
+        of all quantities present in one of the runs
+    """
+    rows = [("", "tasks", a.tasks, b.tasks), ("", "real time", a.realTime, b.realTime),
+            ("", "cpu time", a.cpuTime, b.cpuTime)]
+    names = list(a.solvers.keys()) + [name for name in b.solvers if name not in a.solvers]
+    for name in names:
+        sa = a.solvers.get(name, solver_t())
+        sb = b.solvers.get(name, solver_t())
+        for label, key in [("real time", "time"), ("assembly real time", "assemblyTime"),
+                           ("linear solve real time", "linearTime")]:
+            va, vb = getattr(sa, key), getattr(sb, key)
+            if va is not None or vb is not None:
+                rows.append((name, label, va and va[1], vb and vb[1]))
+        for label, key in [("nonlinear iterations", "nonlinearIterations"),
+                           ("steady state iterations", "steadyStateIterations"),
+                           ("linear iterations", "linearIterations")]:
+            rows.append((name, label, getattr(sa, key), getattr(sb, key)))
+    return rows
+
+
+def report(summary):
+    """Returns the summary as text, e.g. for the console"""
+    def seconds(value):
+        return "-" if value is None else "{:.2f} s".format(value[1])
+
+    lines = ["{} process(es), {} nodes, {} elements".format(summary.tasks, summary.nodes, summary.elements)]
+    if summary.realTime is not None:
+        lines.append("total {:.2f} s real, {:.2f} s cpu".format(summary.realTime, summary.cpuTime))
+    for number, partition in enumerate(summary.partitions):
+        lines.append("partition {}: {} nodes, {} elements".format(number + 1, partition[0], partition[1]))
+    for s in summary.solvers.values():
+        lines.append("{}: {} (assembly {}, linear solve {}), {} nonlinear / {} steady state / {} linear "
+                     "iterations".format(s.name, seconds(s.time), seconds(s.assemblyTime), seconds(s.linearTime),
+                                         s.nonlinearIterations, s.steadyStateIterations, s.linearIterations))
+    return "\n".join(lines)
@@ -10,12 +10,12 @@ try:
     from PyQt4 import QtGui
     from PyQt4 import QtXml
     from PyQt4 import QtCore
-    from PyQt4 import uic
 except ImportError:
     from PyQt5 import QtWidgets as QtGui
     from PyQt5 import QtXml
     from PyQt5 import QtCore
-    from PyQt5 import uic
+
+import uiforms
 
 
 class MaterialLibrary(QtGui.QDialog):
@@ -40,7 +40,7 @@ class MaterialLibrary(QtGui.QDialog):
         # privat
         self._materialDoc = QtXml.QDomDocument()
 
-        uic.loadUi(path_forms.joinpath("materiallibrary.ui"), self)
+        uiforms.loadUi(path_forms.joinpath("materiallibrary.ui"), self)
 
         # connect buttons
         self.okButton.clicked.connect(self._okButtonClicked)
@@ -67,13 +67,15 @@ class MaterialLibrary(QtGui.QDialog):
 
         # get active material editor
         editor = self.editor
+        store = editor.store
+        ID = editor.ID
 
         # clear all lineEdits
-        for key, value in editor.qhash.items():
-            elem = value.elem
-            widget = value.widget
-            if(elem.attribute("Widget") == "Edit"):
-                widget.setText("")
+        names = {}
+        for pid, param in enumerate(store.params):
+            if(param.widget_type == "Edit"):
+                store.setValue(ID, pid, "")
+            names.setdefault(param.labelName.lower(), []).append(pid)
 
         # update lineEdts with library properties
         contents = self._materialDoc.documentElement()
@@ -85,35 +87,27 @@ class MaterialLibrary(QtGui.QDialog):
                 material = material.nextSiblingElement()
                 continue
 
-            editor.nameEdit.setText(materialName)
+            store.setName(ID, materialName)
             prop = material.firstChildElement()
             while(prop.isNull() is False):
                 propertyName = str(prop.attribute("name")).strip().lower()
                 propertyValue = str(prop.text()).strip()
 
-                match = False
-
-                for key, value in editor.qhash.items():
-                    elem = value.elem
-                    widget = value.widget
-                    widgetName = str(elem.firstChildElement("Name").text()).strip().lower()
+                for pid in names.get(propertyName, []):
+                    param = store.params[pid]
 
-                    if(elem.attribute("Widget") == "Edit"):
-                        if(propertyName == widgetName):
-                            match = True
-                            widget.setText(propertyValue)
+                    if(param.widget_type == "Edit"):
+                        store.setValue(ID, pid, propertyValue)
 
-                    if(elem.attribute("Widget") == "Combo"):
-                        if(propertyName == widgetName):
-                            for i in range(widget.count()):
-                                itemText = str(widget.itemText(i)).strip()
-                                if(itemText.lower() == propertyValue.lower()):
-                                    widget.setCurrentIndex(i)
-                            match = True
+                    if(param.widget_type == "Combo"):
+                        for itemText in param.items:
+                            if(itemText.lower() == propertyValue.lower()):
+                                store.setValue(ID, pid, itemText)
 
                 prop = prop.nextSiblingElement()
             material = material.nextSiblingElement()
 
+        editor.refresh()
         self.close()
         self.editor.raise_()
 
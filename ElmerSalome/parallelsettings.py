@@ -9,12 +9,14 @@ Parallel settings class
 
 try:
     from PyQt4 import QtGui
-    from PyQt4 import uic
 except ImportError:
     from PyQt5 import QtWidgets as QtGui
-    from PyQt5 import uic
+import os
 import shutil
 import multiprocessing
+import tempfile
+
+import uiforms
 
 
 class ParallelSettings(QtGui.QDialog):
@@ -30,12 +32,15 @@ class ParallelSettings(QtGui.QDialog):
             window.
         """
         super(ParallelSettings, self).__init__()
-        uic.loadUi(path_forms.joinpath("parallel.ui") , self)
+        uiforms.loadUi(path_forms.joinpath("parallel.ui") , self)
         self.setDefaults()
         self.parallelActiveCheckBox.setChecked(False)
         self.parallelOnOff()
         self.parallelActiveCheckBox.clicked.connect(self.parallelOnOff)
         self.browseButton.clicked.connect(self.getParallelExec)
+        self.scratchBrowseButton.clicked.connect(self.getScratchDirectory)
+        self.scratchCheckBox.clicked.connect(self.scratchOnOff)
+        self.watchdogCheckBox.clicked.connect(self.watchdogOnOff)
         self.defaultsButton.clicked.connect(self.setDefaults)
         self.okButton.clicked.connect(self.applyChanges)
         if multiprocessing.cpu_count() > 1:
@@ -51,6 +56,16 @@ class ParallelSettings(QtGui.QDialog):
         self.label_2.setText("%msh is the mesh directory")
         self.label_3.setText("%ep is the post file name (General settings)")
         self.skipPartitioningCheckBox.setChecked(False)
+        self.scratchLineEdit.setText(tempfile.gettempdir())
+        self.scratchCheckBox.setChecked(False)
+        self.copyBackCheckBox.setChecked(True)
+        self.resultCacheCheckBox.setChecked(True)
+        self.scratchOnOff()
+        self.watchdogCheckBox.setChecked(False)
+        self.watchdogIterationsSpinBox.setValue(50)
+        self.watchdogTimeoutSpinBox.setValue(600)
+        self.watchdogActionComboBox.setCurrentIndex(0)
+        self.watchdogOnOff()
 
     def parallelOnOff(self):
         if (self.parallelActiveCheckBox.isChecked()) and (multiprocessing.cpu_count() < 2):
@@ -65,6 +80,65 @@ class ParallelSettings(QtGui.QDialog):
         self.mergeLineEdit.setEnabled(self.parallelActiveCheckBox.isChecked())
         self.skipPartitioningCheckBox.setEnabled(self.parallelActiveCheckBox.isChecked())
 
+    def commands(self):
+        """Returns the command templates, see runsolver.createPipeline
+
+        Return:
+        -------
+        dict
+            'exec', 'args', 'divide' and 'merge' templates and
+            'skipPartitioning'
+        """
+        return {"exec": str(self.parallelExecLineEdit.text()),
+                "args": str(self.parallelArgsLineEdit.text()),
+                "divide": str(self.divideLineEdit.text()),
+                "merge": str(self.mergeLineEdit.text()),
+                "skipPartitioning": self.skipPartitioningCheckBox.isChecked()}
+
+    def scratchOnOff(self):
+        self.scratchLineEdit.setEnabled(self.scratchCheckBox.isChecked())
+        self.scratchBrowseButton.setEnabled(self.scratchCheckBox.isChecked())
+        self.copyBackCheckBox.setEnabled(self.scratchCheckBox.isChecked())
+
+    def scratchDirectory(self):
+        """Returns the directory receiving the copy of the case, None if the
+        run works in the case directory"""
+        if self.scratchCheckBox.isChecked() and str(self.scratchLineEdit.text()).strip():
+            return str(self.scratchLineEdit.text()).strip()
+        return None
+
+    def resultCache(self, cache):
+        """Returns the result cache if it is used, None otherwise"""
+        if self.resultCacheCheckBox.isChecked():
+            return cache
+        return None
+
+    def watchdogOnOff(self):
+        for widget in [self.watchdogIterationsLabel, self.watchdogIterationsSpinBox, self.watchdogTimeoutLabel,
+                       self.watchdogTimeoutSpinBox, self.watchdogActionLabel, self.watchdogActionComboBox]:
+            widget.setEnabled(self.watchdogCheckBox.isChecked())
+
+    def watchdog(self):
+        """Returns the settings of the watchdog, see watchdog.Watchdog
+
+        Return:
+        -------
+        dict or None
+            'iterations', 'timeout' and 'abort', None if runs are not
+            watched
+        """
+        if not self.watchdogCheckBox.isChecked():
+            return None
+        return {"iterations": self.watchdogIterationsSpinBox.value(),
+                "timeout": self.watchdogTimeoutSpinBox.value(),
+                "abort": self.watchdogActionComboBox.currentIndex() == 0}
+
+    def getScratchDirectory(self):
+        directory = QtGui.QFileDialog.getExistingDirectory(None, "Select scratch directory")
+        directory = str(directory)
+        if directory != '':
+            self.scratchLineEdit.setText(directory)
+
     def getParallelExec(self):
         filename = QtGui.QFileDialog.getOpenFileName(parent=None, caption="Select MPI executable")
         filename = str(filename)
@@ -78,6 +152,8 @@ class ParallelSettings(QtGui.QDialog):
             QtGui.QMessageBox.warning(None, 'Error', "MPI executable not found.")
             self.parallelActiveCheckBox.setChecked(False)
             self.parallelOnOff()
+        elif self.scratchDirectory() is not None and not os.path.isdir(self.scratchDirectory()):
+            QtGui.QMessageBox.warning(None, 'Error', "Scratch directory not found.")
         else:
             # Hide window, but keep contents in memory
             self.hide()
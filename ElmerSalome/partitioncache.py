@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+Partition cache class
+
+Keeps the partitionings of a mesh created by ElmerGrid. A partitioning is
+identified by the content of the mesh files, the number of partitions and
+the partitioning command (method). ElmerSolver reads the partitioning of n
+processes from the directory partitioning.n of the mesh directory, other
+partitionings with n partitions are kept in a stash directory and are moved
+back when they are needed again.
+"""
+import glob
+import hashlib
+import json
+import os
+import shutil
+
+# directory of the mesh directory keeping the inactive partitionings
+STASH = "partitionings"
+
+# file in a partitioning directory identifying the partitioning
+STAMP = "cache.json"
+
+# number of inactive partitionings kept
+DEFAULT_ENTRIES = 4
+
+# (state, fingerprint) by mesh directory of the fingerprints computed before
+_known = {}
+
+
+def _meshFiles(meshDirectory):
+    return sorted(glob.glob(os.path.join(meshDirectory, "mesh.*")))
+
+
+def _state(meshDirectory):
+    """Returns size and modification time of the mesh files by name"""
+    state = {}
+    for path in _meshFiles(meshDirectory):
+        status = os.stat(path)
+        state.update({os.path.basename(path): [status.st_size, status.st_mtime]})
+    return state
+
+
+def fingerprint(meshDirectory):
+    """Returns the hash of the content of the mesh files (mesh.header,
+    mesh.nodes, ...) of a mesh directory"""
+    h = hashlib.sha1()
+    for path in _meshFiles(meshDirectory):
+        h.update(os.path.basename(path).encode())
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+    return h.hexdigest()
+
+
+class PartitionCache():
+    """Partitionings of a mesh directory by key"""
+
+    def __init__(self, meshDirectory, entries=DEFAULT_ENTRIES):
+        """Constructor
+
+        Args:
+        -----
+        meshDirectory: str
+            mesh directory
+        entries: int
+            number of inactive partitionings kept
+        """
+        # public
+        self.meshDirectory = meshDirectory
+        self.entries = entries
+
+        # private
+        self._fingerprint = None
+
+    def key(self, nprocs, method):
+        """Returns the key of a partitioning.
+
+        Args:
+        -----
+        nprocs: int
+            number of partitions
+        method: str
+            partitioning command template, e.g. 'ElmerGrid 2 2 %msh -metis %n'
+        """
+        text = "{}\n{}\n{}".format(self.fingerprint(), nprocs, method)
+        return hashlib.sha1(text.encode()).hexdigest()
+
+    def fingerprint(self):
+        """Returns the fingerprint of the mesh files. The fingerprint stored
+        with the active partitionings or computed before in this process is
+        reused if size and modification time of the mesh files have not
+        changed."""
+        if self._fingerprint is not None:
+            return self._fingerprint
+        state = _state(self.meshDirectory)
+        for directory in glob.glob(os.path.join(self.meshDirectory, "partitioning.*")):
+            stamp = self._readStamp(directory)
+            if stamp is not None and stamp.get("mesh") == state:
+                self._fingerprint = stamp["fingerprint"]
+                return self._fingerprint
+        meshDirectory = os.path.abspath(self.meshDirectory)
+        known = _known.get(meshDirectory)
+        if known is not None and known[0] == state:
+            self._fingerprint = known[1]
+        else:
+            self._fingerprint = fingerprint(self.meshDirectory)
+            _known.update({meshDirectory: (state, self._fingerprint)})
+        return self._fingerprint
+
+    def activate(self, nprocs, method):
+        """Makes the partitioning the active one if it is in the cache. A
+        stale partitioning of n partitions is moved to the stash or removed.
+
+        Args:
+        -----
+        nprocs: int
+            number of partitions
+        method: str
+            partitioning command template
+
+        Return:
+        -------
+        bool
+            True if the partitioning exists, False if the mesh has to be
+            partitioned
+        """
+        key = self.key(nprocs, method)
+        active = self._active(nprocs)
+        stamp = self._readStamp(active)
+        if stamp is not None and stamp.get("key") == key and self._complete(active, nprocs):
+            return True
+        # the active partitioning is stale
+        if stamp is not None:
+            self._stash(active, stamp["key"])
+        elif os.path.isdir(active):
+            shutil.rmtree(active)
+        stashed = os.path.join(self.meshDirectory, STASH, key)
+        if os.path.isdir(stashed) and self._complete(stashed, nprocs):
+            shutil.move(stashed, active)
+            return True
+        return False
+
+    def store(self, nprocs, method):
+        """Marks the active partitioning as created for the current mesh, has
+        to be called after the mesh has been partitioned.
+
+        Args:
+        -----
+        nprocs: int
+            number of partitions
+        method: str
+            partitioning command template
+        """
+        active = self._active(nprocs)
+        if not os.path.isdir(active):
+            return
+        stamp = {"key": self.key(nprocs, method), "fingerprint": self.fingerprint(),
+                 "mesh": _state(self.meshDirectory), "partitions": nprocs, "method": method}
+        with open(os.path.join(active, STAMP), 'w') as f:
+            json.dump(stamp, f)
+
+    def keys(self):
+        """Returns the keys of all partitionings, active and stashed"""
+        keys = []
+        for directory in glob.glob(os.path.join(self.meshDirectory, "partitioning.*")):
+            stamp = self._readStamp(directory)
+            if stamp is not None:
+                keys.append(stamp["key"])
+        stash = os.path.join(self.meshDirectory, STASH)
+        if os.path.isdir(stash):
+            keys.extend(os.listdir(stash))
+        return keys
+
+    def _active(self, nprocs):
+        return os.path.join(self.meshDirectory, "partitioning." + str(nprocs))
+
+    def _complete(self, directory, nprocs):
+        """Checks if the header files of all partitions exist"""
+        for number in range(1, nprocs + 1):
+            if not os.path.exists(os.path.join(directory, "part.{}.header".format(number))):
+                return False
+        return True
+
+    def _readStamp(self, directory):
+        try:
+            with open(os.path.join(directory, STAMP)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _stash(self, directory, key):
+        """Moves a partitioning to the stash, the oldest stashed
+        partitionings are removed if there are more than entries"""
+        stash = os.path.join(self.meshDirectory, STASH)
+        if not os.path.isdir(stash):
+            os.makedirs(stash)
+        target = os.path.join(stash, key)
+        if os.path.isdir(target):
+            shutil.rmtree(target)
+        shutil.move(directory, target)
+        # the stash is ordered by the time of stashing
+        os.utime(target, None)
+        stashed = sorted([os.path.join(stash, name) for name in os.listdir(stash)], key=os.path.getmtime)
+        for path in stashed[:-self.entries] if self.entries > 0 else stashed:
+            shutil.rmtree(path, ignore_errors=True)
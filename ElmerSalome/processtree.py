@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Process tree functions
+
+Reads the processes of the machine from /proc, so a solver run can be
+measured and stopped as a whole: the shell running the command, mpiexec or
+its proxies and all MPI ranks. Only available on Linux, the functions find
+no processes elsewhere.
+"""
+import os
+
+# values of a process, see processes
+PARENT, GROUP, CPU, RSS, START = range(5)
+
+if hasattr(os, "sysconf") and os.path.isdir("/proc"):
+    CLOCK_TICKS = os.sysconf("SC_CLK_TCK")  # CPU time units per second
+    PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")  # bytes per resident page
+else:
+    CLOCK_TICKS = None
+    PAGE_SIZE = None
+
+
+def available():
+    """Checks if the processes can be read from /proc"""
+    return CLOCK_TICKS is not None
+
+
+def processes():
+    """Returns the processes of the machine.
+
+    Return:
+    -------
+    dict
+        (parent pid, process group, CPU time in ticks, resident pages, start
+        time in ticks) by pid. The CPU time includes the one of the children
+        the process has already waited for.
+    """
+    result = {}
+    if not available():
+        return result
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open("/proc/" + name + "/stat", 'rb') as f:
+                text = f.read()
+        except OSError:
+            # finished in between
+            continue
+        # the command name may contain spaces, the fields start after it
+        fields = text[text.rfind(b")") + 2:].split()
+        result.update({int(name): (int(fields[1]), int(fields[2]), sum([int(x) for x in fields[11:15]]),
+                                   int(fields[21]), int(fields[19]))})
+    return result
+
+
+def tree(root, processes):
+    """Returns the pids of a process and of all its descendants.
+
+    Args:
+    -----
+    root: int
+        pid of the process
+    processes: dict
+        processes as returned by processes()
+
+    Return:
+    -------
+    list
+        pids, the root first, empty if the root does not exist
+    """
+    children = {}
+    for pid, values in processes.items():
+        children.setdefault(values[PARENT], []).append(pid)
+    result = []
+    pending = [root] if root in processes else []
+    while(pending):
+        pid = pending.pop()
+        result.append(pid)
+        pending.extend(children.get(pid, []))
+    return result
+
+
+def signalTree(root, sig, known=None):
+    """Sends a signal to a process, all its descendants and their process
+    groups. The process group of the Salome process is never signalled.
+
+    Args:
+    -----
+    root: int
+        pid of the process
+    sig: int
+        signal, e.g. signal.SIGTERM
+    known: dict, optional
+        start time by pid of processes signalled before, they are signalled
+        again if they still exist, e.g. MPI ranks orphaned by the death of
+        mpiexec
+
+    Return:
+    -------
+    dict
+        start time by pid of the processes signalled
+    """
+    current = processes()
+    targets = dict([(pid, current[pid][START]) for pid in tree(root, current)])
+    for pid, start in (known or {}).items():
+        # the pid may have been reused by another process
+        if pid in current and current[pid][START] == start:
+            targets.update({pid: start})
+    own = os.getpgrp()
+    for group in set([current[pid][GROUP] for pid in targets]):
+        if group != own:
+            try:
+                os.killpg(group, sig)
+            except OSError:
+                pass
+    for pid in targets:
+        try:
+            os.kill(pid, sig)
+        except OSError:
+            pass
+    return targets
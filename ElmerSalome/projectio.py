@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+Project IO class
+
+Saves and restores the complete state of the Elmer module (general settings,
+editors, solver settings, element properties and parallel settings) in a
+xml-project file.
+"""
+try:
+    from PyQt4 import QtGui
+except ImportError:
+    from PyQt5 import QtWidgets as QtGui
+
+from xml.etree import ElementTree as et
+from xml.sax.saxutils import escape
+from xml.sax.saxutils import quoteattr
+
+import dynamiceditor
+import uiforms
+
+# sections of the editors with name of the method creating the first editor,
+# the slot creating further editors and the list containing the editors
+SECTIONS = [("Equation", "showAddEquation", "pdeEditorFinishedSlot", "equationEditor"),
+            ("Material", "showAddMaterial", "matEditorFinishedSlot", "materialEditor"),
+            ("BodyForce", "showAddBodyForce", "bodyForceEditorFinishedSlot", "bodyForceEditor"),
+            ("InitialCondition", "showAddInitialCondition", "initialConditionEditorFinishedSlot", "initialConditionEditor"),
+            ("BoundaryCondition", "showAddBoundaryCondition", "boundaryConditionEditorFinishedSlot", "boundaryConditionEditor")]
+
+VERSION = "1"
+
+
+def setWidgetValues(dialog, elem):
+    """Restores the values of the named input widgets of a dialog.
+
+    Args:
+    -----
+    dialog: QWidget
+        dialog containing the widgets
+    elem: Element or None
+        xml-element containing the widget-elements, the dialog keeps its
+        values if the project file has no such element
+    """
+    if elem is None:
+        return
+    widgets = {}
+    for widget in dialog.findChildren(QtGui.QWidget):
+        name = str(widget.objectName())
+        if name != "":
+            widgets.update({name: widget})
+    # unchecked radio buttons first, otherwise they uncheck the checked ones
+    items = sorted(elem.findall("widget"), key=lambda x: x.text == "True")
+    for item in items:
+        widget = widgets.get(item.get("name"))
+        if widget is None:
+            print("Load project: unknown widget {}".format(item.get("name")))
+            continue
+        try:
+            value = uiforms.fromString(item.get("type"), item.text or "", widget)
+        except ValueError:
+            print("Load project: invalid value of widget {}".format(item.get("name")))
+            continue
+        uiforms.setWidgetValue(widget, value)
+
+
+class ProjectIO():
+    """ProjectIO"""
+
+    def __init__(self, ewh):
+        """Constructor
+
+        Args:
+        -----
+        ewh: ElmerWindowHandler class
+            current instance of the ElmerWindowHandler class containing all data
+        """
+        # public
+        self.errormsg = ''
+
+        # private
+        self._ewh = ewh
+        self._fObject = None
+
+    def _write(self, str_val):
+        self._fObject.write(str_val)
+
+    def _writeWidgets(self, values, indent):
+        for name, qtype, value in values:
+            self._write('{}<widget name={} type="{}">{}</widget>\n'.format(
+                indent, quoteattr(name), qtype, escape(str(value))))
+
+    def _writeStore(self, store):
+        self._write('  <section name="{}">\n'.format(store.section))
+        for ID in store.entities():
+            self._write('    <entity id="{}" name={}>\n'.format(ID, quoteattr(store.name(ID))))
+            for pid, value in store.changed(ID):
+                self._write('      <value key={}>{}</value>\n'.format(
+                    quoteattr(store.params[pid].path), escape(str(value))))
+            self._write('    </entity>\n')
+        self._write('  </section>\n')
+
+    def _reference(self, registry, ID):
+        # reference to an entity in the elements, empty for none
+        if ID is None or ID not in registry:
+            return ""
+        return str(ID)
+
+    def write(self, path):
+        """Writes the current state into a project file in a single pass.
+
+        Args:
+        -----
+        path: str
+            path to the project file
+        """
+        ewh = self._ewh
+        with open(path, 'w') as self._fObject:
+            self._write('<?xml version="1.0" encoding="utf-8"?>\n')
+            self._write('<elmerproject version="{}">\n'.format(VERSION))
+
+            self._write('  <general>\n')
+            self._writeWidgets(uiforms.widgetValues(ewh.gsWindow), '    ')
+            self._write('  </general>\n')
+
+            self._write('  <parallel>\n')
+            self._writeWidgets(uiforms.widgetValues(ewh.psWindow), '    ')
+            self._write('  </parallel>\n')
+
+            for section in [x[0] for x in SECTIONS] + ["Solver"]:
+                self._writeStore(ewh.getStore(section))
+
+            self._write('  <solvers>\n')
+            for idx, element in enumerate(ewh.solverSettings):
+                if element is None:
+                    continue
+                self._write('    <solver index="{}" name={}>\n'.format(idx, quoteattr(element.solverName)))
+                self._writeWidgets(element.changed(), '      ')
+                self._write('    </solver>\n')
+            self._write('  </solvers>\n')
+
+            self._write('  <elements>\n')
+            registries = [ewh.equationEditor, ewh.materialEditor,
+                          ewh.bodyForceEditor, ewh.initialConditionEditor]
+            # the entities are referred to by the id of their entity-element,
+            # names need not be unique
+            for name, properties in ewh.elementProperties.bodies():
+                ids = [self._reference(registry, ID) for registry, ID in zip(registries, properties)]
+                self._write('    <body name={} equation="{}" material="{}" force="{}" initial="{}"/>\n'.format(
+                    quoteattr(name), *ids))
+            for name, (condition, asBody) in ewh.elementProperties.boundaries():
+                self._write('    <boundary name={} condition="{}" body="{}"/>\n'.format(
+                    quoteattr(name), self._reference(ewh.boundaryConditionEditor, condition), int(asBody)))
+            self._write('  </elements>\n')
+
+            self._write('</elmerproject>\n')
+        self._fObject = None
+
+    def read(self, path):
+        """Restores the state from a project file. Should be called with a
+        new instance of the ElmerWindowHandler.
+
+        Args:
+        -----
+        path: str
+            path to the project file
+        """
+        try:
+            root = et.parse(path).getroot()
+        except:
+            self.errormsg = "Error reading project file " + path
+            raise
+        if root.tag != "elmerproject":
+            self.errormsg = "This is not an Elmer project file"
+            raise ValueError(self.errormsg)
+
+        ewh = self._ewh
+        setWidgetValues(ewh.gsWindow, root.find("general"))
+        setWidgetValues(ewh.psWindow, root.find("parallel"))
+        ewh.psWindow.parallelOnOff()
+        ewh.psWindow.scratchOnOff()
+        ewh.psWindow.watchdogOnOff()
+
+        sections = {}
+        for elem in root.findall("section"):
+            sections.update({elem.get("name"): elem})
+
+        # editors, the first editor of a section is created by the show-method
+        # the ids of the project file are mapped to the IDs of the entities
+        entityIds = {}
+        for section, show, slot, editors in SECTIONS:
+            elem = sections.get(section)
+            if elem is None:
+                continue
+            registry = getattr(ewh, editors)
+            ids = {}
+            entityIds.update({section: ids})
+            for count, entity in enumerate(elem.findall("entity")):
+                if count < len(registry):
+                    # entities existing before the project was loaded
+                    ID = registry[count]
+                else:
+                    ID = registry.nextID()
+                    if len(registry) == 0:
+                        getattr(ewh, show)(visible=False)
+                    else:
+                        getattr(ewh, slot)(dynamiceditor.MatTypes.MAT_NEW, ID)
+                self._readEntity(registry.store, ID, entity)
+                registry.refresh(ID)
+                ids.update({entity.get("id"): ID})
+
+        # solvers are created together with the first equation
+        ewh.showAddEquation(visible=False)
+        store = ewh.getStore("Solver")
+        elem = sections.get("Solver")
+        if elem is not None:
+            for entity in elem.findall("entity"):
+                ID = int(entity.get("id"))
+                if store.hasEntity(ID):
+                    self._readEntity(store, ID, entity)
+        solvers = root.find("solvers")
+        if solvers is not None:
+            for elem in solvers.findall("solver"):
+                idx = int(elem.get("index"))
+                if idx >= len(ewh.solverSettings) or ewh.solverSettings[idx] is None:
+                    continue
+                element = ewh.solverSettings[idx]
+                # unchecked radio buttons first, otherwise they uncheck the checked ones
+                for item in sorted(elem.findall("widget"), key=lambda x: x.text == "True"):
+                    value = uiforms.fromString(item.get("type"), item.text or "")
+                    element.setValue(item.get("name"), value)
+                if element.editor is not None:
+                    element.editor.generalOptions.refresh()
+
+        elements = root.find("elements")
+        if elements is not None:
+            registries = [ewh.equationEditor, ewh.materialEditor,
+                          ewh.bodyForceEditor, ewh.initialConditionEditor]
+            for elem in elements.findall("body"):
+                ids = [entityIds.get(registry.section, {}).get(elem.get(key))
+                       for registry, key in zip(registries, ["equation", "material", "force", "initial"])]
+                ewh.elementProperties.setBody(elem.get("name"), *ids)
+            for elem in elements.findall("boundary"):
+                ewh.elementProperties.setBoundary(
+                    elem.get("name"),
+                    entityIds.get(ewh.boundaryConditionEditor.section, {}).get(elem.get("condition")),
+                    int(elem.get("body")))
+
+    def _readEntity(self, store, ID, entity):
+        """Restores name and values of an entity in the store.
+
+        Args:
+        -----
+        store: SectionStore-class
+            store of the section
+        ID: int
+            ID of the entity in the store
+        entity: Element
+            xml-element of the entity
+        """
+        store.reset(ID)
+        store.setName(ID, entity.get("name"))
+        for elem in entity.findall("value"):
+            key = elem.get("key")
+            pid = store.index.get(key)
+            if pid is None:
+                print("Load project: unable to set menu entry: key: " + key)
+                continue
+            value = elem.text or ""
+            if store.params[pid].widget_type == "CheckBox":
+                value = value == "True"
+            store.setValue(ID, pid, value)
@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+"""
+Result cache class
+
+Keeps the result files and the log of solver runs by the content of their
+input: the normalized sif-file, the files it refers to (include, restart and
+data files, user procedures), the mesh files, the Elmer installation and the
+parallel configuration. A run with the same input restores the files of the
+cache instead of starting ElmerSolver. The entries used least recently are
+removed when the cache exceeds its size.
+"""
+from collections import OrderedDict
+import fnmatch
+import hashlib
+import json
+import os
+import re
+import shutil
+
+import partitioncache
+
+# default size of the cache in bytes
+DEFAULT_SIZE = 2 * 1024 ** 3
+
+# default directory of the cache
+DEFAULT_DIRECTORY = os.path.join(os.path.expanduser("~"), ".cache", "ElmerSalome", "results")
+
+# files of a run that are not results
+IGNORE = ["ELMERSOLVER_STARTINFO", "partitioning.*", partitioncache.STASH, "*.sif"]
+
+# file of an entry listing its files
+ENTRY = "entry.json"
+
+# keywords of files written by a run, they are not part of its input
+OUTPUT_KEYWORDS = ["output file", "post file", "filename", "output directory", "results directory",
+                   "solver input file"]
+
+# a procedure "lib" "function" is loaded from lib, lib.so, ... and compiled
+# from the source lib.f90
+PROCEDURE_EXTENSIONS = [".so", ".dll", ".dylib", ".f90", ".F90"]
+
+_comment = re.compile(r'[!#][^"\n]*$', re.MULTILINE)
+_space = re.compile(r"[ \t]+")
+_quoted = re.compile(r'"([^"]*)"')
+
+
+def normalizeSif(text):
+    """Returns the text of a sif-file without comments, empty lines and
+    indentation, so only changes of the content change the key"""
+    text = _comment.sub("", text)
+    lines = [_space.sub(" ", line).strip() for line in text.splitlines()]
+    return "\n".join([line for line in lines if line])
+
+
+def references(sifFile):
+    """Returns the files a sif-file refers to by a quoted name, relative to
+    its directory or absolute, and the files included by an include-line,
+    the included files are searched as well. Files written by the run, see
+    OUTPUT_KEYWORDS, and names not naming an existing file are skipped.
+
+    Args:
+    -----
+    sifFile: str
+        sif-file of the run
+
+    Return:
+    -------
+    list
+        absolute paths of the files, sorted
+    """
+    directory = os.path.dirname(os.path.abspath(sifFile))
+    seen = set([os.path.abspath(sifFile)])
+    found = []
+    pending = [os.path.abspath(sifFile)]
+    while(pending):
+        try:
+            with open(pending.pop(), errors='replace') as f:
+                text = normalizeSif(f.read())
+        except OSError:
+            continue
+        for line in text.split("\n"):
+            keyword = line.split("=")[0].strip().lower()
+            if keyword in OUTPUT_KEYWORDS:
+                continue
+            include = keyword.split(" ")[0] == "include"
+            names = _quoted.findall(line)
+            if include and not names:
+                names = line.split(" ")[1:2]
+            for name in names:
+                for candidate in [name] + [name + extension for extension in PROCEDURE_EXTENSIONS]:
+                    path = os.path.normpath(os.path.join(directory, candidate))
+                    if path in seen or not os.path.isfile(path):
+                        continue
+                    seen.add(path)
+                    found.append(path)
+                    if include:
+                        pending.append(path)
+    return sorted(found)
+
+
+def installation():
+    """Returns an identification of the Elmer installation, path, size and
+    modification time of the ElmerSolver executable"""
+    path = shutil.which("ElmerSolver")
+    if path is None:
+        return ""
+    status = os.stat(path)
+    return "{} {} {}".format(os.path.realpath(path), status.st_size, status.st_mtime)
+
+
+def snapshot(directory):
+    """Returns (size, mtime) of all files of a directory by path relative to
+    it, the result files of a run are the new and changed files"""
+    state = {}
+    for root, directories, names in os.walk(directory):
+        for name in names:
+            path = os.path.join(root, name)
+            status = os.stat(path)
+            state.update({os.path.relpath(path, directory): (status.st_size, status.st_mtime)})
+    return state
+
+
+def _ignored(path):
+    for part in path.split(os.sep):
+        for pattern in IGNORE:
+            if fnmatch.fnmatch(part, pattern):
+                return True
+    return False
+
+
+class ResultCache():
+    """Directory with one entry per key. Each entry holds the result files
+    and the file ENTRY listing them with their size, the time of its last
+    use is the modification time of ENTRY."""
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, size=DEFAULT_SIZE):
+        """Constructor
+
+        Args:
+        -----
+        directory: str
+            directory of the cache, created when the first entry is stored
+        size: int
+            maximum size of all entries in bytes
+        """
+        # public
+        self.directory = directory
+        self.size = size
+
+        # private
+        self._hashes = {}  # ((size, mtime), hash) of the referenced files by path
+
+    def key(self, sifFile, meshDirectory, nprocs=1, commands=None):
+        """Returns the key of a run.
+
+        Args:
+        -----
+        sifFile: str
+            sif-file of the run
+        meshDirectory: str
+            mesh directory of the run
+        nprocs: int
+            number of processes
+        commands: dict, optional
+            command templates as returned by ParallelSettings.commands, None
+            for single core operation
+
+        Return:
+        -------
+        str
+            key of the run
+        """
+        with open(sifFile, errors='replace') as f:
+            sif = normalizeSif(f.read())
+        directory = os.path.dirname(os.path.abspath(sifFile))
+        files = ["{} {}".format(os.path.relpath(path, directory), self._hash(path)) for path in references(sifFile)]
+        parallel = "serial" if commands is None else json.dumps([nprocs, commands], sort_keys=True)
+        text = "\n".join([sif] + files + [partitioncache.PartitionCache(meshDirectory).fingerprint(),
+                                           installation(), parallel])
+        return hashlib.sha1(text.encode()).hexdigest()
+
+    def restore(self, key, directory):
+        """Copies the files of an entry to the directory of a case.
+
+        Args:
+        -----
+        key: str
+            key of the run
+        directory: str
+            case directory
+
+        Return:
+        -------
+        list or None
+            restored files relative to the directory, None if the key is not
+            in the cache
+        """
+        entry = os.path.join(self.directory, key)
+        files = self._files(entry)
+        if files is None:
+            return None
+        for path in files:
+            target = os.path.join(directory, path)
+            if not os.path.isdir(os.path.dirname(target)):
+                os.makedirs(os.path.dirname(target))
+            shutil.copy2(os.path.join(entry, path), target)
+        # last use
+        os.utime(os.path.join(entry, ENTRY), None)
+        return list(files.keys())
+
+    def store(self, key, directory, before):
+        """Stores the new and changed files of a finished run.
+
+        Args:
+        -----
+        key: str
+            key of the run
+        directory: str
+            working directory of the run
+        before: dict
+            snapshot of the working directory taken before the run
+        """
+        files = OrderedDict()
+        for path, state in sorted(snapshot(directory).items()):
+            if before.get(path) != state and not _ignored(path):
+                files.update({path: state[0]})
+        if not files or sum(files.values()) > self.size:
+            return
+        entry = os.path.join(self.directory, key)
+        if os.path.isdir(entry):
+            shutil.rmtree(entry)
+        for path in files:
+            target = os.path.join(entry, path)
+            if not os.path.isdir(os.path.dirname(target)):
+                os.makedirs(os.path.dirname(target))
+            shutil.copy2(os.path.join(directory, path), target)
+        # written last, an entry without it is incomplete
+        with open(os.path.join(entry, ENTRY), 'w') as f:
+            json.dump(files, f)
+        self.trim()
+
+    def remove(self, key):
+        """Removes an entry, e.g. to force a new run"""
+        shutil.rmtree(os.path.join(self.directory, key), ignore_errors=True)
+
+    def trim(self):
+        """Removes the entries used least recently until the cache does not
+        exceed its size"""
+        entries = []
+        total = 0
+        for key in self.keys():
+            entry = os.path.join(self.directory, key)
+            files = self._files(entry)
+            if files is None:
+                # incomplete entry
+                shutil.rmtree(entry, ignore_errors=True)
+                continue
+            size = sum(files.values())
+            entries.append((os.path.getmtime(os.path.join(entry, ENTRY)), size, key))
+            total += size
+        for used, size, key in sorted(entries):
+            if total <= self.size:
+                break
+            self.remove(key)
+            total -= size
+
+    def keys(self):
+        """Returns the keys of all entries"""
+        if not os.path.isdir(self.directory):
+            return []
+        return os.listdir(self.directory)
+
+    def __contains__(self, key):
+        return self._files(os.path.join(self.directory, key)) is not None
+
+    def _hash(self, path):
+        """Returns the hash of the content of a file, the hash computed before
+        is reused if size and modification time have not changed"""
+        status = os.stat(path)
+        state = (status.st_size, status.st_mtime)
+        known = self._hashes.get(path)
+        if known is not None and known[0] == state:
+            return known[1]
+        h = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+        self._hashes.update({path: (state, h.hexdigest())})
+        return h.hexdigest()
+
+    def _files(self, entry):
+        """Returns the sizes of the files of an entry by path, None if the
+        entry does not exist or is incomplete"""
+        try:
+            with open(os.path.join(entry, ENTRY)) as f:
+                return json.load(f, object_pairs_hook=OrderedDict)
+        except (OSError, ValueError):
+            return None
@@ -0,0 +1,525 @@
+# -*- coding: utf-8 -*-
+"""
+Run history class
+
+Records every solver run in a local SQLite database: fingerprint of the case,
+command lines, number of processes, start and end time, exit code, CPU time
+and peak memory of the whole process tree (shell, mpiexec and all ranks on
+the local machine) and the summary of the log file. The CPU time and the
+memory are sampled from /proc while the run is active, so they are only
+available on Linux. The runs of a case can be queried for trends and for
+regressions, i.e. runs that took clearly longer or more memory than the
+previous runs with the same input and number of processes.
+"""
+try:
+    from PyQt4 import QtGui
+    from PyQt4 import QtCore
+except ImportError:
+    from PyQt5 import QtWidgets as QtGui
+    from PyQt5 import QtGui as QtPaint
+    from PyQt5 import QtCore
+else:
+    QtPaint = QtGui
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+import loganalyzer
+import partitioncache
+import processtree
+import resultcache
+import runpipeline
+
+# default database file
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".local", "share", "ElmerSalome", "history.sqlite")
+
+# interval of the samples of the process tree in milliseconds
+SAMPLE_INTERVAL = 1000
+
+# a run is a regression if its value exceeds the median of the previous runs
+# by this fraction
+DEFAULT_THRESHOLD = 0.2
+
+# number of previous runs the median is taken of
+DEFAULT_WINDOW = 5
+
+# quantities of the trend and regression queries, SQL expressions by name
+QUANTITIES = {"wallTime": "ended - started", "cpuTime": "cpuTime", "peakRss": "peakRss",
+              "solverTime": "solverTime", "iterations": "iterations"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT,
+    fingerprint TEXT,
+    sifFile TEXT,
+    command TEXT,
+    nprocs INTEGER,
+    started REAL,
+    ended REAL,
+    exitCode INTEGER,
+    cpuTime REAL,
+    peakRss INTEGER,
+    iterations INTEGER,
+    solverTime REAL,
+    summary TEXT
+);
+CREATE INDEX IF NOT EXISTS runsByCase ON runs (fingerprint, nprocs, started);
+"""
+
+_COLUMNS = ["ID", "name", "fingerprint", "sifFile", "command", "nprocs", "started", "ended", "exitCode",
+            "cpuTime", "peakRss", "iterations", "solverTime", "summary"]
+
+
+class run_t():
+    """
+    Recorded run.
+
+    :ID: number of the run in the database
+    :name: name of the case or job
+    :fingerprint: hash of the normalized sif-file and the mesh files, equal
+                  for runs of the same input
+    :sifFile: sif-file of the run
+    :command: command lines of the stages, one per line
+    :nprocs: number of processes
+    :started, ended: times of the first start and the last end of a stage
+    :exitCode: exit code of the first failed stage, 0 if all stages
+               succeeded, None if the run was killed
+    :cpuTime: CPU time of the process trees in seconds, None if not sampled
+    :peakRss: peak resident memory of the process trees in bytes, None if
+              not sampled
+    :iterations: nonlinear iterations of all solvers
+    :solverTime: total real time printed by ElmerSolver, None if not printed
+    :summary: summary_t of the log file, None if there was no log file
+    """
+    ID = 0
+    name = ""
+    fingerprint = ""
+    sifFile = ""
+    command = ""
+    nprocs = 1
+    started = None
+    ended = None
+    exitCode = None
+    cpuTime = None
+    peakRss = None
+    iterations = 0
+    solverTime = None
+    summary = None
+
+    def wallTime(self):
+        """Returns the wall time of the run in seconds"""
+        if self.started is None or self.ended is None:
+            return None
+        return self.ended - self.started
+
+
+def fingerprint(sifFile, meshDirectory):
+    """Returns the fingerprint of a case, the hash of the sif-file without
+    comments and of the mesh files. Unlike the key of the result cache it
+    does not depend on the number of processes or the Elmer installation, so
+    these can be compared."""
+    with open(sifFile, errors='replace') as f:
+        sif = resultcache.normalizeSif(f.read())
+    text = sif + "\n" + partitioncache.PartitionCache(meshDirectory).fingerprint()
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+class ProcessSampler(QtCore.QObject):
+    """Samples the process trees of the running stages of a pipeline. The CPU
+    time of a tree is the one of its live processes plus the one of the
+    processes they have waited for, the maximum sampled per stage process is
+    summed up. The peak memory is the maximum of the resident memory of all
+    trees sampled at the same time. Processes and CPU time between the last
+    sample and the end of a stage are missed."""
+
+    def __init__(self, pipeline, interval=SAMPLE_INTERVAL):
+        """Constructor
+
+        Args:
+        -----
+        pipeline: Pipeline-class
+            pipeline of the run, sampled from the start of its first stage
+            until it has finished
+        interval: int
+            interval of the samples in milliseconds
+        """
+        super(ProcessSampler, self).__init__()
+
+        # public
+        self.pipeline = pipeline
+        self.available = processtree.available()
+        self.samples = 0
+        self.peakRss = None  # bytes
+
+        # private
+        self._cpu = {}  # maximum CPU ticks by pid of the stage process
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self.sample)
+
+        pipeline.stageStarted.connect(self._stageStarted)
+        pipeline.finished.connect(lambda success: self._timer.stop())
+
+    def cpuTime(self):
+        """Returns the CPU time sampled in seconds, None if not available"""
+        if not self.available or not self.samples:
+            return None
+        return sum(self._cpu.values()) / float(processtree.CLOCK_TICKS)
+
+    def sample(self):
+        """Samples the process trees of the running stages"""
+        if not self.available:
+            return
+        roots = [process.pid() for process in self.pipeline.processes.values()]
+        roots = [pid for pid in roots if pid > 0]
+        if not roots:
+            return
+        processes = processtree.processes()
+        rss = 0
+        for root in roots:
+            tree = processtree.tree(root, processes)
+            if not tree:
+                continue
+            cpu = sum([processes[pid][processtree.CPU] for pid in tree])
+            self._cpu.update({root: max(cpu, self._cpu.get(root, 0))})
+            rss += sum([processes[pid][processtree.RSS] for pid in tree]) * processtree.PAGE_SIZE
+        self.peakRss = max(rss, self.peakRss or 0)
+        self.samples += 1
+
+    def _stageStarted(self, name):
+        if self.available and not self._timer.isActive():
+            self._timer.start()
+
+
+class RunHistory():
+    """Database of the recorded runs. The database is created when it is
+    first used."""
+
+    def __init__(self, path=DEFAULT_PATH):
+        """Constructor
+
+        Args:
+        -----
+        path: str
+            database file, ':memory:' for a database that is not stored
+        """
+        # public
+        self.path = path
+
+        # private
+        self._connection = None
+
+    def connection(self):
+        """Returns the connection to the database, opens it and creates the
+        tables if necessary"""
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory and not os.path.isdir(directory):
+                os.makedirs(directory)
+            self._connection = sqlite3.connect(self.path)
+            self._connection.executescript(_SCHEMA)
+        return self._connection
+
+    def close(self):
+        """Closes the connection to the database"""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def record(self, name, sifFile, meshDirectory, nprocs, pipeline, sampler=None, summary=None):
+        """Records a finished run.
+
+        Args:
+        -----
+        name: str
+            name of the case or job
+        sifFile: str
+            sif-file of the run
+        meshDirectory: str
+            mesh directory of the run
+        nprocs: int
+            number of processes
+        pipeline: Pipeline-class
+            finished pipeline of the run
+        sampler: ProcessSampler-class, optional
+            sampler of the process trees of the run
+        summary: summary_t, optional
+            summary of the log file of the run
+
+        Return:
+        -------
+        int
+            ID of the run
+        """
+        attempts = [attempt for s in pipeline.stages for attempt in s.attempts]
+        exitCode = None
+        if pipeline.success:
+            exitCode = 0
+        else:
+            for s in pipeline.stages:
+                if s.state == runpipeline.FAILED:
+                    exitCode = s.exitCode
+                    break
+        values = {"name": name, "fingerprint": fingerprint(sifFile, meshDirectory), "sifFile": sifFile,
+                  "command": "\n".join([s.command for s in pipeline.stages if s.attempts]),
+                  "nprocs": nprocs,
+                  "started": min([start for start, end, code in attempts]) if attempts else None,
+                  "ended": max([end or start for start, end, code in attempts]) if attempts else None,
+                  "exitCode": exitCode, "cpuTime": None, "peakRss": None, "iterations": 0,
+                  "solverTime": None, "summary": None}
+        if sampler is not None:
+            values.update({"cpuTime": sampler.cpuTime(), "peakRss": sampler.peakRss})
+        if summary is not None:
+            values.update({"iterations": sum([s.nonlinearIterations for s in summary.solvers.values()]),
+                           "solverTime": summary.realTime,
+                           "summary": json.dumps(loganalyzer.toDict(summary))})
+        keys = _COLUMNS[1:]
+        with self.connection() as connection:
+            cursor = connection.execute("INSERT INTO runs ({}) VALUES ({})".format(
+                ", ".join(keys), ", ".join(["?"] * len(keys))), [values[key] for key in keys])
+        return cursor.lastrowid
+
+    def run(self, ID):
+        """Returns the run with the given ID, None if it does not exist"""
+        runs = self._query("WHERE ID = ?", [ID])
+        return runs[0] if runs else None
+
+    def runs(self, fingerprint=None, nprocs=None, limit=None):
+        """Returns recorded runs, latest first.
+
+        Args:
+        -----
+        fingerprint: str, optional
+            only the runs of this case
+        nprocs: int, optional
+            only the runs with this number of processes
+        limit: int, optional
+            maximum number of runs
+
+        Return:
+        -------
+        list
+            run_t of the runs
+        """
+        conditions, parameters = self._conditions(fingerprint, nprocs)
+        sql = conditions + " ORDER BY started DESC, ID DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            parameters.append(limit)
+        return self._query(sql, parameters)
+
+    def cases(self):
+        """Returns a list of (fingerprint, name of the latest run, number of
+        runs, time of the latest run) of all recorded cases, latest first"""
+        cases = {}
+        for case, name, started in self.connection().execute(
+                "SELECT fingerprint, name, started FROM runs ORDER BY started, ID"):
+            count = cases[case][1] if case in cases else 0
+            cases.update({case: (name, count + 1, started)})
+        return sorted([(case, name, count, started) for case, (name, count, started) in cases.items()],
+                      key=lambda case: case[3] or 0, reverse=True)
+
+    def trend(self, fingerprint, quantity="wallTime", nprocs=None):
+        """Returns a quantity of the successful runs of a case over time.
+
+        Args:
+        -----
+        fingerprint: str
+            fingerprint of the case
+        quantity: str
+            key of QUANTITIES
+        nprocs: int, optional
+            only the runs with this number of processes
+
+        Return:
+        -------
+        list
+            (start time, number of processes, value) in chronological order
+        """
+        expression = self._expression(quantity)
+        conditions, parameters = self._conditions(fingerprint, nprocs)
+        sql = "SELECT started, nprocs, {} FROM runs {} AND exitCode = 0 AND {} IS NOT NULL " \
+              "ORDER BY started".format(expression, conditions, expression)
+        return [tuple(row) for row in self.connection().execute(sql, parameters).fetchall()]
+
+    def regressions(self, fingerprint=None, quantity="wallTime", threshold=DEFAULT_THRESHOLD,
+                    window=DEFAULT_WINDOW):
+        """Returns the successful runs whose value exceeds the median of the
+        previous successful runs of the same case and number of processes by
+        more than the threshold.
+
+        Args:
+        -----
+        fingerprint: str, optional
+            only the runs of this case
+        quantity: str
+            key of QUANTITIES
+        threshold: float
+            relative increase, e.g. 0.2 for 20 %
+        window: int
+            number of previous runs the median is taken of
+
+        Return:
+        -------
+        list
+            (run_t, median of the previous runs, ratio) in chronological order
+        """
+        expression = self._expression(quantity)
+        conditions, parameters = self._conditions(fingerprint, None)
+        runs = self._query(conditions + " AND exitCode = 0 AND {} IS NOT NULL ORDER BY started, ID".format(
+            expression), parameters)
+        previous = {}  # values by (fingerprint, nprocs)
+        result = []
+        for run in runs:
+            value = run.wallTime() if quantity == "wallTime" else getattr(run, quantity)
+            values = previous.setdefault((run.fingerprint, run.nprocs), [])
+            if values:
+                recent = sorted(values[-window:])
+                middle = len(recent) // 2
+                median = recent[middle] if len(recent) % 2 else (recent[middle - 1] + recent[middle]) / 2.
+                if median > 0 and value > median * (1. + threshold):
+                    result.append((run, median, value / float(median)))
+            values.append(value)
+        return result
+
+    def _expression(self, quantity):
+        expression = QUANTITIES.get(quantity)
+        if expression is None:
+            raise ValueError("Unknown quantity {}".format(quantity))
+        return expression
+
+    def _conditions(self, fingerprint, nprocs):
+        conditions = ["1"]
+        parameters = []
+        if fingerprint is not None:
+            conditions.append("fingerprint = ?")
+            parameters.append(fingerprint)
+        if nprocs is not None:
+            conditions.append("nprocs = ?")
+            parameters.append(nprocs)
+        return "WHERE " + " AND ".join(conditions), parameters
+
+    def _query(self, sql, parameters):
+        runs = []
+        for row in self.connection().execute("SELECT {} FROM runs {}".format(", ".join(_COLUMNS), sql),
+                                             parameters):
+            run = run_t()
+            for key, value in zip(_COLUMNS, row):
+                setattr(run, key, value)
+            if run.summary is not None:
+                run.summary = loganalyzer.fromDict(json.loads(run.summary))
+            runs.append(run)
+        return runs
+
+
+class RunHistoryView(QtGui.QWidget):
+    """Window with the recorded runs of a case, regressions are marked"""
+
+    COLUMNS = ["ID", "Case", "Processes", "Started", "Wall time", "CPU time", "Peak memory",
+               "Iterations", "Exit code"]
+
+    QUANTITIES = [("Wall time", "wallTime"), ("CPU time", "cpuTime"), ("Peak memory", "peakRss"),
+                  ("Iterations", "iterations")]
+
+    def __init__(self, history):
+        """Constructor.
+
+        Args:
+        -----
+        history: RunHistory-class
+            the database shown
+        """
+        super(RunHistoryView, self).__init__()
+        self.setWindowTitle("Run history")
+
+        # public
+        self.history = history
+
+        # private
+        self._fingerprints = []
+
+        self.caseComboBox = QtGui.QComboBox()
+        self.quantityComboBox = QtGui.QComboBox()
+        for label, quantity in self.QUANTITIES:
+            self.quantityComboBox.addItem(label)
+        self.table = QtGui.QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setSelectionBehavior(QtGui.QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QtGui.QAbstractItemView.NoEditTriggers)
+        self.regressionLabel = QtGui.QLabel()
+        self.refreshButton = QtGui.QPushButton("&Refresh")
+
+        self.caseComboBox.currentIndexChanged.connect(lambda index: self.refreshRuns())
+        self.quantityComboBox.currentIndexChanged.connect(lambda index: self.refreshRuns())
+        self.refreshButton.clicked.connect(self.refresh)
+
+        selectionLayout = QtGui.QHBoxLayout()
+        selectionLayout.addWidget(QtGui.QLabel("Case:"))
+        selectionLayout.addWidget(self.caseComboBox, 1)
+        selectionLayout.addWidget(QtGui.QLabel("Regressions of:"))
+        selectionLayout.addWidget(self.quantityComboBox)
+        buttonLayout = QtGui.QHBoxLayout()
+        buttonLayout.addWidget(self.regressionLabel, 1)
+        buttonLayout.addWidget(self.refreshButton)
+        mainLayout = QtGui.QVBoxLayout()
+        mainLayout.addLayout(selectionLayout)
+        mainLayout.addWidget(self.table)
+        mainLayout.addLayout(buttonLayout)
+        self.setLayout(mainLayout)
+
+    def refresh(self):
+        """Reads the cases and the runs from the database"""
+        fingerprint = self.fingerprint()
+        self.caseComboBox.blockSignals(True)
+        self.caseComboBox.clear()
+        self.caseComboBox.addItem("All cases")
+        self._fingerprints = [None]
+        for case, name, count, latest in self.history.cases():
+            self.caseComboBox.addItem("{} ({} runs, {})".format(name, count, case[:8]))
+            self._fingerprints.append(case)
+        if fingerprint in self._fingerprints:
+            self.caseComboBox.setCurrentIndex(self._fingerprints.index(fingerprint))
+        self.caseComboBox.blockSignals(False)
+        self.refreshRuns()
+
+    def fingerprint(self):
+        """Returns the fingerprint of the selected case, None for all cases"""
+        index = self.caseComboBox.currentIndex()
+        if index < 0 or index >= len(self._fingerprints):
+            return None
+        return self._fingerprints[index]
+
+    def refreshRuns(self):
+        """Updates the table with the runs of the selected case"""
+        fingerprint = self.fingerprint()
+        runs = self.history.runs(fingerprint)
+        quantity = self.QUANTITIES[max(0, self.quantityComboBox.currentIndex())][1]
+        regressions = dict([(run.ID, ratio) for run, median, ratio in
+                            self.history.regressions(fingerprint, quantity)])
+        self.table.setRowCount(len(runs))
+        for row, run in enumerate(runs):
+            values = [run.ID, run.name, run.nprocs,
+                      "-" if run.started is None else time.strftime("%Y-%m-%d %H:%M:%S",
+                                                                    time.localtime(run.started)),
+                      _format(run.wallTime(), "{:.1f} s"), _format(run.cpuTime, "{:.1f} s"),
+                      _format(run.peakRss and run.peakRss / 1024. ** 2, "{:.0f} MiB"), run.iterations,
+                      _format(run.exitCode, "{}")]
+            for column, value in enumerate(values):
+                item = QtGui.QTableWidgetItem(str(value))
+                if run.ID in regressions:
+                    item.setBackground(QtPaint.QBrush(QtPaint.QColor(255, 200, 200)))
+                    item.setToolTip("{:.0f} % above the previous runs".format((regressions[run.ID] - 1.) * 100))
+                self.table.setItem(row, column, item)
+        self.regressionLabel.setText("{} regression(s) of {} runs".format(len(regressions), len(runs)))
+
+    def showEvent(self, event):
+        self.refresh()
+        super(RunHistoryView, self).showEvent(event)
+
+
+def _format(value, text):
+    return "-" if value is None else text.format(value)
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""
+Run pipeline class
+
+Runs the stages of a solver run (partitioning, solving, merging) as a small
+dependency graph. A stage is started as soon as all stages it depends on have
+finished successfully, a stage failing after its retries stops all stages
+depending on it. The time and the exit code of every attempt is recorded.
+"""
+try:
+    from PyQt4 import QtCore
+except ImportError:
+    from PyQt5 import QtCore
+
+import time
+
+import runsolver
+
+# states of a stage
+WAITING = "waiting"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+class stage_t():
+    """
+    Stage of a pipeline.
+
+    :name: unique name of the stage
+    :command: shell command
+    :depends: names of the stages that have to be finished before
+    :retries: number of times the command is repeated if it fails
+    :cwd: working directory, the one of the pipeline if None
+    :logFile: file receiving the output of the command, None for no log file
+    :state: WAITING, RUNNING, DONE, FAILED or SKIPPED
+    :exitCode: exit code of the last attempt
+    :attempts: list of (start time, end time, exit code) of all attempts
+    """
+    name = ""
+    command = ""
+    depends = ()
+    retries = 0
+    cwd = None
+    logFile = None
+    state = WAITING
+    exitCode = None
+    attempts = None
+
+    def duration(self):
+        """Returns the wall time of all attempts in seconds, up to now for a
+        running attempt"""
+        now = time.time()
+        return sum([(end or now) - start for start, end, exitCode in self.attempts or []])
+
+
+class Pipeline(QtCore.QObject):
+    """Dependency graph of the stages of a run. The processes are run by the
+    event loop, independent stages run concurrently."""
+
+    # signals
+    output = QtCore.pyqtSignal(str, name="output")
+    stageStarted = QtCore.pyqtSignal(str, name="stageStarted")
+    stageFinished = QtCore.pyqtSignal(str, int, name="stageFinished")
+    finished = QtCore.pyqtSignal(bool, name="finished")
+
+    def __init__(self, cwd=None, env=None):
+        """Constructor
+
+        Args:
+        -----
+        cwd: str, optional
+            working directory of the stages
+        env: QProcessEnvironment, optional
+            environment of the stages
+        """
+        super(Pipeline, self).__init__()
+
+        # public
+        self.cwd = cwd
+        self.env = env
+        self.stages = []  # stage_t in order of addition
+        self.processes = {}  # running SolverProcess by stage name
+        self.success = None
+        self.cached = False  # results restored from the result cache, no stages
+
+        # private
+        self._byName = {}
+        self._killed = False
+
+    def add(self, name, command, depends=(), retries=0, logFile=None, cwd=None):
+        """Adds a stage.
+
+        Args:
+        -----
+        name: str
+            unique name of the stage
+        command: str
+            shell command
+        depends: tuple
+            names of stages already added that have to be finished before
+        retries: int
+            number of times the command is repeated if it fails
+        logFile: str, optional
+            file receiving the output of the command
+        cwd: str, optional
+            working directory, the one of the pipeline if not given
+
+        Return:
+        -------
+        stage_t
+            the new stage
+        """
+        if name in self._byName:
+            raise ValueError("Stage {} exists already".format(name))
+        for dependency in depends:
+            if dependency not in self._byName:
+                raise ValueError("Unknown stage {}".format(dependency))
+        s = stage_t()
+        s.name = name
+        s.command = command
+        s.depends = tuple(depends)
+        s.retries = retries
+        s.logFile = logFile
+        s.cwd = cwd
+        s.attempts = []
+        self.stages.append(s)
+        self._byName.update({name: s})
+        return s
+
+    def stage(self, name):
+        """Returns the stage with the given name"""
+        return self._byName[name]
+
+    def start(self):
+        """Starts all stages without dependencies, returns immediately"""
+        self.success = None
+        self._killed = False
+        for s in self.stages:
+            s.state = WAITING
+            s.exitCode = None
+            s.attempts = []
+        self._schedule()
+
+    def kill(self, timeout=None):
+        """Stops the running stages, the waiting stages are skipped. The
+        process trees of the running stages are terminated and killed if they
+        have not exited after the timeout.
+
+        Args:
+        -----
+        timeout: int, optional
+            time in milliseconds the processes get to exit, KILL_TIMEOUT of
+            runsolver if not given, 0 to kill them immediately
+        """
+        self._killed = True
+        for s in self.stages:
+            if s.state == WAITING:
+                s.state = SKIPPED
+        for process in list(self.processes.values()):
+            if timeout == 0:
+                process.kill()
+            else:
+                process.terminate(runsolver.KILL_TIMEOUT if timeout is None else timeout)
+
+    def isRunning(self):
+        """Checks if the pipeline has been started and not finished yet"""
+        return self.success is None and any([s.state != WAITING for s in self.stages])
+
+    def timing(self):
+        """Returns a list of (stage name, state, wall time in seconds,
+        number of attempts)"""
+        return [(s.name, s.state, s.duration(), len(s.attempts)) for s in self.stages]
+
+    def _schedule(self):
+        for s in self.stages:
+            if s.state != WAITING:
+                continue
+            states = [self._byName[dependency].state for dependency in s.depends]
+            if any([state in (FAILED, SKIPPED) for state in states]):
+                s.state = SKIPPED
+            elif all([state == DONE for state in states]):
+                self._launch(s)
+        if not self.processes and self.success is None:
+            self.success = all([s.state == DONE for s in self.stages])
+            self.finished.emit(self.success)
+
+    def _launch(self, s):
+        s.state = RUNNING
+        cwd = s.cwd if s.cwd is not None else self.cwd
+        process = runsolver.SolverProcess(s.command, cwd, s.logFile, self.env)
+        process.output.connect(self.output.emit)
+        process.errorOutput.connect(self.output.emit)
+        process.finished.connect(lambda exitCode, s=s: self._stageFinished(s, exitCode))
+        self.processes.update({s.name: process})
+        s.attempts.append((time.time(), None, None))
+        self.stageStarted.emit(s.name)
+        process.start()
+
+    def _stageFinished(self, s, exitCode):
+        start = s.attempts[-1][0]
+        s.attempts[-1] = (start, time.time(), exitCode)
+        s.exitCode = exitCode
+        del self.processes[s.name]
+        if exitCode == 0:
+            s.state = DONE
+        elif len(s.attempts) <= s.retries and not self._killed:
+            self.output.emit("{} failed with exit code {}, retrying\n".format(s.name, exitCode))
+            self._launch(s)
+            return
+        else:
+            s.state = FAILED
+        self.stageFinished.emit(s.name, exitCode)
+        self._schedule()
@@ -15,31 +15,383 @@ except ImportError:
     from PyQt5 import QtXml
     from PyQt5 import QtCore
 
+import codecs
+import concurrent.futures
 import shutil
-import subprocess
 import os
+import signal
 import sys
 
+import jobqueue
+import loganalyzer
+import partitioncache
+import processtree
+import resultcache
+import runpipeline
+
+# time in milliseconds a terminated process tree gets to exit before it is
+# killed
+KILL_TIMEOUT = 5000
+
+# the commands are started in a process group of their own, so the shell,
+# mpiexec and all ranks can be signalled together
+_setsid = shutil.which("setsid")
+
+# terminated processes waiting for SIGKILL, kept alive until it is sent
+_terminating = set()
+
+
+class SolverProcess(QtCore.QObject):
+    """Runs ElmerSolver or any other shell command in a QProcess. stdout and
+    stderr are drained concurrently by the event loop in chunks as they
+    arrive, written to the log file and emitted to the subscribers. The exit
+    code is emitted with finished and set as result of the future, -1 if the
+    process crashed or could not be started. The command runs in a process
+    group of its own if setsid is available, terminate and kill stop the
+    whole process tree."""
+
+    # signals
+    output = QtCore.pyqtSignal(str, name="output")
+    errorOutput = QtCore.pyqtSignal(str, name="errorOutput")
+    finished = QtCore.pyqtSignal(int, name="finished")
+
+    def __init__(self, command, cwd=None, logFile=None, env=None):
+        """Constructor
+
+        Args:
+        -----
+        command: str
+            shell command to run
+        cwd: str, optional
+            working directory of the process
+        logFile: str, optional
+            file receiving stdout and stderr of the process
+        env: QProcessEnvironment, optional
+            environment of the process, the one of the Salome process if not
+            given
+        """
+        super(SolverProcess, self).__init__()
+
+        # public
+        self.command = command
+        self.cwd = cwd
+        self.logFile = logFile
+        self.env = env
+        self.exitCode = None
+        self.future = concurrent.futures.Future()
+
+        # private
+        self._log = None
+        self._stdout = codecs.getincrementaldecoder('utf-8')('replace')
+        self._stderr = codecs.getincrementaldecoder('utf-8')('replace')
+        self._signalled = {}  # start time by pid of the processes terminated
+        self._killTimer = QtCore.QTimer(self)
+        self._killTimer.setSingleShot(True)
+        self._killTimer.timeout.connect(self._escalate)
+        self._process = QtCore.QProcess(self)
+        self._process.readyReadStandardOutput.connect(self._readStdout)
+        self._process.readyReadStandardError.connect(self._readStderr)
+        self._process.finished.connect(self._finished)
+        if hasattr(self._process, 'errorOccurred'):
+            self._process.errorOccurred.connect(self._error)
+        else:
+            self._process.error.connect(self._error)
+
+    def start(self):
+        """Starts the process, returns immediately"""
+        if self.logFile:
+            self._log = open(self.logFile, 'w')
+        if self.cwd:
+            self._process.setWorkingDirectory(self.cwd)
+        if self.env is not None:
+            self._process.setProcessEnvironment(self.env)
+        self.future.set_running_or_notify_cancel()
+        if _setsid is not None:
+            # setsid replaces itself by the shell, the pid is the one of the
+            # shell and of the process group
+            self._process.start(_setsid, ["-w", "/bin/sh", "-c", self.command])
+        else:
+            self._process.start("/bin/sh", ["-c", self.command])
+
+    def terminate(self, timeout=KILL_TIMEOUT):
+        """Terminates the process with all its descendants. SIGTERM is sent to
+        the process tree and its process groups, SIGKILL to the processes
+        still alive after the timeout, even if the shell has exited already.
+
+        Args:
+        -----
+        timeout: int
+            time in milliseconds the processes get to exit
+        """
+        if not self.isRunning():
+            return
+        if processtree.available():
+            self._signalled = processtree.signalTree(self.pid(), signal.SIGTERM)
+        else:
+            self._process.terminate()
+        _terminating.add(self)
+        self._killTimer.start(timeout)
+
+    def kill(self):
+        """Kills the process with all its descendants immediately"""
+        if processtree.available():
+            processtree.signalTree(self.pid(), signal.SIGKILL, self._signalled)
+        self._process.kill()
+
+    def isRunning(self):
+        """Checks if the process has been started and not finished yet"""
+        return self._process.state() != QtCore.QProcess.NotRunning
+
+    def pid(self):
+        """Returns the process ID of the shell running the command"""
+        if hasattr(self._process, 'processId'):
+            return int(self._process.processId())
+        return int(self._process.pid())
+
+    def waitForFinished(self, msecs=-1):
+        """Blocks until the process has finished, for scripts without event
+        loop. Returns the exit code or None on timeout."""
+        if self.isRunning() and not self._process.waitForFinished(msecs):
+            return None
+        return self.exitCode
+
+    def _escalate(self):
+        _terminating.discard(self)
+        if processtree.available():
+            pid = self.pid() if self.isRunning() else 0
+            processtree.signalTree(pid, signal.SIGKILL, self._signalled)
+        self._process.kill()
+
+    def _readStdout(self):
+        text = self._stdout.decode(self._process.readAllStandardOutput().data())
+        if text:
+            self._write(text)
+            self.output.emit(text)
+
+    def _readStderr(self):
+        text = self._stderr.decode(self._process.readAllStandardError().data())
+        if text:
+            self._write(text)
+            self.errorOutput.emit(text)
+
+    def _write(self, text):
+        if self._log is not None:
+            self._log.write(text)
+
+    def _finished(self, exitCode, exitStatus=None):
+        self._readStdout()
+        self._readStderr()
+        if exitStatus == QtCore.QProcess.CrashExit:
+            exitCode = -1
+        self._done(exitCode)
+
+    def _error(self, error):
+        # finished is not emitted if the process could not be started
+        if error == QtCore.QProcess.FailedToStart:
+            self._write("Failed to start: {}\n".format(self.command))
+            self._done(-1)
+
+    def _done(self, exitCode):
+        if self.exitCode is not None:
+            return
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        self.exitCode = exitCode
+        self.future.set_result(exitCode)
+        self.finished.emit(exitCode)
+
+
+def expand(cmd, nprocs, meshDirectory, postFile):
+    """Replaces the placeholders of a command template.
+
+    Args:
+    -----
+    cmd: str
+        command template
+    nprocs: int
+        number of processes, replaces %n
+    meshDirectory: str
+        mesh directory, replaces %msh
+    postFile: str
+        post file name, replaces %ep
+
+    Return:
+    -------
+    str
+        command
+    """
+    cmd_str = cmd
+    cmd_str = cmd_str.replace('%n', str(nprocs))
+    cmd_str = cmd_str.replace('%msh', meshDirectory)
+    cmd_str = cmd_str.replace('%ep', postFile)
+    return cmd_str
+
+
+def createPipeline(sifFile, meshDirectory, nprocs=1, commands=None, postFile="", cwd=None, env=None):
+    """Creates the stages of a run. In parallel mode the mesh is partitioned
+    before the solver is started, unless a valid partitioning is in the
+    partition cache, and the results are merged after the solver has finished
+    successfully, the ElmerGrid stages are retried once.
+
+    Args:
+    -----
+    sifFile: str
+        sif-file, the log file of the solver gets the same name
+    meshDirectory: str
+        mesh directory
+    nprocs: int
+        number of processes
+    commands: dict, optional
+        command templates as returned by ParallelSettings.commands, single
+        core operation if None
+    postFile: str
+        post file name
+    cwd: str, optional
+        working directory of the run, the directory of the sif-file if not
+        given
+    env: QProcessEnvironment, optional
+        environment of the processes of the run
+
+    Return:
+    -------
+    Pipeline-class
+        the stages of the run, not started
+    """
+    if cwd is None:
+        cwd = os.path.dirname(sifFile)
+    pipeline = runpipeline.Pipeline(cwd, env)
+    logFile = sifFile.replace('.sif', '.log')
+    if commands is None:
+        # single core operation
+        pipeline.add("solve", "ElmerSolver {}".format(sifFile), logFile=logFile)
+        return pipeline
+
+    partition = not commands["skipPartitioning"]
+    depends = ()
+    if partition:
+        # split mesh unless the partitioning of the mesh is in the cache
+        cache = partitioncache.PartitionCache(meshDirectory)
+        if not cache.activate(nprocs, commands["divide"]):
+            pipeline.add("partition", expand(commands["divide"], nprocs, meshDirectory, postFile), retries=1)
+            depends = ("partition",)
+
+            def partitioned(name, exitCode):
+                if name == "partition" and exitCode == 0:
+                    cache.store(nprocs, commands["divide"])
+            pipeline.stageFinished.connect(partitioned)
+    # call ElmerSolver via mpiexec
+    cmd = expand(commands["exec"] + ' ' + commands["args"], nprocs, meshDirectory, postFile)
+    pipeline.add("solve", cmd, depends, logFile=logFile)
+    if partition and (os.path.splitext(postFile)[1] != ".ep"):
+        # merge mesh
+        pipeline.add("merge", expand(commands["merge"], nprocs, meshDirectory, postFile), ("solve",), retries=1)
+    return pipeline
+
+
+def createRun(workspace, nprocs=1, commands=None, postFile="", cache=None, force=False):
+    """Prepares the working directory of a run and creates its stages, see
+    createPipeline. The workspace is finished, i.e. the files are copied back
+    from the scratch directory, when the stages have finished. If the results
+    of a run with the same input are in the result cache, they are restored
+    to the case directory and the pipeline has no stages.
+
+    Args:
+    -----
+    workspace: Workspace-class
+        working directory and environment of the run
+    nprocs: int
+        number of processes
+    commands: dict, optional
+        command templates as returned by ParallelSettings.commands, single
+        core operation if None
+    postFile: str
+        post file name
+    cache: ResultCache-class, optional
+        cache of the results, results are not cached if not given
+    force: bool
+        run the solver even if the results are in the cache
+
+    Return:
+    -------
+    Pipeline-class
+        the stages of the run, not started
+    """
+    key = None
+    if cache is not None:
+        key = cache.key(workspace.sifFile, workspace.meshDirectory, nprocs, commands)
+        if force:
+            cache.remove(key)
+        elif cache.restore(key, workspace.caseDirectory) is not None:
+            pipeline = runpipeline.Pipeline(workspace.caseDirectory)
+            pipeline.cached = True
+            return pipeline
+
+    workspace.prepare(commands is not None)
+    pipeline = createPipeline(workspace.sifFile, workspace.meshDirectory, nprocs, commands, postFile,
+                              workspace.directory, workspace.environment())
+    if key is not None:
+        before = resultcache.snapshot(workspace.directory)
+        directory = workspace.directory
+
+        def store(success):
+            if success:
+                cache.store(key, directory, before)
+        pipeline.finished.connect(store)
+    pipeline.finished.connect(lambda success: workspace.finish())
+    return pipeline
+
+
+def solverStarted(pipeline):
+    """Checks if the solver of a finished run has been started, otherwise the
+    log file in the case directory is the one of a previous run. The log file
+    of results restored from the result cache belongs to the run.
+
+    Args:
+    -----
+    pipeline: Pipeline-class
+        pipeline of the run
+
+    Return:
+    -------
+    bool
+        True if the log file belongs to the run
+    """
+    return pipeline.cached or bool(pipeline.stage("solve").attempts)
+
+
 class runElmerSolver():
-    """runElmerSolver"""
+    """runElmerSolver. The run is a job of the job queue at the top priority,
+    so its cores are counted together with the ones of the queued runs."""
 
     def __init__(self, ewh):
+        # public
+        self.job = None  # job_t of the last run
+        self.pipeline = None  # stages of the last run
+        self.workspace = None  # working directory of the last run
+        self.monitor = None  # convergence of the last run
+        self.summary = None  # summary_t of the log file of the last run
+        self.sampler = None  # CPU time and memory of the last run
+        self.watchdog = None  # watchdog of the last run, None if not watched
+
         # private
         self._ewh = ewh
+        self._jobID = None
 
-    def expand(self,cmd):
-        cmd_str = cmd
-        cmd_str = cmd_str.replace('%n', str(self._ewh.psWindow.nofProcessorsSpinBox.value()))
-        cmd_str = cmd_str.replace('%msh', self._ewh.meshDirectory)
-        cmd_str = cmd_str.replace('%ep', str(self._ewh.gsWindow.postFileEdit.text()))
-        return cmd_str
-
+    def expand(self, cmd):
+        return expand(cmd, self._ewh.psWindow.nofProcessorsSpinBox.value(),
+                      self._ewh.meshDirectory, str(self._ewh.gsWindow.postFileEdit.text()))
 
     # %% call to ElmerSolver
-    def start_Solver(self):
+    def start_Solver(self, force=False):
         """Calls the ElmerSolver. Checks if a sif-file is present and whether
-        multiprocessing is available and selected by the user.
+        multiprocessing is available and selected by the user. The run waits
+        in the job queue until enough cores are free.
 
+        Args:
+        -----
+        force: bool
+            run the solver even if the results are in the result cache
         """
         #global subprocess
 
@@ -61,91 +413,87 @@ class runElmerSolver():
                                           "No ElmerSolver-executable found.")
                 return 0
             else:
-                from threading import Thread
-                # do multiprocessing if set
-                # (ParallelSettings class checks for mpi executable and availability of multiprocessing)
-                if self._ewh.psWindow.parallelActiveCheckBox.isChecked():
-                    if not self._ewh.psWindow.skipPartitioningCheckBox.isChecked():
-                        # split mesh
-                        # on Linux shell=True required,
-                        # see http://stackoverflow.com/a/18962815/4141279
-                        cmd = self.expand(str(self._ewh.psWindow.divideLineEdit.text()))
-                        print(cmd)
-                        subprocess.Popen(cmd, shell=True)
-                    # change dir
-                    path = os.path.dirname(sifFile)
-                    os.chdir(path)
-                    # create setup file
-                    fs = open('ELMERSOLVER_STARTINFO', mode='w')
-                    fileName = os.path.basename(sifFile)
-                    fs.writelines([fileName, '\n', '1'])
-                    fs.close()
-
-                    #------------------------------------------------
-                    # call ElmerSolver via mpiexec via a separate thread
-                    def solve():
-                        logfile = open(sifFile.replace('.sif','.log'), 'w')
-                        cmd = self.expand(str(self._ewh.psWindow.parallelExecLineEdit.text()) + ' ' + str(self._ewh.psWindow.parallelArgsLineEdit.text()))
-                        print(cmd)
-                        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, shell=True)
-                        # Poll process for new output until finished
-                        while True:
-                            nextline = proc.stdout.readline()
-                            if nextline == '' and proc.poll() is not None:
-                                break
-                            sys.stdout.write(nextline)
-                            sys.stdout.flush()
-                            logfile.write(nextline)
-
-                        output = proc.communicate()[0]
-                        exitCode = proc.returncode
-                        logfile.close()
-                        if (not self._ewh.psWindow.skipPartitioningCheckBox.isChecked) and (os.path.splitext(str(self.gsWindow.postFileEdit.text()))[1] != ".ep"):
-                            # merge mesh
-                            cmd = self.expand(str(self._ewh.psWindow.mergeLineEdit.text()))
-                            print(cmd)
-                            subprocess.Popen(cmd, shell=True)
-                        print ('Done')
-                        #------------------------------------------------
-
-                    print ('starting')
-                    sys.stdout.flush()
-                    t = Thread(target=solve)
-                    t.start()
-                    QtGui.QMessageBox.information(None, 'Solver', 'Solver is running. Check console and log file.')
-                    return 1
-                # single core operation
+                print('starting')
+                sys.stdout.flush()
+                queue = self._ewh.jobQueue
+                # the job may be started and even finished by submit
+                self._jobID = queue.nextID()
+                queue.jobStarted.connect(self._jobStarted)
+                queue.jobFinished.connect(self._jobFinished)
+                self._ewh.queueSolver(queue.topPriority(), None, force)
+                self.job = queue.job(self._jobID)
+                self.monitor = self.job.monitor
+                if self.job.pipeline is None and self.job.state != jobqueue.QUEUED:
+                    QtGui.QMessageBox.warning(None, "runElmerSolver",
+                                              "Could not prepare the working directory. {}".format(self.job.message))
+                    return 0
+                if self.job.state == jobqueue.QUEUED:
+                    QtGui.QMessageBox.information(None, 'Solver', 'Solver is waiting for free cores, see the job queue.')
+                elif self.pipeline.cached:
+                    QtGui.QMessageBox.information(None, 'Solver', 'Results of an identical run restored from the result cache.')
                 else:
-                    path = os.path.dirname(sifFile)
-                    os.chdir(path)
-
-                    #------------------------------------------------
-                    # call ElmerSolver via a separate thread
-                    def solve():
-                        logfile = open(sifFile.replace('.sif','.log'), 'w')
-                        proc = subprocess.Popen("ElmerSolver {}".format(sifFile),
-                                                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
-                                                universal_newlines=True, shell=True)
-                        # Poll process for new output until finished
-                        while True:
-                            nextline = proc.stdout.readline()
-                            if nextline == '' and proc.poll() is not None:
-                                break
-                            sys.stdout.write(nextline)
-                            sys.stdout.flush()
-                            logfile.write(nextline)
-
-                        output = proc.communicate()[0]
-                        exitCode = proc.returncode
-                        logfile.close()
-                        print ('Done')
-                    #------------------------------------------------
-
-                    print ('starting')
-                    sys.stdout.flush()
-                    t = Thread(target=solve)
-                    t.start()
                     QtGui.QMessageBox.information(None, 'Solver', 'Solver is running. Check console and log file.')
-                    # ...
-                    #QtGui.QMessageBox.information(None, 'Solver', 'Solver has terminated.')
-                    return 1
+                return 1
+
+    def isRunning(self):
+        """Checks if the run is waiting for free cores or running"""
+        return self.job is not None and self.job.state in (jobqueue.QUEUED, jobqueue.RUNNING)
+
+    def stop_Solver(self):
+        """Stops the running solver, the shell, mpiexec and all processes
+        started by them are terminated. A run waiting for free cores is
+        removed from the job queue.
+
+        Return:
+        -------
+        bool
+            False if no solver is running
+        """
+        if not self.isRunning():
+            return False
+        print('stopping')
+        sys.stdout.flush()
+        return self._ewh.jobQueue.cancel(self.job.ID)
+
+    def _jobStarted(self, ID):
+        if ID != self._jobID:
+            return
+        job = self._ewh.jobQueue.job(ID)
+        self.pipeline = job.pipeline
+        self.workspace = job.workspace
+        self.sampler = job.sampler
+        self.watchdog = job.watchdog
+        if self.watchdog is not None:
+            self.watchdog.triggered.connect(self._watchdogTriggered)
+        self.pipeline.output.connect(sys.stdout.write)
+        self.pipeline.stageStarted.connect(self._stageStarted)
+
+    def _stageStarted(self, name):
+        print('{}: {}'.format(name, self.pipeline.stage(name).command))
+        sys.stdout.flush()
+
+    def _watchdogTriggered(self, reason):
+        print('Watchdog: {}{}'.format(reason, ', stopping' if self.watchdog.abort else ''))
+        sys.stdout.flush()
+
+    def _jobFinished(self, ID, state):
+        if ID != self._jobID:
+            return
+        queue = self._ewh.jobQueue
+        queue.jobStarted.disconnect(self._jobStarted)
+        queue.jobFinished.disconnect(self._jobFinished)
+        job = queue.job(ID)
+        sys.stdout.flush()
+        if self.pipeline is not None:
+            for name, stageState, duration, attempts in self.pipeline.timing():
+                print('{}: {} after {:.1f} s, {} attempt(s)'.format(name, stageState, duration, attempts))
+            if self.pipeline.cached:
+                print('Results restored from the result cache')
+        print('Done' if job.state == jobqueue.DONE else 'Failed' if job.state == jobqueue.FAILED else 'Cancelled')
+        if job.message:
+            print(job.message)
+        # analyzed and recorded in the run history by the queue
+        self.summary = job.summary
+        if self.summary is not None:
+            print(loganalyzer.report(self.summary))
+        sys.stdout.flush()
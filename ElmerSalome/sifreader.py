@@ -17,6 +17,8 @@ except ImportError:
 import collections
 import re
 
+import solverparameters
+
 class SifReader():
     """SifReader"""
 
@@ -32,6 +34,7 @@ class SifReader():
         self._ewh = ewh
         self._solvIds = {}
         self._sifIds = {}
+        self._entityIds = {}  # by section the IDs of the entities by sif number
         self.errormsg = ''
 
     def readSif(self, path):
@@ -110,8 +113,9 @@ class SifReader():
         # also creates the default solvers
         self._ewh.showAddEquation(visible=False)
         # get all solvers by name and index
-        for idx, element in enumerate(self._ewh.solverParameterEditor):
-            self._solvIds.update({element.solverName: idx})
+        for idx, element in enumerate(self._ewh.solverSettings):
+            if element is not None:
+                self._solvIds.update({element.solverName: idx})
         #print('solvers sorted')
 
         # apply settings
@@ -159,40 +163,97 @@ class SifReader():
             for block in boundaries:
                 lines = block.split('\n')
                 target = lines[1].split('=')[1].strip()
-                editor = self._ewh.showBoundaryPropertyDefinition(target, visible=False)
-                editor.boundaryConditionCombo.setCurrentIndex(editor.boundaryConditionCombo.findText(target[1:-1]))
-                self._ewh.elementProperties.update({target[1:-1]: editor})
+                condition = self._ewh.boundaryConditionEditor.model.find(target[1:-1])
+                self._ewh.elementProperties.setBoundary(target[1:-1], condition)
         except:
             self.errormsg = "Possible mismatch in number of boundaries in sif-file and number of boundary faces in study"
             raise
 
-    def _changeSettings(self, parameter, value):
-        """Change settings of hashed parameter in element.
+    def _changeSettings(self, settings, name, value):
+        """Change a setting of a solver.
 
         Args:
         -----
-        parameter: obj
-            obj of the parameter (e. g. the corresponding widget)
+        settings: SolverSettings-class
+            record of the solver settings
+        name: str
+            objectName of the setting in the SolverParameterEditor
         value: str
             new value of the parameter
         """
 
-        if isinstance(parameter, QtGui.QLineEdit):
-            parameter.setText(value.replace('"', ''))
-        elif isinstance(parameter, QtGui.QTextEdit):
-            sifValue = parameter.toPlainText()
+        qtype = settings.valueType(name)
+        if qtype == 'Edit':
+            settings.setValue(name, value.replace('"', ''))
+        elif qtype == 'TextEdit':
+            sifValue = settings.value(name)
             if sifValue == '':
                 sifValue = value.replace('"', '')
             else:
                 sifValue = sifValue + '\n' + value.replace('"', '')
-            parameter.setText(sifValue)
-        elif isinstance(parameter, QtGui.QComboBox):
-            idx = parameter.findText(value)
-            parameter.setCurrentIndex(idx)
-        elif isinstance(parameter, QtGui.QCheckBox):
-            parameter.setChecked(value == 'True')
+            settings.setValue(name, sifValue)
+        elif qtype == 'Combo':
+            settings.setValue(name, value)
+        elif qtype == 'CheckBox':
+            settings.setValue(name, value == 'True')
         #print('changeSettings success')
 
+    def _changeValue(self, store, ID, pid, value):
+        """Change the value of a parameter in the value store.
+
+        Args:
+        -----
+        store: SectionStore-class
+            store containing the parameter
+        ID: int
+            ID of the editor
+        pid: int
+            parameter-ID of the parameter
+        value: str
+            new value of the parameter
+        """
+        widgetType = store.params[pid].widget_type
+        if widgetType == 'Edit':
+            store.setValue(ID, pid, value.replace('"', ''))
+        elif widgetType == 'TextEdit':
+            sifValue = store.value(ID, pid)
+            if sifValue == '':
+                sifValue = value.replace('"', '')
+            else:
+                sifValue = sifValue + '\n' + value.replace('"', '')
+            store.setValue(ID, pid, sifValue)
+        elif widgetType == 'Combo':
+            if value in store.params[pid].items:
+                store.setValue(ID, pid, value)
+            else:
+                store.setValue(ID, pid, '')
+        elif widgetType == 'CheckBox':
+            store.setValue(ID, pid, value == 'True')
+
+    def _setParameter(self, store, ID, parameter, setting):
+        """Change all parameters of an editor that are written as parameter
+        to the sif-file, unknown parameters are added to the free text.
+
+        Args:
+        -----
+        store: SectionStore-class
+            store containing the parameters of the editor
+        ID: int
+            ID of the editor
+        parameter: str
+            sif name of the parameter
+        setting: str
+            new value of the parameter
+        """
+        pids = store.sifIndex.get(parameter, [])
+        for pid in pids:
+            self._changeValue(store, ID, pid, setting)
+        if not pids:
+            for key, pid in store.index.items():
+                if 'Free text' in key and 'input' not in key:
+                    self._changeValue(store, ID, pid, ' = '.join(['  {}'.format(parameter), setting]))
+                    break
+
     def _bproperties(self, block):
         """Change settings for a new body properties
 
@@ -207,19 +268,63 @@ class SifReader():
         data = [x for x in data if x != ""]
         target = data[1].split('=')[1].strip()
 
-        # create new window
-        editor = self._ewh.showBodyPropertyDefinition(target, visible=False)
+        equation = material = force = initial = None
         for segment in data[1:]:
             name, idx = segment.split('=')
             if 'Equation' in name:
-                editor.equationCombo.setCurrentIndex(int(idx.strip()))
+                equation = self._referenced(self._ewh.equationEditor, idx)
             elif 'Material' in name:
-                editor.materialCombo.setCurrentIndex(int(idx.strip()))
+                material = self._referenced(self._ewh.materialEditor, idx)
             elif 'orce' in name:
-                editor.bodyForceCombo.setCurrentIndex(int(idx.strip()))
+                force = self._referenced(self._ewh.bodyForceEditor, idx)
             elif 'Initial' in name:
-                editor.initialConditionCombo.setCurrentIndex(int(idx.strip()))
-        self._ewh.elementProperties.update({target[1:-1]: editor})
+                initial = self._referenced(self._ewh.initialConditionEditor, idx)
+        self._ewh.elementProperties.setBody(target[1:-1], equation, material, force, initial)
+
+    def _referenced(self, registry, idx):
+        """Returns the ID of the entity of a section a body refers to by its
+        number in the sif-file, None if there is none"""
+        sifID = int(idx.strip())
+        ID = self._entityIds.get(registry.section, {}).get(sifID)
+        if ID is None and 0 < sifID <= len(registry):
+            ID = registry[sifID - 1]
+        return ID
+
+    def _entity(self, registry, sifID, show, slot):
+        """Returns the ID of the entity of a section with the given number in
+        the sif-file. An entity that does not exist yet is created.
+
+        Args:
+        -----
+        registry: EntityRegistry-class
+            registry of the section
+        sifID: int
+            number of the entity in the sif-file
+        show: method
+            shows the window of the section, creates the first entity, None
+            if the window exists already
+        slot: method
+            slot of the button events of the editor of the section
+
+        Return:
+        -------
+        int
+            ID of the entity
+        """
+        ids = self._entityIds.setdefault(registry.section, {})
+        ID = ids.get(sifID)
+        if ID is None:
+            if sifID <= len(registry):
+                # entities existing before the sif-file was read
+                ID = registry[sifID - 1]
+            else:
+                ID = registry.nextID()
+                if show is not None and len(registry) == 0:
+                    show(visible=False)
+                else:
+                    slot(3, ID)
+            ids.update({sifID: ID})
+        return ID
 
     def _bcondition(self, block):
         """Change settings for a new boundary condition
@@ -235,34 +340,24 @@ class SifReader():
         data = [x for x in data if x != ""]
 
         # create boundary condition set
-        count = len(self._ewh.boundaryConditionEditor)
-        if count == 0:
+        registry = self._ewh.boundaryConditionEditor
+        ID = registry.nextID()
+        if len(registry) == 0:
             self._ewh.showAddBoundaryCondition(visible=False)
         else:
-            self._ewh.boundaryConditionEditorFinishedSlot(3, count)
-        bc = self._ewh.boundaryConditionEditor[-1]
+            self._ewh.boundaryConditionEditorFinishedSlot(3, ID)
 
         # set name
         name = data.pop(0).split('=')[1].strip()
-        bc.nameEdit.setText(name.replace('"', ''))
+        registry.setName(ID, name.replace('"', ''))
 
         # set boundary condition data
         while data:
             parameter, setting = data.pop(0).split('=')
             parameter = parameter.strip()
             setting = setting.strip()
-            freeText = True
-            for key, value in bc.qhash.items():
-                sifName = str(value.elem.firstChildElement('SifName').text()).strip()
-                if sifName == '':
-                    sifName = str(value.elem.firstChildElement('Name').text()).strip()
-                if sifName == parameter:
-                    self._changeSettings(value.widget, setting)
-                    freeText = False
-            if freeText:
-                value = bc.qhash['/General/BoundaryCondition/Free text/{}'.format(count)]
-                self._changeSettings(value.widget, ' = '.join(['  {}'.format(parameter), setting]))
-        bc.applyButton.click()
+            self._setParameter(registry.store, ID, parameter, setting)
+        registry.refresh(ID)
 
     def _icondition(self, block):
         """Change settings for a new initial condition
@@ -279,37 +374,20 @@ class SifReader():
 
         # get initial condition set
         sifID = int(data.pop(0).split(' ')[2])
-        if len(self._ewh.initialConditionEditor) < sifID:
-            if sifID == 1:
-                self._ewh.showAddInitialCondition(visible=False)
-            else:
-                self._ewh.initialConditionEditorFinishedSlot(3, sifID - 1)
-        ic = self._ewh.initialConditionEditor[sifID - 1]
+        registry = self._ewh.initialConditionEditor
+        ID = self._entity(registry, sifID, self._ewh.showAddInitialCondition, self._ewh.initialConditionEditorFinishedSlot)
 
         # set name
         name = data.pop(0).split('=')[1].strip()
-        ic.nameEdit.setText(name.replace('"', ''))
+        registry.setName(ID, name.replace('"', ''))
 
         # set initial condition data
         while data:
             parameter, setting = data.pop(0).split('=')
             parameter = parameter.strip()
             setting = setting.strip()
-            freeText = True
-            for key, value in ic.qhash.items():
-                sifName = str(value.elem.firstChildElement('SifName').text()).strip()
-                if sifName == '':
-                    sifName = str(value.elem.firstChildElement('Name').text()).strip()
-                if sifName == parameter:
-                    self._changeSettings(value.widget, setting)
-                    freeText = False
-            if freeText:
-                for key in ic.qhash.keys():
-                    if 'Free text' in key and 'input' not in key:
-                        value = ic.qhash[key]
-                        self._changeSettings(value.widget, ' = '.join(['  {}'.format(parameter), setting]))
-                        break
-        ic.applyButton.click()
+            self._setParameter(registry.store, ID, parameter, setting)
+        registry.refresh(ID)
 
     def _bforces(self, block):
         """Change settings for a new body force
@@ -327,37 +405,20 @@ class SifReader():
 
         # get body force set
         sifID = int(data.pop(0).split(' ')[2])
-        if len(self._ewh.bodyForceEditor) < sifID:
-            if sifID == 1:
-                self._ewh.showAddBodyForce(visible=False)
-            else:
-                self._ewh.bodyForceEditorFinishedSlot(3, sifID - 1)
-        bf = self._ewh.bodyForceEditor[sifID - 1]
+        registry = self._ewh.bodyForceEditor
+        ID = self._entity(registry, sifID, self._ewh.showAddBodyForce, self._ewh.bodyForceEditorFinishedSlot)
 
         # set name
         name = data.pop(0).split('=')[1].strip()
-        bf.nameEdit.setText(name.replace('"', ''))
+        registry.setName(ID, name.replace('"', ''))
 
         # set body force data
         while data:
             parameter, setting = data.pop(0).split('=')
             parameter = parameter.strip()
             setting = setting.strip()
-            freeText = True
-            for key, value in bf.qhash.items():
-                sifName = str(value.elem.firstChildElement('SifName').text()).strip()
-                if sifName == '':
-                    sifName = str(value.elem.firstChildElement('Name').text()).strip()
-                if sifName == parameter:
-                    self._changeSettings(value.widget, setting)
-                    freeText = False
-            if freeText:
-                for key in bf.qhash.keys():
-                    if 'Free text' in key and 'input' not in key:
-                        value = bf.qhash[key]
-                        self._changeSettings(value.widget, ' = '.join(['  {}'.format(parameter), setting]))
-                        break
-        bf.applyButton.click()
+            self._setParameter(registry.store, ID, parameter, setting)
+        registry.refresh(ID)
 
     def _materials(self, block):
         """Change settings for a new material
@@ -375,37 +436,20 @@ class SifReader():
 
         # get equation set
         sifID = int(data.pop(0).split(' ')[1])
-        if len(self._ewh.materialEditor) < sifID:
-            if sifID == 1:
-                self._ewh.showAddMaterial(visible=False)
-            else:
-                self._ewh.matEditorFinishedSlot(3, sifID - 1)
-        mat = self._ewh.materialEditor[sifID - 1]
+        registry = self._ewh.materialEditor
+        ID = self._entity(registry, sifID, self._ewh.showAddMaterial, self._ewh.matEditorFinishedSlot)
 
         # set name
         name = data.pop(0).split('=')[1].strip()
-        mat.nameEdit.setText(name.replace('"', ''))
+        registry.setName(ID, name.replace('"', ''))
 
         # set material data
         while data:
             parameter, setting = data.pop(0).split('=')
             parameter = parameter.strip()
             setting = setting.strip()
-            freeText = True
-            for key, value in mat.qhash.items():
-                sifName = str(value.elem.firstChildElement('SifName').text()).strip()
-                if sifName == '':
-                    sifName = str(value.elem.firstChildElement('Name').text()).strip()
-                if sifName == parameter:
-                    self._changeSettings(value.widget, setting)
-                    freeText = False
-            if freeText:
-                for key in mat.qhash.keys():
-                    if 'Free text' in key and 'input' not in key:
-                        value = mat.qhash[key]
-                        self._changeSettings(value.widget, ' = '.join(['  {}'.format(parameter), setting]))
-                        break
-        mat.applyButton.click()
+            self._setParameter(registry.store, ID, parameter, setting)
+        registry.refresh(ID)
 
     def _equation(self, block):
         """Change settings of the equation
@@ -423,13 +467,12 @@ class SifReader():
 
         # get equation set
         sifID = int(data.pop(0).split(' ')[1])
-        if len(self._ewh.equationEditor) < sifID:
-            self._ewh.pdeEditorFinishedSlot(3, sifID - 1)
-        eq = self._ewh.equationEditor[sifID - 1]
+        registry = self._ewh.equationEditor
+        ID = self._entity(registry, sifID, None, self._ewh.pdeEditorFinishedSlot)
 
         # set name
         name = data.pop(0).split('=')[1].strip()
-        eq.nameEdit.setText(name.replace('"', ''))
+        registry.setName(ID, name.replace('"', ''))
 
         # set active solver
         while data:
@@ -440,24 +483,11 @@ class SifReader():
                 setting = setting.split(' ')
                 for key in setting:
                     name = self._sifIds[key]
-                    key = '/' + name + '/Equation/Active/' + str(eq.ID)
-                    eq.qhash[key].widget.setChecked(True)
+                    key = '/' + name + '/Equation/Active'
+                    registry.store.setValueOf(ID, key, True)
                 break
-            freeText = True
-            for key, value in eq.qhash.items():
-                sifName = str(value.elem.firstChildElement('SifName').text()).strip()
-                if sifName == '':
-                    sifName = str(value.elem.firstChildElement('Name').text()).strip()
-                if sifName == parameter:
-                    self._changeSettings(value.widget, setting)
-                    freeText = False
-            if freeText:
-                for key in eq.qhash.keys():
-                    if 'Free text' in key and 'input' not in key:
-                        value = eq.qhash[key]
-                        self._changeSettings(value.widget, ' = '.join(['  {}'.format(parameter), setting]))
-                        break
-        eq.applyButton.click()
+            self._setParameter(registry.store, ID, parameter, setting)
+        registry.refresh(ID)
 
     def _solvers(self, block):
         """Change settings of the solver.
@@ -479,7 +509,7 @@ class SifReader():
 
         # get the solver from the solver collection
         idx = self._solvIds[name]
-        element = self._ewh.solverParameterEditor[idx]
+        element = self._ewh.solverSettings[idx]
 
         # general options
         while data:
@@ -488,104 +518,58 @@ class SifReader():
             value = value.strip()
             if 'Exec' in key:
                 if value == 'Always':
-                    element.execAlways.setChecked(True)
+                    element.setValue('execAlways', True)
                 if value == 'Before Simulation':
-                    element.execBeforeSimulation.setChecked(True)
+                    element.setValue('execBeforeSimulation', True)
                 if value == 'After Simulation':
-                    element.execAfterSimulation.setChecked(True)
+                    element.setValue('execAfterSimulation', True)
                 if value == 'Before Timestep':
-                    element.execBeforeTimestep.setChecked(True)
+                    element.setValue('execBeforeTimestep', True)
                 if value == 'After Timestep':
-                    element.execAfterTimestep.setChecked(True)
+                    element.setValue('execAfterTimestep', True)
                 if value == 'Never':
-                    element.execNever.setChecked(True)
+                    element.setValue('execNever', True)
                 break
-            key = '/{}/Solver/{}/{}'.format(name, key, idx)
-            parameter = element.generalOptions.qhash[key]
-            self._changeSettings(parameter.widget, value)
+            key = '/{}/Solver/{}'.format(name, key)
+            store = self._ewh.getStore('Solver')
+            self._changeValue(store, idx, store.index[key], value)
+        if element.editor is not None:
+            element.editor.generalOptions.refresh()
 
         if len(data) == 0:
             return
 
-        keys = {'Stabilize': element.stabilizeCheck,
-                'Bubbles': element.bubblesCheck,
-                'Lumped Mass Matrix': element.lumpedMassCheck,
-                'Optimize Bandwidth': element.optimizeBandwidthCheck,
-                'Steady State Convergence Tolerance': element.steadyStateConvergenceToleranceEdit,
-                'Steady State Convergence Measure': element.steadyStateConvergenceMeasureCombo,
-                'Nonlinear System Convergence Tolerance': element.nonlinSystemConvergenceToleranceEdit,
-                'Nonlinear System Max Iterations': element.nonlinSystemMaxIterationEdit,
-                'Nonlinear System Relaxation Factor': element.nonlinSystemRelaxationFactorEdit,
-                'Nonlinear System Convergence Measure': element.nonlinSystemConvergenceMeasureCombo,
-                'Nonlinear System Newton After Iterations': element.nonlinSystemNewtonAfterIterEdit,
-                'Nonlinear System Newton After Tolerance': element.nonlinSystemNewtonAfterTolEdit,
-                'Linear System Direct Method': element.linearSystemDirectMethod,
-                'Linear System Iterative Method': element.linearSystemIterativeMethod,
-                'Linear System Max Iterations': element.linearSystemMaxIterationsEdit,
-                'Linear System Convergence Tolerance': element.linearSystemConvergenceToleranceEdit,
-                'BiCGstabl polynomial degree': element.linearSystemBiCGstablPolDeg,
-                'Linear System Preconditioning': element.linearSystemPreconditioning,
-                'Linear System ILUT Tolerance': element.linearSystemILUTToleranceEdit,
-                'Linear System Abort Not Converged': element.linearSystemAbortWhenNotConvergedCheck,
-                'Linear System Residual Output': element.linearSystemResidualOutputEdit,
-                'Linear System Precondition Recompute': element.linearSystemPreconditionRecomputeEdit,
-                'ParaSails Threshold': element.thresholdEdit,
-                'ParaSails Filter': element.filterEdit,
-                'ParaSails MaxLevel': element.maxLevelEdit,
-                'ParaSails Symmetry': element.symmetryEdit,
-                'BoomerAMG Relax Type': element.boomerRelaxation,
-                'BoomerAMG Coarsen Type': element.boomerCoarsening,
-                'BoomerAMG Num Sweeps': element.boomerSweeps,
-                'BoomerAMG Max Levels': element.boomerMaxLevels,
-                'BoomerAMG Interpolation': element.boomerInterpolation,
-                'BoomerAMG Smooth Type': element.boomerSmoother,
-                'BoomerAMG Cycle Type': element.boomerCycle,
-                'Adaptive Mesh Refinement': element.adaptiveMeshRefinementCheck,
-                'Adaptive Mesh Name': element.adaptiveMeshNameEdit,
-                'Adaptive Remesh': element.adaptiveRemeshCheck,
-                'Adaptive Save Mesh': element.adaptiveSaveMeshCheck,
-                'Adaptive Coarsening': element.adaptiveCoarseningCheck,
-                'Adaptive Error Limit': element.adaptiveErrorLimitEdit,
-                'Adaptive Min H': element.adaptiveMinHEdit,
-                'Adaptive Max H': element.adaptiveMaxHEdit,
-                'Adaptive Max Change': element.adaptiveMaxChangeEdit,
-                'MG Levels' : element.mgLevelsEdit,
-                'MG Mesh name' : element.mgMeshNameEdit,
-                'MG Post smoothing iterations' : element.mgPostSmoothingItersEdit,
-                'MG Pre smoothing iterations' : element.mgPreSmoothingItersEdit,
-                'MG Max Iterations' : element.mgMaxItersEdit,
-                'MG ILUT Tolerance' : element.mgILUTEdit,
-                'MG Equal Split' : element.mgEqualSplitCheck}
+        keys = solverparameters.SIF_KEYWORDS
 
         while data:
             key, value = data.pop(0).split('=')
             key = key.strip()
             value = value.strip()
             if key == 'Linear System Solver' and value == 'Direct':
-                element.linearSystemSolverDirect.setChecked(True)
+                element.setValue('linearSystemSolverDirect', True)
                 continue
             if key == 'Linear System Solver' and value == 'Iterative':
-                element.linearSystemSolverIterative.setChecked(True)
+                element.setValue('linearSystemSolverIterative', True)
                 continue
-            if key == 'Linear System Solver' and value == 'MultiGrid':
-                element.linearSystemSolverMultigrid.setChecked(True)
+            if key == 'Linear System Solver' and value == 'Multigrid':
+                element.setValue('linearSystemSolverMultigrid', True)
                 continue
             if key == 'Linear System Use HYPRE' and value == 'True':
-                element.useHypre.setChecked(True)
+                element.setValue('useHypre', True)
                 continue
             if key == 'Linear System Preconditioning' and value == 'ParaSails':
-                element.useParasails.setChecked(True)
+                element.setValue('useParasails', True)
                 continue
             if key == 'Linear System Preconditioning' and value == 'BoomerAMG':
-                element.useBoomerAMG.setChecked(True)
+                element.setValue('useBoomerAMG', True)
                 continue
             if key == 'Adaptive Mesh Refinement':
-                element.adaptiveMeshRefinement.setChecked(True)
+                element.setValue('adaptiveMeshRefinementCheck', True)
                 continue
             try:
-                self._changeSettings(keys[key], value)
+                self._changeSettings(element, keys[key], value)
             except:
-                self.errormsg = "Error while reading {}".foramt(key)
+                self.errormsg = "Error while reading {}".format(key)
                 raise
 
     def _general(self, block):
@@ -41,29 +41,45 @@ class SifWriter():
         else:
             self._writeToSif(key + 'False')
 
-    def _makeSifEntry(self, parameter):
-        sifName = str(parameter.elem.firstChildElement('SifName').text()).strip()
-        if sifName == '':
-            sifName = str(parameter.elem.firstChildElement('Name').text()).strip()
+    def _numbers(self, store):
+        """Returns the numbers of the entities in the sif-file.
+
+        Args:
+        -----
+        store: SectionStore-class
+            value store of the section
+
+        Return:
+        -------
+        dict
+            sif number by entity ID, numbering in order of creation
+        """
+        numbers = {}
+        for number, ID in enumerate(store.entities()):
+            numbers.update({ID: number + 1})
+        return numbers
+
+    def _makeSifEntry(self, parameter, value):
+        sifName = parameter.sifName
         if sifName == 'Active':
             return
         sifName = '  ' + sifName + ' = '
-        widgetType = parameter.elem.attribute('Widget', 'Edit')
+        widgetType = parameter.widget_type
         if widgetType == 'Edit':
-            sifValue = str(parameter.widget.text()).strip()
+            sifValue = str(value).strip()
             if 'Prandtl' in sifName: # elmer bug
                 return
             self._addSifLine(sifName, sifValue)
         elif widgetType == 'TextEdit':
-            sifValue = parameter.widget.toPlainText()
+            sifValue = value
             self._addSifLine('', sifValue)
         elif widgetType == 'Combo':
-            sifValue = str(parameter.widget.currentText()).strip()
+            sifValue = str(value).strip()
             if sifValue != 'None':
                 self._addSifLine(sifName, sifValue)
         elif widgetType == 'CheckBox':
-            defaultValue = str(parameter.elem.firstChildElement('DefaultValue').text()).strip() == 'True'
-            sifValue = parameter.widget.isChecked()
+            defaultValue = parameter.default == 'True'
+            sifValue = value
             if sifValue != defaultValue:
                 self._addSifLineBool(sifName, sifValue)
         elif widgetType == 'Label':
@@ -129,39 +145,39 @@ class SifWriter():
         self._writeToSif('')
 
         # makeBodyBlocks()
+        # sif numbers of the entities by ID
+        equationNumbers = self._numbers(self._ewh.getStore('Equation'))
+        materialNumbers = self._numbers(self._ewh.getStore('Material'))
+        forceNumbers = self._numbers(self._ewh.getStore('BodyForce'))
+        initialNumbers = self._numbers(self._ewh.getStore('InitialCondition'))
         count = 0
-        for objName in self._ewh.elementProperties:
-            properties = self._ewh.elementProperties[objName]
-            if properties.objectName() == 'bodyPropertyDialog':
-                count += 1
-                self._writeToSif('Body ' + str(count))
-                self._writeToSif('  ! Target Bodies(1) = TODO')
-                self._writeToSif('  Name = "' + objName + '"')
-                ind = int(properties.equationCombo.currentIndex())
-                if ind > 0:
-                    self._addSifLine('  Equation = ', str(ind))
-                ind = int(properties.materialCombo.currentIndex())
-                if ind > 0:
-                    self._addSifLine('  Material = ', str(ind))
-                ind = int(properties.bodyForceCombo.currentIndex())
-                if ind > 0:
-                    self._addSifLine('  Body Force = ', str(ind))
-                ind = int(properties.initialConditionCombo.currentIndex())
-                if ind > 0:
-                    self._addSifLine('  Initial Condition = ', str(ind))
-                # use names instead of numbers
-                #_addSifLine('  Equation = ', '"'+str(properties.equation).strip()+'"')
-                #_addSifLine('  Material = ', '"'+str(properties.material).strip()+'"')
-                #_addSifLine('  Body Force = ', '"'+str(properties.force).strip()+'"')
-                #_addSifLine('  Initial Condition = ', '"'+str(properties.initial).strip()+'"')
-                self._writeToSif('End')
-                self._writeToSif('')
+        for objName, properties in self._ewh.elementProperties.bodies():
+            equation, material, force, initial = properties
+            count += 1
+            self._writeToSif('Body ' + str(count))
+            self._writeToSif('  ! Target Bodies(1) = TODO')
+            self._writeToSif('  Name = "' + objName + '"')
+            if equation in equationNumbers:
+                self._addSifLine('  Equation = ', str(equationNumbers[equation]))
+            if material in materialNumbers:
+                self._addSifLine('  Material = ', str(materialNumbers[material]))
+            if force in forceNumbers:
+                self._addSifLine('  Body Force = ', str(forceNumbers[force]))
+            if initial in initialNumbers:
+                self._addSifLine('  Initial Condition = ', str(initialNumbers[initial]))
+            self._writeToSif('End')
+            self._writeToSif('')
+
+        equations = self._ewh.getStore('Equation')
+        solvers = self._ewh.getStore('Solver')
 
         # makeSolverBlocks
         i_solver = -1
         count_solver = 0
         SolverList = []
-        for i_solver, element in enumerate(self._ewh.solverParameterEditor):
+        for i_solver, element in enumerate(self._ewh.solverSettings):
+            if element is None:
+                continue
             newSolver = SolverListItem()
             newSolver.Name = str(element.solverName)
             # Remark: why do we need to initialize here (see class definition for SolverListItem)?
@@ -170,11 +186,11 @@ class SifWriter():
             newSolver.Number = 0
 
             # find active solvers: loop over equations
-            for eq in self._ewh.equationEditor:
-                key = '/' + newSolver.Name + '/Equation/Active/' + str(eq.ID)
-                if eq.qhash[key].widget.isChecked():
-                    newSolver.Equations.append(eq.ID+1) # Equation numbering starts with 1 in sif!
-                    prio = str(eq.qhash['/' + newSolver.Name + '/Equation/Priority/' + str(eq.ID)].widget.text()).strip()
+            for eqID in equations.entities():
+                key = '/' + newSolver.Name + '/Equation/Active'
+                if equations.valueOf(eqID, key):
+                    newSolver.Equations.append(equationNumbers[eqID]) # Equation numbering starts with 1 in sif!
+                    prio = str(equations.valueOf(eqID, '/' + newSolver.Name + '/Equation/Priority', '')).strip()
                     if prio != '':
                         prio_i = int(prio)
                     else:
@@ -189,120 +205,121 @@ class SifWriter():
                 SolverList.append(newSolver)
                 self._writeToSif('Solver ' + str(count_solver))
                 self._writeToSif('  Equation = ' + element.solverName)
-                self._addSifLine('  Procedure = ', str(element.generalOptions.qhash[str('/'+element.solverName+'/Solver/Procedure/'+str(i_solver))].widget.text()).strip())
-                key = str('/'+element.solverName+'/Solver/Variable/'+str(i_solver))
-                if key in element.generalOptions.qhash:
-                    self._addSifLine('  Variable = ', str(element.generalOptions.qhash[key].widget.text()).strip())
-                for key in element.generalOptions.qhash.keys():
-                    value = element.generalOptions.qhash[key]
+                self._addSifLine('  Procedure = ', str(solvers.valueOf(i_solver, '/'+element.solverName+'/Solver/Procedure')).strip())
+                key = str('/'+element.solverName+'/Solver/Variable')
+                if key in solvers.index:
+                    self._addSifLine('  Variable = ', str(solvers.valueOf(i_solver, key)).strip())
+                for parameter, value in solvers.values(i_solver):
+                    key = parameter.path
                     if (str(element.solverName + '/Solver') in key) and not(any(s in key for s in ['Variable','Procedure'])):
-                        self._makeSifEntry(value)
+                        self._makeSifEntry(parameter, value)
 
                 # General
                 val = ''
-                if element.execAlways.isChecked():
+                if element.isChecked('execAlways'):
                     val = 'Always'
-                if element.execBeforeSimulation.isChecked():
+                if element.isChecked('execBeforeSimulation'):
                     val = 'Before Simulation'
-                if element.execAfterSimulation.isChecked():
+                if element.isChecked('execAfterSimulation'):
                     val = 'After Simulation'
-                if element.execBeforeTimestep.isChecked():
+                if element.isChecked('execBeforeTimestep'):
                     val = 'Before Timestep'
-                if element.execAfterTimestep.isChecked():
+                if element.isChecked('execAfterTimestep'):
                     val = 'After Timestep'
-                if element.execNever.isChecked():
+                if element.isChecked('execNever'):
                     val = 'Never'
                 self._addSifLine('  Exec Solver = ', str(val).strip())
 
                 hasMatrix = True
-                key = str('/'+element.solverName+'/Solver/No Matrix Equation/'+str(i_solver))
-                if key in element.generalOptions.qhash:
-                    value = element.generalOptions.qhash[key]
-                    if (value.elem.attribute('Widget', 'Edit') == 'CheckBox') and value.widget.isChecked():
+                key = str('/'+element.solverName+'/Solver/No Matrix Equation')
+                if key in solvers.index:
+                    parameter = solvers.params[solvers.index[key]]
+                    if (parameter.widget_type == 'CheckBox') and solvers.valueOf(i_solver, key):
                         hasMatrix = False
 
                 if hasMatrix:
-                    self. _addSifLineBool('  Stabilize = ', element.stabilizeCheck.isChecked())
-                    self. _addSifLineBool('  Bubbles = ', element.bubblesCheck.isChecked())
-                    self. _addSifLineBool('  Lumped Mass Matrix = ', element.lumpedMassCheck.isChecked())
-                    self. _addSifLineBool('  Optimize Bandwidth = ', element.optimizeBandwidthCheck.isChecked())
+                    self. _addSifLineBool('  Stabilize = ', element.isChecked('stabilizeCheck'))
+                    self. _addSifLineBool('  Bubbles = ', element.isChecked('bubblesCheck'))
+                    self. _addSifLineBool('  Lumped Mass Matrix = ', element.isChecked('lumpedMassCheck'))
+                    self. _addSifLineBool('  Optimize Bandwidth = ', element.isChecked('optimizeBandwidthCheck'))
 
                     # Steady State
-                    self. _addSifLine('  Steady State Convergence Tolerance = ', str(element.steadyStateConvergenceToleranceEdit.text()).strip())
-                    if str(element.steadyStateConvergenceMeasureCombo.currentText()).strip() != "Norm":
-                        self._addSifLine('  Steady State Convergence Measure = ', str(element.steadyStateConvergenceMeasureCombo.currentText()).strip())
+                    self. _addSifLine('  Steady State Convergence Tolerance = ', element.text('steadyStateConvergenceToleranceEdit'))
+                    if element.text('steadyStateConvergenceMeasureCombo') != "Norm":
+                        self._addSifLine('  Steady State Convergence Measure = ', element.text('steadyStateConvergenceMeasureCombo'))
 
                     # Nonlinear System
-                    self._addSifLine('  Nonlinear System Convergence Tolerance = ', str(element.nonlinSystemConvergenceToleranceEdit.text()).strip())
-                    self._addSifLine('  Nonlinear System Max Iterations = ', str(element.nonlinSystemMaxIterationEdit.text()).strip())
-                    self._addSifLine('  Nonlinear System Relaxation Factor = ', str(element.nonlinSystemRelaxationFactorEdit.text()).strip())
-                    if str(element.nonlinSystemConvergenceMeasureCombo.currentText()).strip() != "Norm":
-                        self._addSifLine('  Nonlinear System Convergence Measure = ', str(element.nonlinSystemConvergenceMeasureCombo.currentText()).strip())
-                    self._addSifLine('  Nonlinear System Newton After Iterations = ', str(element.nonlinSystemNewtonAfterIterEdit.text()).strip())
-                    self._addSifLine('  Nonlinear System Newton After Tolerance = ', str(element.nonlinSystemNewtonAfterTolEdit.text()).strip())
+                    self._addSifLine('  Nonlinear System Convergence Tolerance = ', element.text('nonlinSystemConvergenceToleranceEdit'))
+                    self._addSifLine('  Nonlinear System Max Iterations = ', element.text('nonlinSystemMaxIterationEdit'))
+                    self._addSifLine('  Nonlinear System Relaxation Factor = ', element.text('nonlinSystemRelaxationFactorEdit'))
+                    if element.text('nonlinSystemConvergenceMeasureCombo') != "Norm":
+                        self._addSifLine('  Nonlinear System Convergence Measure = ', element.text('nonlinSystemConvergenceMeasureCombo'))
+                    self._addSifLine('  Nonlinear System Newton After Iterations = ', element.text('nonlinSystemNewtonAfterIterEdit'))
+                    self._addSifLine('  Nonlinear System Newton After Tolerance = ', element.text('nonlinSystemNewtonAfterTolEdit'))
 
                     # Linear System
-                    if element.linearSystemSolverDirect.isChecked():
+                    precond = ''
+                    if element.isChecked('linearSystemSolverDirect'):
                         self._addSifLine('  Linear System Solver = ', 'Direct')
-                        self._addSifLine("  Linear System Direct Method = ", str(element.linearSystemDirectMethod.currentText()).strip())
-                    elif element.linearSystemSolverIterative.isChecked():
+                        self._addSifLine("  Linear System Direct Method = ", element.text('linearSystemDirectMethod'))
+                    elif element.isChecked('linearSystemSolverIterative'):
                         self._addSifLine('  Linear System Solver = ', 'Iterative');
-                        self._addSifLine('  Linear System Iterative Method = ', str(element.linearSystemIterativeMethod.currentText()).strip())
-                        self._addSifLine('  Linear System Max Iterations = ', str(element.linearSystemMaxIterationsEdit.text()).strip())
-                        self._addSifLine('  Linear System Convergence Tolerance = ', str(element.linearSystemConvergenceToleranceEdit.text()).strip())
-                        self._addSifLine('  BiCGstabl polynomial degree = ', str(element.linearSystemBiCGstablPolDeg.text()).strip())
-                        if not (element.useHypre.isChecked()):
-                            precond = str(element.linearSystemPreconditioning.currentText()).strip()
+                        self._addSifLine('  Linear System Iterative Method = ', element.text('linearSystemIterativeMethod'))
+                        self._addSifLine('  Linear System Max Iterations = ', element.text('linearSystemMaxIterationsEdit'))
+                        self._addSifLine('  Linear System Convergence Tolerance = ', element.text('linearSystemConvergenceToleranceEdit'))
+                        self._addSifLine('  BiCGstabl polynomial degree = ', element.text('linearSystemBiCGstablPolDeg'))
+                        if not (element.isChecked('useHypre')):
+                            precond = element.text('linearSystemPreconditioning')
                             self._addSifLine('  Linear System Preconditioning = ', precond)
-                        self._addSifLine('  Linear System ILUT Tolerance = ', str(element.linearSystemILUTToleranceEdit.text()).strip())
-                        self._addSifLineBool("  Linear System Abort Not Converged = ", element.linearSystemAbortWhenNotConvergedCheck.isChecked())
-                        self._addSifLine('  Linear System Residual Output = ', str(element.linearSystemResidualOutputEdit.text()).strip())
-                        self._addSifLine('  Linear System Precondition Recompute = ', str(element.linearSystemPreconditionRecomputeEdit.text()).strip())
-                    elif element.linearSystemSolverMultigrid.isChecked():
+                        self._addSifLine('  Linear System ILUT Tolerance = ', element.text('linearSystemILUTToleranceEdit'))
+                        self._addSifLineBool("  Linear System Abort Not Converged = ", element.isChecked('linearSystemAbortWhenNotConvergedCheck'))
+                        self._addSifLine('  Linear System Residual Output = ', element.text('linearSystemResidualOutputEdit'))
+                        self._addSifLine('  Linear System Precondition Recompute = ', element.text('linearSystemPreconditionRecomputeEdit'))
+                    elif element.isChecked('linearSystemSolverMultigrid'):
                         precond = "Multigrid"
                         self._addSifLine('  Linear System Solver = ', 'Multigrid');
                     self._addSifLine('  ! ToDo: Add missing parameters!!', '')
 
                     # Parallel
-                    if element.useHypre.isChecked():
+                    if element.isChecked('useHypre'):
                         self._addSifLine("  Linear System Use HYPRE = ", "True");
-                        if element.useParasails.isChecked():
+                        if element.isChecked('useParasails'):
                             self._addSifLine('  Linear System Preconditioning = ', 'ParaSails');
-                            self._addSifLine('  ParaSails Threshold = ', str(element.thresholdEdit.text()).strip())
-                            self._addSifLine('  ParaSails Filter = ', str(element.filterEdit.text()).strip())
-                            self._addSifLine('  ParaSails MaxLevel = ', str(element.maxLevelEdit.text()).strip())
-                            self._addSifLine('  ParaSails Symmetry = ', str(element.symmetryEdit.text()).strip())
-                        if(element.useBoomerAMG.isChecked()):
+                            self._addSifLine('  ParaSails Threshold = ', element.text('thresholdEdit'))
+                            self._addSifLine('  ParaSails Filter = ', element.text('filterEdit'))
+                            self._addSifLine('  ParaSails MaxLevel = ', element.text('maxLevelEdit'))
+                            self._addSifLine('  ParaSails Symmetry = ', element.text('symmetryEdit'))
+                        if(element.isChecked('useBoomerAMG')):
                             self._addSifLine('  Linear System Preconditioning = ', 'BoomerAMG');
-                            self._addSifLine('  BoomerAMG Relax Type = ', str(element.boomerRelaxation.currentIndex()).strip())
-                            self._addSifLine('  BoomerAMG Coarsen Type = ', str(element.boomerCoarsening.currentIndex()).strip())
-                            self._addSifLine('  BoomerAMG Num Sweeps = ', str(element.boomerSweeps.text()).strip())
-                            self._addSifLine('  BoomerAMG Max Levels = ', str(element.boomerMaxLevels.text()).strip())
-                            self._addSifLine('  BoomerAMG Interpolation = ', str(element.boomerInterpolation.currentIndex()))
-                            self._addSifLine('  BoomerAMG Smooth Type = ', str(element.boomerSmoother.currentIndex()));
-                            self._addSifLine('  BoomerAMG Cycle Type = ', str(element.boomerCycle.currentIndex()))
+                            self._addSifLine('  BoomerAMG Relax Type = ', str(element.currentIndex('boomerRelaxation')))
+                            self._addSifLine('  BoomerAMG Coarsen Type = ', str(element.currentIndex('boomerCoarsening')))
+                            self._addSifLine('  BoomerAMG Num Sweeps = ', element.text('boomerSweeps'))
+                            self._addSifLine('  BoomerAMG Max Levels = ', element.text('boomerMaxLevels'))
+                            self._addSifLine('  BoomerAMG Interpolation = ', str(element.currentIndex('boomerInterpolation')))
+                            self._addSifLine('  BoomerAMG Smooth Type = ', str(element.currentIndex('boomerSmoother')));
+                            self._addSifLine('  BoomerAMG Cycle Type = ', str(element.currentIndex('boomerCycle')))
 
                     # Adaptive
-                    if element.adaptiveMeshRefinementCheck.isChecked():
-                        self._addSifLineBool('  Adaptive Mesh Refinement = ', element.adaptiveMeshRefinementCheck.isChecked())
-                        self._addSifLine('  Adaptive Mesh Name = ', str(element.adaptiveMeshNameEdit.text()).strip())
-                        self._addSifLineBool('  Adaptive Remesh = ', element.adaptiveReMeshCheck.isChecked())
-                        self._addSifLineBool('  Adaptive Save Mesh = ', element.adaptiveSaveMeshCheck.isChecked())
-                        self._addSifLineBool('  Adaptive Coarsening = ', element.adaptiveCoarseningCheck.isChecked())
-                        self._addSifLine('  Adaptive Error Limit = ', str(element.adaptiveErrorLimitEdit.text()).strip())
-                        self._addSifLine('  Adaptive Min H = ', str(element.adaptiveMinHEdit.text()).strip())
-                        self._addSifLine('  Adaptive Max H = ', str(element.adaptiveMaxHEdit.text()).strip())
-                        self._addSifLine('  Adaptive Max Change = ', str(element.adaptiveMaxChangeEdit.text()).strip())
+                    if element.isChecked('adaptiveMeshRefinementCheck'):
+                        self._addSifLineBool('  Adaptive Mesh Refinement = ', element.isChecked('adaptiveMeshRefinementCheck'))
+                        self._addSifLine('  Adaptive Mesh Name = ', element.text('adaptiveMeshNameEdit'))
+                        self._addSifLineBool('  Adaptive Remesh = ', element.isChecked('adaptiveRemeshCheck'))
+                        self._addSifLineBool('  Adaptive Save Mesh = ', element.isChecked('adaptiveSaveMeshCheck'))
+                        self._addSifLineBool('  Adaptive Coarsening = ', element.isChecked('adaptiveCoarseningCheck'))
+                        self._addSifLine('  Adaptive Error Limit = ', element.text('adaptiveErrorLimitEdit'))
+                        self._addSifLine('  Adaptive Min H = ', element.text('adaptiveMinHEdit'))
+                        self._addSifLine('  Adaptive Max H = ', element.text('adaptiveMaxHEdit'))
+                        self._addSifLine('  Adaptive Max Change = ', element.text('adaptiveMaxChangeEdit'))
 
                     if precond == "Multigrid":
-                        self._addSifLine('  MG Levels = ', str(element.mgLevelsEdit.text()).strip())
-                        self._addSifLine('  MG Mesh name = ', str(element.mgMeshNameEdit.text()).strip())
+                        self._addSifLine('  MG Levels = ', element.text('mgLevelsEdit'))
+                        self._addSifLine('  MG Mesh name = ', element.text('mgMeshNameEdit'))
                         print("Check setting for Multigrid Mesh Name")
-                        self._addSifLine('  MG Post smoothing iterations = ', str(element.mgPostSmoothingItersEdit.text()).strip())
-                        self._addSifLine('  MG Pre smoothing iterations = ', str(element.mgPreSmoothingItersEdit.text()).strip())
-                        self._addSifLine('  MG Max Iterations = ', str(element.mgMaxItersEdit.text()))
-                        self._addSifLine('  MG ILUT Tolerance = ', str(element.mgILUTEdit.text()))
-                        self._addSifLine('  MG Equal Split = ', str(element.mgEqualSplitCheck.isChecked()))
+                        self._addSifLine('  MG Post smoothing iterations = ', element.text('mgPostSmoothingItersEdit'))
+                        self._addSifLine('  MG Pre smoothing iterations = ', element.text('mgPreSmoothingItersEdit'))
+                        self._addSifLine('  MG Max Iterations = ', element.text('mgMaxItersEdit'))
+                        self._addSifLine('  MG ILUT Tolerance = ', element.text('mgILUTEdit'))
+                        self._addSifLine('  MG Equal Split = ', str(element.isChecked('mgEqualSplitCheck')))
 
 
 
@@ -311,12 +328,12 @@ class SifWriter():
 
     	# makeEquationBlocks
         idx = 0
-        for element in self._ewh.equationEditor:
+        for eqID in equations.entities():
             idx += 1
             self._writeToSif('Equation ' + str(idx))
-            self._writeToSif('  Name = "' + str(element.nameEdit.text()).strip() + '"')
-            for key, value in element.qhash.items():
-                self._makeSifEntry(value)
+            self._writeToSif('  Name = "' + str(equations.name(eqID)).strip() + '"')
+            for parameter, value in equations.values(eqID):
+                self._makeSifEntry(parameter, value)
             activeSolvers = []
             N_activeSolvers = 0
             for sol in SolverList:
@@ -332,51 +349,54 @@ class SifWriter():
             self._writeToSif('')
 
         # Materials
-        for mat in self._ewh.materialEditor:
-            self._addSifLine('Material ', str(mat.ID+1))
-            self._addSifLine('  Name = ', '"'+str(mat.nameEdit.text()).strip()+'"')
-            for key, value in mat.qhash.items():
-                self._makeSifEntry(value)
+        materials = self._ewh.getStore('Material')
+        for matID in materials.entities():
+            self._addSifLine('Material ', str(materialNumbers[matID]))
+            self._addSifLine('  Name = ', '"'+str(materials.name(matID)).strip()+'"')
+            for parameter, value in materials.values(matID):
+                self._makeSifEntry(parameter, value)
             self._writeToSif('End')
             self._writeToSif('')
 
         # Body Forces
-        for bf in self._ewh.bodyForceEditor:
-            self._addSifLine('Body Force ', str(bf.ID+1))
-            self._addSifLine('  Name = ', '"'+str(bf.nameEdit.text()).strip()+'"')
-            for key, value in bf.qhash.items():
-                self._makeSifEntry(value)
+        forces = self._ewh.getStore('BodyForce')
+        for bfID in forces.entities():
+            self._addSifLine('Body Force ', str(forceNumbers[bfID]))
+            self._addSifLine('  Name = ', '"'+str(forces.name(bfID)).strip()+'"')
+            for parameter, value in forces.values(bfID):
+                self._makeSifEntry(parameter, value)
             self._writeToSif('End')
             self._writeToSif('')
 
         # Boundary Conditions
         x = 1
-        for bc in self._ewh.boundaryConditionEditor:
-            TargetBoundaries = []
-            TargetBoundaryNumbers = []
-            for objName in self._ewh.elementProperties:
-                properties = self._ewh.elementProperties[objName]
-                if (properties.objectName() == 'boundaryPropertyDialog') and (properties.boundaryConditionCombo.currentIndex() == bc.ID+1):
-                    TargetBoundaries.append(objName)
+        boundaries = self._ewh.getStore('BoundaryCondition')
+        # boundaries by boundary condition
+        targets = {}
+        for objName, properties in self._ewh.elementProperties.boundaries():
+            targets.setdefault(properties[0], []).append(objName)
+        for bcID in boundaries.entities():
+            TargetBoundaries = targets.get(bcID, [])
             if len(TargetBoundaries) > 0:
                 for name in TargetBoundaries:
                     self._addSifLine('Boundary Condition ', str(x))
     #                self._writeToSif('  Target Boundaries('+str(len(TargetBoundaries))+') = ' + bcStr )
     #                self._writeToSif('  Name = ' + '"'+str(bc.nameEdit.text()).strip()+'"')
                     self._writeToSif('  Name = ' + '"'+str(name).strip()+'"')
-                    for key, value in bc.qhash.items():
-                        self._makeSifEntry(value)
+                    for parameter, value in boundaries.values(bcID):
+                        self._makeSifEntry(parameter, value)
                     self._writeToSif('! ToDo: Periodic BCs')
                     self._writeToSif('End')
                     self._writeToSif('')
                     x += 1
 
         # Initial Conditions
-        for ic in self._ewh.initialConditionEditor:
-            self._addSifLine('Initial Condition ', str(ic.ID+1))
-            self._addSifLine('  Name = ', '"'+str(ic.nameEdit.text()).strip()+'"')
-            for key, value in ic.qhash.items():
-                self._makeSifEntry(value)
+        initials = self._ewh.getStore('InitialCondition')
+        for icID in initials.entities():
+            self._addSifLine('Initial Condition ', str(initialNumbers[icID]))
+            self._addSifLine('  Name = ', '"'+str(initials.name(icID)).strip()+'"')
+            for parameter, value in initials.values(icID):
+                self._makeSifEntry(parameter, value)
             self._writeToSif('End')
             self._writeToSif('')
 
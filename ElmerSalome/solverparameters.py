@@ -8,10 +8,61 @@ Solver parameter editor class
 """
 try:
     from PyQt4 import QtGui
-    from PyQt4 import uic
 except ImportError:
     from PyQt5 import QtWidgets as QtGui
-    from PyQt5 import uic
+
+import uiforms
+
+# objectNames of the widgets of the SolverParameterEditor by sif keyword
+SIF_KEYWORDS = {'Stabilize': 'stabilizeCheck',
+                'Bubbles': 'bubblesCheck',
+                'Lumped Mass Matrix': 'lumpedMassCheck',
+                'Optimize Bandwidth': 'optimizeBandwidthCheck',
+                'Steady State Convergence Tolerance': 'steadyStateConvergenceToleranceEdit',
+                'Steady State Convergence Measure': 'steadyStateConvergenceMeasureCombo',
+                'Nonlinear System Convergence Tolerance': 'nonlinSystemConvergenceToleranceEdit',
+                'Nonlinear System Max Iterations': 'nonlinSystemMaxIterationEdit',
+                'Nonlinear System Relaxation Factor': 'nonlinSystemRelaxationFactorEdit',
+                'Nonlinear System Convergence Measure': 'nonlinSystemConvergenceMeasureCombo',
+                'Nonlinear System Newton After Iterations': 'nonlinSystemNewtonAfterIterEdit',
+                'Nonlinear System Newton After Tolerance': 'nonlinSystemNewtonAfterTolEdit',
+                'Linear System Direct Method': 'linearSystemDirectMethod',
+                'Linear System Iterative Method': 'linearSystemIterativeMethod',
+                'Linear System Max Iterations': 'linearSystemMaxIterationsEdit',
+                'Linear System Convergence Tolerance': 'linearSystemConvergenceToleranceEdit',
+                'BiCGstabl polynomial degree': 'linearSystemBiCGstablPolDeg',
+                'Linear System Preconditioning': 'linearSystemPreconditioning',
+                'Linear System ILUT Tolerance': 'linearSystemILUTToleranceEdit',
+                'Linear System Abort Not Converged': 'linearSystemAbortWhenNotConvergedCheck',
+                'Linear System Residual Output': 'linearSystemResidualOutputEdit',
+                'Linear System Precondition Recompute': 'linearSystemPreconditionRecomputeEdit',
+                'ParaSails Threshold': 'thresholdEdit',
+                'ParaSails Filter': 'filterEdit',
+                'ParaSails MaxLevel': 'maxLevelEdit',
+                'ParaSails Symmetry': 'symmetryEdit',
+                'BoomerAMG Relax Type': 'boomerRelaxation',
+                'BoomerAMG Coarsen Type': 'boomerCoarsening',
+                'BoomerAMG Num Sweeps': 'boomerSweeps',
+                'BoomerAMG Max Levels': 'boomerMaxLevels',
+                'BoomerAMG Interpolation': 'boomerInterpolation',
+                'BoomerAMG Smooth Type': 'boomerSmoother',
+                'BoomerAMG Cycle Type': 'boomerCycle',
+                'Adaptive Mesh Refinement': 'adaptiveMeshRefinementCheck',
+                'Adaptive Mesh Name': 'adaptiveMeshNameEdit',
+                'Adaptive Remesh': 'adaptiveRemeshCheck',
+                'Adaptive Save Mesh': 'adaptiveSaveMeshCheck',
+                'Adaptive Coarsening': 'adaptiveCoarseningCheck',
+                'Adaptive Error Limit': 'adaptiveErrorLimitEdit',
+                'Adaptive Min H': 'adaptiveMinHEdit',
+                'Adaptive Max H': 'adaptiveMaxHEdit',
+                'Adaptive Max Change': 'adaptiveMaxChangeEdit',
+                'MG Levels' : 'mgLevelsEdit',
+                'MG Mesh name' : 'mgMeshNameEdit',
+                'MG Post smoothing iterations' : 'mgPostSmoothingItersEdit',
+                'MG Pre smoothing iterations' : 'mgPreSmoothingItersEdit',
+                'MG Max Iterations' : 'mgMaxItersEdit',
+                'MG ILUT Tolerance' : 'mgILUTEdit',
+                'MG Equal Split' : 'mgEqualSplitCheck'}
 
 
 class SolverParameterEditor(QtGui.QDialog):
@@ -27,7 +78,7 @@ class SolverParameterEditor(QtGui.QDialog):
             window.
         """
         super(SolverParameterEditor, self).__init__()
-        uic.loadUi(path_forms.joinpath("solverparameters.ui"), self)
+        uiforms.loadUi(path_forms.joinpath("solverparameters.ui"), self)
 
         self.applyButton.clicked.connect(self.close)
 
@@ -62,3 +113,213 @@ class SolverParameterEditor(QtGui.QDialog):
             self.parasailsGroup.setEnabled(True)
         else:
             self.parasailsGroup.setEnabled(True)
+
+
+# default values of the solver parameter form by path of the forms directory
+_defaults = {}
+
+
+def formDefaults(path_forms):
+    """Returns the default values of the solver parameter form. The form is
+    created only once per session to collect them.
+
+    Args:
+    -----
+    path_forms: str
+        String containing the path to the ui-files
+
+    Return:
+    -------
+    tuple
+        dict of (type, value) by objectName, dict of the items of the combo
+        boxes by objectName and dict of the other radio buttons of the same
+        group by objectName
+    """
+    key = str(path_forms)
+    if key not in _defaults:
+        form = SolverParameterEditor(path_forms)
+        values = {}
+        for name, qtype, value in uiforms.widgetValues(form):
+            values.update({name: (qtype, value)})
+        items = {}
+        for widget in form.findChildren(QtGui.QComboBox):
+            items.update({str(widget.objectName()): [str(widget.itemText(i)) for i in range(widget.count())]})
+        exclusive = {}
+        for widget in form.findChildren(QtGui.QRadioButton):
+            group = [str(x.objectName()) for x in widget.parent().findChildren(QtGui.QRadioButton)
+                     if x.parent() is widget.parent() and x is not widget]
+            exclusive.update({str(widget.objectName()): group})
+        form.deleteLater()
+        _defaults.update({key: (values, items, exclusive)})
+    return _defaults[key]
+
+
+def _widgetText(widget):
+    """Returns the text of a checkbox, radio button or group box or the text
+    of the label in the same row of the grid layout of the widget"""
+    if isinstance(widget, QtGui.QGroupBox):
+        return str(widget.title())
+    elif isinstance(widget, (QtGui.QCheckBox, QtGui.QRadioButton)):
+        return str(widget.text())
+    layout = widget.parentWidget().layout()
+    if isinstance(layout, QtGui.QGridLayout) and layout.indexOf(widget) >= 0:
+        row = layout.getItemPosition(layout.indexOf(widget))[0]
+        for column in range(layout.columnCount()):
+            item = layout.itemAtPosition(row, column)
+            if item is not None and isinstance(item.widget(), QtGui.QLabel):
+                return str(item.widget().text())
+    return ""
+
+
+# tab and text of the widgets of the solver parameter form by path of the forms directory
+_pages = {}
+
+
+def formPages(path_forms):
+    """Returns the tab and the text of the input widgets of the solver
+    parameter form. The form is created only once per session to collect
+    them.
+
+    Args:
+    -----
+    path_forms: str
+        String containing the path to the ui-files
+
+    Return:
+    -------
+    dict
+        (tab title, text) by objectName, the text of checkboxes and radio
+        buttons or the labels of the group box of the widget
+    """
+    key = str(path_forms)
+    if key not in _pages:
+        form = SolverParameterEditor(path_forms)
+        tabs = form.solverControlTabs
+        pages = {}
+        for i in range(tabs.count()):
+            title = str(tabs.tabText(i))
+            for name, qtype, value in uiforms.widgetValues(tabs.widget(i)):
+                widget = getattr(form, name)
+                pages.update({name: (title, _widgetText(widget))})
+        form.deleteLater()
+        _pages.update({key: pages})
+    return _pages[key]
+
+
+class SolverSettings():
+    """Lightweight record of the settings of a solver. The values are kept by
+    the objectName of the widgets of the SolverParameterEditor, only values
+    differing from the form defaults are stored. The dialog is created when
+    the user opens it, from then on the record reads and writes the widgets.
+    """
+
+    def __init__(self, path_forms, solverName, ID):
+        """Constructor.
+
+        Args:
+        -----
+        path_forms: str
+            String containing the path to the ui-files
+        solverName: str
+            name of the solver
+        ID: int
+            ID of the solver, index of the solver tab
+        """
+        # public
+        self.solverName = solverName
+        self.ID = ID
+        self.editor = None
+
+        # private
+        self._path_forms = path_forms
+        self._values = {}
+
+    def attach(self, editor):
+        """Makes the dialog the holder of the settings.
+
+        Args:
+        -----
+        editor: SolverParameterEditor-class
+            the newly created dialog of the solver
+        """
+        for name, value in self._values.items():
+            uiforms.setWidgetValue(getattr(editor, name), value)
+        self._values = {}
+        self.editor = editor
+
+    def detach(self):
+        """Takes the values back from the dialog and releases it. The dialog
+        is created again when the user opens it."""
+        editor = self.editor
+        if editor is None:
+            return
+        values = {}
+        for name, qtype, value in self.changed():
+            values.update({name: value})
+        self.editor = None
+        self._values = values
+        if editor.generalOptions is not None:
+            editor.generalOptions.dispose()
+            editor.generalOptions = None
+        editor.applyButton.clicked.disconnect()
+        editor.deleteLater()
+
+    def value(self, name):
+        """Returns the value of the widget objectName"""
+        if self.editor is not None:
+            return uiforms.widgetValue(getattr(self.editor, name))[1]
+        if name in self._values:
+            return self._values[name]
+        return formDefaults(self._path_forms)[0][name][1]
+
+    def setValue(self, name, value):
+        """Changes the value of the widget objectName"""
+        if self.editor is not None:
+            uiforms.setWidgetValue(getattr(self.editor, name), value)
+            return
+        defaults, items, exclusive = formDefaults(self._path_forms)
+        qtype = defaults[name][0]
+        if qtype == "Combo" and value not in items[name]:
+            value = ""
+        if name in exclusive and value:
+            for other in exclusive[name]:
+                self._setValue(defaults, other, False)
+        self._setValue(defaults, name, value)
+
+    def _setValue(self, defaults, name, value):
+        if value == defaults[name][1]:
+            self._values.pop(name, None)
+        else:
+            self._values.update({name: value})
+
+    def valueType(self, name):
+        """Returns the type (Edit, TextEdit, Combo, CheckBox, SpinBox) of the
+        widget objectName"""
+        return formDefaults(self._path_forms)[0][name][0]
+
+    def isChecked(self, name):
+        """Returns the state of the checkbox or radio button objectName"""
+        return bool(self.value(name))
+
+    def text(self, name):
+        """Returns the stripped text of the edit or combo box objectName"""
+        return str(self.value(name)).strip()
+
+    def currentIndex(self, name):
+        """Returns the index of the current item of the combo box objectName"""
+        items = formDefaults(self._path_forms)[1][name]
+        value = self.value(name)
+        if value in items:
+            return items.index(value)
+        return -1
+
+    def changed(self):
+        """Returns (objectName, type, value) of all values differing from the
+        defaults."""
+        defaults = formDefaults(self._path_forms)[0]
+        changes = []
+        for name in sorted(defaults):
+            value = self.value(name)
+            if value != defaults[name][1]:
+                changes.append((name, defaults[name][0], value))
+        return changes
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+Compiled ui-forms
+
+Replacement for uic.loadUi. The ui-files are compiled only once into Python
+modules that are kept in the __pycache__ directory of the forms directory.
+The compiled form classes are additionally cached for the session. A form is
+recompiled as soon as the ui-file is newer than the compiled module.
+"""
+try:
+    from PyQt4 import QtGui
+    from PyQt4 import uic
+except ImportError:
+    from PyQt5 import QtWidgets as QtGui
+    from PyQt5 import uic
+
+import io
+import os
+
+# compiled form classes by path of the ui-file, (mtime, class)
+_forms = {}
+
+
+def _compile(uiFile, pyFile):
+    """Compiles a ui-file into Python code and tries to cache it as a module.
+
+    Args:
+    -----
+    uiFile: str
+        path to the ui-file
+    pyFile: str
+        path to the compiled module
+
+    Return:
+    -------
+    str
+        source code of the compiled form
+    """
+    code = io.StringIO()
+    uic.compileUi(uiFile, code)
+    # resources of ElmerGUI are not available, same behaviour as uic.loadUi
+    source = "\n".join([line for line in code.getvalue().splitlines()
+                        if not (line.startswith("import ") and line.endswith("_rc"))])
+    try:
+        if not os.path.isdir(os.path.dirname(pyFile)):
+            os.makedirs(os.path.dirname(pyFile))
+        with open(pyFile, 'w') as f:
+            f.write(source)
+    except (IOError, OSError):
+        # forms directory is read-only, use session cache only
+        pass
+    return source
+
+
+def formClass(uiFile):
+    """Returns the compiled form class of a ui-file.
+
+    Args:
+    -----
+    uiFile: str
+        path to the ui-file
+
+    Return:
+    -------
+    class
+        Ui_-class of the form providing setupUi
+    """
+    uiFile = str(uiFile)
+    mtime = os.path.getmtime(uiFile)
+    cached = _forms.get(uiFile)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    directory, name = os.path.split(uiFile)
+    pyFile = os.path.join(directory, "__pycache__",
+                          os.path.splitext(name)[0] + "_ui.py")
+    if os.path.exists(pyFile) and os.path.getmtime(pyFile) >= mtime:
+        with open(pyFile) as f:
+            source = f.read()
+    else:
+        source = _compile(uiFile, pyFile)
+
+    namespace = {}
+    exec(compile(source, pyFile, 'exec'), namespace)
+    form = [value for key, value in namespace.items() if key.startswith("Ui_")][0]
+    _forms.update({uiFile: (mtime, form)})
+    return form
+
+
+def loadUi(uiFile, widget):
+    """Sets up the widget with the compiled form of the ui-file, same as
+    uic.loadUi(uiFile, widget).
+
+    Args:
+    -----
+    uiFile: str
+        path to the ui-file
+    widget: QWidget
+        widget to set up, gets all named child widgets as attributes
+    """
+    ui = formClass(uiFile)()
+    ui.setupUi(widget)
+    widget.__dict__.update(vars(ui))
+
+
+def widgetValue(widget):
+    """Returns type and value of an input widget.
+
+    Args:
+    -----
+    widget: QWidget
+        input widget of a form
+
+    Return:
+    -------
+    tuple
+        (type, value) with type Edit, TextEdit, Combo, CheckBox or SpinBox,
+        None if the widget is no input widget
+    """
+    if isinstance(widget, QtGui.QLineEdit):
+        return ("Edit", str(widget.text()))
+    elif isinstance(widget, QtGui.QTextEdit):
+        return ("TextEdit", str(widget.toPlainText()))
+    elif isinstance(widget, QtGui.QComboBox):
+        return ("Combo", str(widget.currentText()))
+    elif isinstance(widget, (QtGui.QCheckBox, QtGui.QRadioButton)):
+        return ("CheckBox", widget.isChecked())
+    elif isinstance(widget, QtGui.QGroupBox) and widget.isCheckable():
+        return ("CheckBox", widget.isChecked())
+    elif isinstance(widget, (QtGui.QSpinBox, QtGui.QDoubleSpinBox)):
+        return ("SpinBox", widget.value())
+    return None
+
+
+def setWidgetValue(widget, value):
+    """Changes the value of an input widget.
+
+    Args:
+    -----
+    widget: QWidget
+        input widget of a form
+    value: str, bool or number
+        new value
+    """
+    if isinstance(widget, QtGui.QLineEdit):
+        widget.setText(value)
+    elif isinstance(widget, QtGui.QTextEdit):
+        widget.setPlainText(value)
+    elif isinstance(widget, QtGui.QComboBox):
+        widget.setCurrentIndex(widget.findText(value))
+    elif isinstance(widget, (QtGui.QCheckBox, QtGui.QRadioButton, QtGui.QGroupBox)):
+        widget.setChecked(value)
+    elif isinstance(widget, (QtGui.QSpinBox, QtGui.QDoubleSpinBox)):
+        widget.setValue(value)
+
+
+def fromString(qtype, value, widget=None):
+    """Converts the string representation of a widget value.
+
+    Args:
+    -----
+    qtype: str
+        type of the widget as returned by widgetValue
+    value: str
+        string representation of the value
+    widget: QWidget
+        spinbox the value belongs to, determines int or float
+    """
+    if qtype == "CheckBox":
+        return value == "True"
+    elif qtype == "SpinBox":
+        if isinstance(widget, QtGui.QSpinBox) or '.' not in value:
+            return int(value)
+        return float(value)
+    return value
+
+
+def widgetValues(dialog):
+    """Returns the values of all named input widgets of a dialog.
+
+    Args:
+    -----
+    dialog: QWidget
+        dialog containing the widgets
+
+    Return:
+    -------
+    list
+        list of (objectName, type, value)
+    """
+    values = []
+    for widget in dialog.findChildren(QtGui.QWidget):
+        name = str(widget.objectName())
+        if name == "" or name.startswith("qt_"):
+            continue
+        current = widgetValue(widget)
+        if current is not None:
+            values.append((name, current[0], current[1]))
+    return values
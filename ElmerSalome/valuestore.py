@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""
+Value store class
+
+Keeps the parameter values of all editors of a section independent of the
+Qt widgets, the widgets of the DynamicEditor are only views on the store.
+"""
+from array import array
+
+
+def defaultValue(param):
+    """Returns the default value of a parameter description.
+
+    Args:
+    -----
+    param: param_t
+        description of the parameter
+
+    Return:
+    -------
+    value: str, bool or None
+        default value of the parameter, None for labels
+    """
+    if param.widget_type == "CheckBox":
+        return param.default == "True"
+    elif param.widget_type == "Combo":
+        if param.items:
+            return param.items[param.active]
+        return ""
+    elif param.widget_type == "TextEdit":
+        return ""
+    elif param.widget_type == "Label":
+        return None
+    return param.default
+
+
+class SectionStore():
+    """Store of the parameter values of all entities (materials, boundary
+    conditions, ...) of a section. Every parameter of the section layout gets
+    a parameter-ID. Each entity is a sparse row: only the values differing
+    from the defaults are kept, as an array of parameter-IDs and a parallel
+    list of values. A lookup searches the parameter-IDs of the entity, i.e.
+    only its changed values."""
+
+    def __init__(self, sectionLayout):
+        """Constructor
+
+        Args:
+        -----
+        sectionLayout: SectionLayout-class
+            layout description of the section
+        """
+        # public
+        self.section = sectionLayout.section
+        self.params = []  # param_t by parameter-ID
+        self.defaults = []  # default values by parameter-ID
+        self.index = {}  # parameter-ID by path
+        self.sifIndex = {}  # list of parameter-IDs by sif name
+
+        # private
+        self._names = {}  # entity names by ID, in order of creation
+        self._ids = {}  # array of parameter-IDs by entity ID
+        self._values = {}  # list of values by entity ID
+
+        for name, params in sectionLayout.tabs:
+            for param in params:
+                pid = len(self.params)
+                self.params.append(param)
+                self.defaults.append(defaultValue(param))
+                self.index.update({param.path: pid})
+                self.sifIndex.setdefault(param.sifName, []).append(pid)
+
+    def addEntity(self, ID, name):
+        """Adds a new entity with default values.
+
+        Args:
+        -----
+        ID: int
+            ID of the entity
+        name: str
+            name of the entity
+        """
+        self._names.update({ID: name})
+        self._ids.update({ID: array('i')})
+        self._values.update({ID: []})
+
+    def removeEntity(self, ID):
+        """Removes an entity and its values.
+
+        Args:
+        -----
+        ID: int
+            ID of the entity
+        """
+        self._names.pop(ID, None)
+        self._ids.pop(ID, None)
+        self._values.pop(ID, None)
+
+    def hasEntity(self, ID):
+        """Checks if entity ID is in the store"""
+        return ID in self._names
+
+    def entities(self):
+        """Returns the IDs of all entities in order of creation"""
+        return list(self._names.keys())
+
+    def name(self, ID):
+        """Returns the name of entity ID"""
+        return self._names[ID]
+
+    def setName(self, ID, name):
+        """Changes the name of entity ID"""
+        self._names.update({ID: name})
+
+    def value(self, ID, pid):
+        """Returns the value of a parameter of an entity.
+
+        Args:
+        -----
+        ID: int
+            ID of the entity
+        pid: int
+            parameter-ID
+        """
+        ids = self._ids[ID]
+        try:
+            return self._values[ID][ids.index(pid)]
+        except ValueError:
+            return self.defaults[pid]
+
+    def valueOf(self, ID, path, default=None):
+        """Returns the value of a parameter given by its path
+        ("/PDE/Section/Name") or default if there is no such parameter."""
+        pid = self.index.get(path)
+        if pid is None:
+            return default
+        return self.value(ID, pid)
+
+    def setValue(self, ID, pid, value):
+        """Changes the value of a parameter of an entity. Values equal to the
+        default are not stored.
+
+        Args:
+        -----
+        ID: int
+            ID of the entity
+        pid: int
+            parameter-ID
+        value: str or bool
+            new value
+
+        Return:
+        -------
+        bool
+            True if the value has changed
+        """
+        ids = self._ids[ID]
+        values = self._values[ID]
+        try:
+            pos = ids.index(pid)
+        except ValueError:
+            pos = -1
+        if value == self.defaults[pid]:
+            if pos < 0:
+                return False
+            del ids[pos]
+            del values[pos]
+            return True
+        if pos < 0:
+            ids.append(pid)
+            values.append(value)
+            return True
+        if values[pos] == value:
+            return False
+        values[pos] = value
+        return True
+
+    def setValueOf(self, ID, path, value):
+        """Changes the value of a parameter given by its path, returns False
+        if there is no such parameter."""
+        pid = self.index.get(path)
+        if pid is None:
+            return False
+        return self.setValue(ID, pid, value)
+
+    def updateValues(self, ids, pids, function):
+        """Changes parameters of many entities in one pass.
+
+        Args:
+        -----
+        ids: list
+            IDs of the entities
+        pids: list
+            parameter-IDs of the parameters to change
+        function: callable
+            called with (param_t, current value), returns the new value or
+            None to keep the current one
+
+        Return:
+        -------
+        list
+            IDs of the entities with at least one changed value
+        """
+        changed = []
+        for ID in ids:
+            touched = False
+            for pid in pids:
+                value = function(self.params[pid], self.value(ID, pid))
+                if value is not None and self.setValue(ID, pid, value):
+                    touched = True
+            if touched:
+                changed.append(ID)
+        return changed
+
+    def values(self, ID):
+        """Returns (param_t, value) of all parameters of an entity in the
+        order of the section layout."""
+        current = list(self.defaults)
+        for pid, value in zip(self._ids[ID], self._values[ID]):
+            current[pid] = value
+        return zip(self.params, current)
+
+    def changed(self, ID):
+        """Returns (parameter-ID, value) of all parameters of an entity that
+        differ from the defaults."""
+        return list(zip(self._ids[ID], self._values[ID]))
+
+    def reset(self, ID):
+        """Sets all parameters of an entity to their defaults"""
+        self._ids.update({ID: array('i')})
+        self._values.update({ID: []})
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Watchdog class
+
+Watches a running solver for two signs of a run that will not finish in a
+useful time: the relative change of the nonlinear or steady state iterations
+of a solver has not improved for a number of iterations, or the solver has
+not written any output for a given time. The run is either aborted, which
+frees its cores for the next jobs of the queue, or only flagged.
+"""
+try:
+    from PyQt4 import QtCore
+except ImportError:
+    from PyQt5 import QtCore
+
+import time
+
+import numpy as np
+
+import convergence
+
+# default number of iterations without improvement
+DEFAULT_ITERATIONS = 50
+
+# default time without output in seconds
+DEFAULT_TIMEOUT = 600
+
+# interval of the checks in milliseconds
+CHECK_INTERVAL = 1000
+
+
+class Watchdog(QtCore.QObject):
+    """Checks the convergence monitor and the output of a pipeline. The
+    improvement is counted per solver and kind of iteration, it restarts with
+    every new nonlinear or steady state loop (iteration 1), e.g. in the next
+    timestep."""
+
+    # signals
+    triggered = QtCore.pyqtSignal(str, name="triggered")
+
+    def __init__(self, pipeline, monitor, iterations=DEFAULT_ITERATIONS, timeout=DEFAULT_TIMEOUT,
+                 abort=True, interval=CHECK_INTERVAL):
+        """Constructor
+
+        Args:
+        -----
+        pipeline: Pipeline-class
+            pipeline of the run, watched from the start of its first stage
+            until it has finished
+        monitor: ConvergenceMonitor-class
+            parser of the output of the pipeline
+        iterations: int
+            number of iterations without a smaller relative change, 0 to not
+            check the convergence
+        timeout: float
+            time without output in seconds, 0 to not check the output
+        abort: bool
+            kill the pipeline when triggered, otherwise the run is only
+            flagged
+        interval: int
+            interval of the checks in milliseconds
+        """
+        super(Watchdog, self).__init__()
+
+        # public
+        self.pipeline = pipeline
+        self.monitor = monitor
+        self.iterations = iterations
+        self.timeout = timeout
+        self.abort = abort
+        self.reason = None  # why the watchdog was triggered, None if not
+        self.lastOutput = None  # time of the last output
+
+        # private
+        # by solver the rows seen and (smallest change, iterations since) by kind
+        self._progress = {}
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self.check)
+
+        pipeline.output.connect(self._output)
+        pipeline.stageStarted.connect(self._stageStarted)
+        pipeline.finished.connect(lambda success: self._timer.stop())
+
+    def check(self):
+        """Checks the run, triggers the watchdog if it has stalled"""
+        if self.reason is not None:
+            return
+        if self.iterations > 0:
+            for solver, buffer in list(self.monitor.buffers.items()):
+                stalled = self._stalled(solver, buffer)
+                if stalled is not None:
+                    self._trigger("{} iterations of {} without improvement of the relative change".format(
+                        stalled, solver))
+                    return
+        if self.timeout > 0 and self.lastOutput is not None and time.time() - self.lastOutput > self.timeout:
+            self._trigger("No output for {:.0f} s".format(time.time() - self.lastOutput))
+
+    def _stalled(self, solver, buffer):
+        """Updates the progress of a solver with the iterations added since
+        the last check, returns the number of iterations without improvement
+        if it has reached the limit, None otherwise"""
+        progress = self._progress.get(solver)
+        if progress is None:
+            progress = {}
+            self._progress.update({solver: progress})
+        new = buffer.count - progress.get("seen", 0)
+        if new <= 0:
+            return None
+        progress.update({"seen": buffer.count})
+        rows = buffer.values()[-min(new, len(buffer)):]
+        for row in rows:
+            kind = int(row[convergence.KIND])
+            change = row[convergence.CHANGE]
+            best, since = progress.get(kind, (np.inf, 0))
+            if row[convergence.ITERATION] <= 1:
+                best, since = change, 0
+            elif change < best:
+                best, since = change, 0
+            else:
+                since += 1
+            progress.update({kind: (best, since)})
+            if since >= self.iterations:
+                return since
+        return None
+
+    def _trigger(self, reason):
+        self.reason = reason
+        self._timer.stop()
+        self.triggered.emit(reason)
+        if self.abort:
+            self.pipeline.kill()
+
+    def _output(self, text):
+        self.lastOutput = time.time()
+
+    def _stageStarted(self, name):
+        # a stage may take a while until it writes the first line
+        self.lastOutput = time.time()
+        if self.reason is None and not self._timer.isActive():
+            self._timer.start()
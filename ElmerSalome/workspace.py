@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+Workspace class
+
+Working directory and environment of a solver run. A run either works in the
+case directory or in a copy of the case in a scratch directory, e.g. on a
+fast local disk, from which the new and changed files are copied back after
+the run. The setup file and the log file are written to the working
+directory of the run, the working directory of the Salome process is never
+changed.
+"""
+try:
+    from PyQt4 import QtCore
+except ImportError:
+    from PyQt5 import QtCore
+
+import os
+import shutil
+import tempfile
+
+import partitioncache
+
+# results of previous runs and the inactive partitionings are not copied to
+# the scratch directory
+CLONE_IGNORE = ["*.vtu", "*.pvtu", "*.ep", "*.result", "*.log", partitioncache.STASH]
+
+
+class Workspace():
+    """Working directory, sif-file, mesh directory and environment of a
+    run"""
+
+    def __init__(self, sifFile, meshDirectory, scratch=None, copyBack=True, env=None):
+        """Constructor
+
+        Args:
+        -----
+        sifFile: str
+            sif-file of the case
+        meshDirectory: str
+            mesh directory of the case
+        scratch: str, optional
+            directory receiving the copy of the case, the run works in the
+            case directory if not given
+        copyBack: bool
+            copy the new and changed files back to the case directory after
+            a run in the scratch directory
+        env: dict, optional
+            environment variables of the run, added to the ones of the
+            Salome process
+        """
+        # public
+        self.caseDirectory = os.path.dirname(os.path.abspath(sifFile))
+        self.scratch = scratch
+        self.copyBack = copyBack
+        self.env = dict(env or {})
+        self.directory = self.caseDirectory  # working directory of the run
+        self.sifFile = os.path.abspath(sifFile)
+        self.meshDirectory = os.path.abspath(meshDirectory)
+
+        # private
+        self._caseSifFile = self.sifFile
+        self._caseMeshDirectory = self.meshDirectory
+        self._cloned = {}  # (size, mtime) by path relative to the working directory
+
+    def prepare(self, parallel=False):
+        """Creates the working directory and writes the setup file.
+
+        Args:
+        -----
+        parallel: bool
+            the solver is run by mpiexec and reads the name of the sif-file
+            from ELMERSOLVER_STARTINFO
+
+        Return:
+        -------
+        str
+            working directory of the run
+        """
+        if self.scratch:
+            name = os.path.basename(self.caseDirectory) + "_"
+            self.directory = tempfile.mkdtemp(prefix=name, dir=self.scratch)
+            self._clone()
+            self.sifFile = self._inCopy(self._caseSifFile)
+            self.meshDirectory = self._inCopy(self._caseMeshDirectory)
+        if parallel:
+            # create setup file
+            fs = open(os.path.join(self.directory, 'ELMERSOLVER_STARTINFO'), mode='w')
+            fs.writelines([os.path.basename(self.sifFile), '\n', '1'])
+            fs.close()
+        return self.directory
+
+    def sharedDirectories(self):
+        """Returns the directories the run writes to that other runs of the
+        case or of the mesh may use as well: the setup file and the results
+        are written to the case directory, ElmerGrid writes the partitioning
+        to the mesh directory. A run in the scratch directory only shares a
+        mesh directory outside of the case directory, which is not copied.
+
+        Return:
+        -------
+        set
+            absolute paths of the directories
+        """
+        if not self.scratch:
+            return set([self.caseDirectory, self._caseMeshDirectory])
+        if os.path.relpath(self._caseMeshDirectory, self.caseDirectory).startswith(os.pardir):
+            return set([self._caseMeshDirectory])
+        return set()
+
+    def environment(self):
+        """Returns the environment of the processes of the run, the one of the
+        Salome process with the variables of the workspace added. OpenMP
+        threads are restricted to one per process unless set in the Salome
+        environment or the workspace, so a run does not use more cores than
+        it has processes."""
+        environment = QtCore.QProcessEnvironment.systemEnvironment()
+        if not environment.contains("OMP_NUM_THREADS"):
+            environment.insert("OMP_NUM_THREADS", "1")
+        for key, value in self.env.items():
+            environment.insert(key, str(value))
+        return environment
+
+    def finish(self):
+        """Copies the new and changed files back to the case directory after a
+        run in the scratch directory and removes the copy of the case, the
+        paths of the workspace are reset to the case. The copy is kept if the
+        files are not copied back.
+
+        Return:
+        -------
+        list
+            files copied back, relative to the case directory
+        """
+        if not self.scratch or self.directory == self.caseDirectory:
+            return []
+        copied = []
+        if self.copyBack:
+            for path, state in self._files():
+                if self._cloned.get(path) == state:
+                    continue
+                target = os.path.join(self.caseDirectory, path)
+                targetDirectory = os.path.dirname(target)
+                if not os.path.isdir(targetDirectory):
+                    os.makedirs(targetDirectory)
+                shutil.copy2(os.path.join(self.directory, path), target)
+                copied.append(path)
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory = self.caseDirectory
+            self.sifFile = self._caseSifFile
+            self.meshDirectory = self._caseMeshDirectory
+        return copied
+
+    def _inCopy(self, path):
+        """Returns the path in the copy of the case, paths outside of the case
+        directory are not copied"""
+        relative = os.path.relpath(path, self.caseDirectory)
+        if relative.startswith(os.pardir):
+            return path
+        return os.path.normpath(os.path.join(self.directory, relative))
+
+    def _clone(self):
+        ignore = shutil.ignore_patterns(*CLONE_IGNORE)
+        for name in os.listdir(self.caseDirectory):
+            source = os.path.join(self.caseDirectory, name)
+            if ignore(self.caseDirectory, [name]):
+                continue
+            if os.path.isdir(source):
+                shutil.copytree(source, os.path.join(self.directory, name), ignore=ignore)
+            else:
+                shutil.copy2(source, self.directory)
+        self._cloned = dict(self._files())
+
+    def _files(self):
+        """Returns (path, (size, mtime)) of all files in the working directory,
+        paths relative to it"""
+        files = []
+        for root, directories, names in os.walk(self.directory):
+            for name in names:
+                path = os.path.join(root, name)
+                status = os.stat(path)
+                files.append((os.path.relpath(path, self.directory),
+                              (status.st_size, status.st_mtime)))
+        return files
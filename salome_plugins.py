@@ -44,18 +44,21 @@ sys.path.append(plugin_path)
 if not (os.path.exists(plugin_path + os.sep + "elmer_window_handler.py")):
     sys.exit("No Elmer module found")
 
-# import window handler
-import elmer_window_handler as ewh
+# import session with the window handlers
+import elmer_window_handler
+import elmersession
 
-# global variable that will contain the Elmer-class and its memory-location
-global main
+# global variables that will contain the session with all cases and the
+# Elmer-class of the current case
+global session, main
 
 # the environement variable is required to prevent the re-initialization
 # of the Elmer-class each time the menu is opened, otherwise everything will
 # be lost again,
 # see http://www.salome-platform.org/forum/forum_12/575675631/639739196
 if os.getenv("already_initialized", "0") != "1":
-    main = ewh.ElmerWindowHandler()
+    session = elmersession.Session()
+    main = session.newCase()
 
 os.environ["already_initialized"] = "1"
 
@@ -76,6 +79,8 @@ def control(context):
     global widget, about, generalSetup, showEquations, showMaterials
     global defineElementProperties, showBodyForces, showBoundaryConditions
     global showInitialConditions, createMesh, writeSif, startSolver, readSif, parallelSettings
+    global saveProject, loadProject, searchKeyword, newCase, switchCase
+    global queueSolver, showJobQueue, showConvergence, rerunSolver, showRunHistory, stopSolver
     global QtCore
 
     # QWidget
@@ -85,7 +90,11 @@ def control(context):
 
     # QPushButtons
     button_about = QtGui.QPushButton('About', widget)
+    button_new = QtGui.QPushButton('New case', widget)
+    button_switch = QtGui.QPushButton('Switch case', widget)
     button_reader = QtGui.QPushButton('Read sif file', widget)
+    button_load = QtGui.QPushButton('Load project', widget)
+    button_save = QtGui.QPushButton('Save project', widget)
     button_general = QtGui.QPushButton('General settings', widget)
     button_eq = QtGui.QPushButton('Equations', widget)
     button_mat = QtGui.QPushButton('Materials', widget)
@@ -96,11 +105,22 @@ def control(context):
     button_mesh = QtGui.QPushButton('Mesh creation', widget)
     button_sif = QtGui.QPushButton('Sif file creation', widget)
     button_parallel = QtGui.QPushButton('Parallel settings', widget)
+    button_search = QtGui.QPushButton('Search keyword', widget)
     button_solve = QtGui.QPushButton('Start ElmerSolver', widget)
+    button_rerun = QtGui.QPushButton('Rerun ElmerSolver', widget)
+    button_stop = QtGui.QPushButton('Stop ElmerSolver', widget)
+    button_queue = QtGui.QPushButton('Queue ElmerSolver', widget)
+    button_jobs = QtGui.QPushButton('Job queue', widget)
+    button_convergence = QtGui.QPushButton('Convergence', widget)
+    button_history = QtGui.QPushButton('Run history', widget)
 
     # QPushButton-Events
     button_about.clicked.connect(lambda: about(context))
+    button_new.clicked.connect(lambda: newCase(context))
+    button_switch.clicked.connect(lambda: switchCase(context))
     button_reader.clicked.connect(lambda: readSif(context))
+    button_load.clicked.connect(lambda: loadProject(context))
+    button_save.clicked.connect(lambda: saveProject(context))
     button_general.clicked.connect(lambda: generalSetup(context))
     button_eq.clicked.connect(lambda: showEquations(context))
     button_mat.clicked.connect(lambda: showMaterials(context))
@@ -111,11 +131,22 @@ def control(context):
     button_mesh.clicked.connect(lambda: createMesh(context))
     button_sif.clicked.connect(lambda: writeSif(context))
     button_parallel.clicked.connect(lambda: parallelSettings(context))
+    button_search.clicked.connect(lambda: searchKeyword(context))
     button_solve.clicked.connect(lambda: startSolver(context))
+    button_rerun.clicked.connect(lambda: rerunSolver(context))
+    button_stop.clicked.connect(lambda: stopSolver(context))
+    button_queue.clicked.connect(lambda: queueSolver(context))
+    button_jobs.clicked.connect(lambda: showJobQueue(context))
+    button_convergence.clicked.connect(lambda: showConvergence(context))
+    button_history.clicked.connect(lambda: showRunHistory(context))
 
     layout = QtGui.QVBoxLayout()
     layout.addWidget(button_about)
+    layout.addWidget(button_new)
+    layout.addWidget(button_switch)
     layout.addWidget(button_reader)
+    layout.addWidget(button_load)
+    layout.addWidget(button_save)
     layout.addWidget(button_general)
     layout.addWidget(button_eq)
     layout.addWidget(button_mat)
@@ -125,8 +156,15 @@ def control(context):
     layout.addWidget(button_ep)
     layout.addWidget(button_mesh)
     layout.addWidget(button_parallel)
+    layout.addWidget(button_search)
     layout.addWidget(button_sif)
     layout.addWidget(button_solve)
+    layout.addWidget(button_rerun)
+    layout.addWidget(button_stop)
+    layout.addWidget(button_queue)
+    layout.addWidget(button_jobs)
+    layout.addWidget(button_convergence)
+    layout.addWidget(button_history)
 
     widget.setLayout(layout)
 
@@ -412,6 +450,99 @@ def startSolver(context):
     main.start_Solver()
 
 
+def rerunSolver(context):
+    """Calls the ElmerSolver even if the results of an identical run are in
+    the result cache.
+
+    Args:
+    -----
+    context: salome context
+        Context variable provided by the Salome environment
+    """
+    global main, QtGui
+    # get active module and check if SMESH
+    active_module = context.sg.getActiveComponent()
+    if active_module != "SMESH":
+        QtGui.QMessageBox.information(None, str(active_module),
+                                "Functionality is only provided in mesh module.")
+        return
+
+    main.start_Solver(True)
+
+
+def stopSolver(context):
+    """Stops the running ElmerSolver of the current case including mpiexec
+    and all its processes.
+
+    Args:
+    -----
+    context: salome context
+        Context variable provided by the Salome environment
+    """
+    global main
+    main.stop_Solver()
+
+
+# %% job queue
+def queueSolver(context):
+    """Adds a solver run of the current case to the job queue.
+
+    Args:
+    -----
+    context: salome context
+        Context variable provided by the Salome environment
+    """
+    global main, session, QtGui
+    # get active module and check if SMESH
+    active_module = context.sg.getActiveComponent()
+    if active_module != "SMESH":
+        QtGui.QMessageBox.information(None, str(active_module),
+                                "Functionality is only provided in mesh module.")
+        return
+
+    priority, ok = QtGui.QInputDialog.getInt(None, "Queue ElmerSolver", "Priority:", 0)
+    if ok:
+        main.queueSolver(priority, session.currentName())
+
+
+def showJobQueue(context):
+    """Shows the job queue of all cases.
+
+    Args:
+    -----
+    context: salome context
+        Context variable provided by the Salome environment
+    """
+    global main
+    main.showJobQueue()
+
+
+def showConvergence(context):
+    """Shows the live convergence plot of the last solver run of the current
+    case.
+
+    Args:
+    -----
+    context: salome context
+        Context variable provided by the Salome environment
+    """
+    global main
+    main.showConvergence()
+
+
+def showRunHistory(context):
+    """Shows the recorded solver runs of all cases with their wall time, CPU
+    time and peak memory.
+
+    Args:
+    -----
+    context: salome context
+        Context variable provided by the Salome environment
+    """
+    global main
+    main.showRunHistory()
+
+
 # %% parallel settings
 def parallelSettings(context):
     """Shows the parallel settings window
@@ -460,8 +591,127 @@ def readSif(context):
     context: salome context
         Context variable provided by the Salome environment
     """
-    global main, QtGui, ewh
-    main = ewh.ElmerWindowHandler()
+    global main, QtGui, session
+    # get active module and check if SMESH
+    active_module = context.sg.getActiveComponent()
+    if active_module != "SMESH":
+        QtGui.QMessageBox.information(None, str(active_module),
+                                "Functionality is only provided in mesh module.")
+        return
+
+    # the current case is only replaced by a successfully read sif-file
+    file = elmer_window_handler.selectSifFile()
+    if file == '':
+        return
+    try:
+        main = session.resetCase(lambda case: case.sif_read(file))
+    except RuntimeError as e:
+        QtGui.QMessageBox.warning(None, "Read sif", str(e))
+
+# %% project save
+def saveProject(context):
+    """Saves the settings into a project file.
+
+    Args:
+    -----
+    context: salome context
+        Context variable provided by the Salome environment
+    """
+    global main, QtGui
+    # get active module and check if SMESH
+    active_module = context.sg.getActiveComponent()
+    if active_module != "SMESH":
+        QtGui.QMessageBox.information(None, str(active_module),
+                                "Functionality is only provided in mesh module.")
+        return
+
+    main.project_save()
+
+# %% project load
+def loadProject(context):
+    """Restores the settings from a project file.
+
+    Args:
+    -----
+    context: salome context
+        Context variable provided by the Salome environment
+    """
+    global main, QtGui, session
+    # get active module and check if SMESH
+    active_module = context.sg.getActiveComponent()
+    if active_module != "SMESH":
+        QtGui.QMessageBox.information(None, str(active_module),
+                                "Functionality is only provided in mesh module.")
+        return
+
+    # the current case is only replaced by a successfully loaded project
+    file = elmer_window_handler.selectProjectFile()
+    if file == '':
+        return
+    try:
+        main = session.resetCase(lambda case: case.project_load(file))
+    except RuntimeError as e:
+        QtGui.QMessageBox.warning(None, "Load project", str(e))
+
+# %% new case
+def newCase(context):
+    """Creates a new case in the session and makes it the current one.
+
+    Args:
+    -----
+    context: salome context
+        Context variable provided by the Salome environment
+    """
+    global main, QtGui, session
+    # get active module and check if SMESH
+    active_module = context.sg.getActiveComponent()
+    if active_module != "SMESH":
+        QtGui.QMessageBox.information(None, str(active_module),
+                                "Functionality is only provided in mesh module.")
+        return
+
+    name, ok = QtGui.QInputDialog.getText(None, "New case", "Name of the case:")
+    if not ok:
+        return
+    name = str(name).strip()
+    if name in session:
+        QtGui.QMessageBox.warning(None, "New case", "Case {} exists already".format(name))
+        return
+    main = session.newCase(name if name else None)
+
+# %% switch case
+def switchCase(context):
+    """Makes another case of the session the current one.
+
+    Args:
+    -----
+    context: salome context
+        Context variable provided by the Salome environment
+    """
+    global main, QtGui, session
+    # get active module and check if SMESH
+    active_module = context.sg.getActiveComponent()
+    if active_module != "SMESH":
+        QtGui.QMessageBox.information(None, str(active_module),
+                                "Functionality is only provided in mesh module.")
+        return
+
+    names = session.names()
+    name, ok = QtGui.QInputDialog.getItem(None, "Switch case", "Case:", names,
+                                          names.index(session.currentName()), False)
+    if ok:
+        main = session.switch(str(name))
+
+# %% keyword search
+def searchKeyword(context):
+    """Shows the dialog to search a keyword in all editors.
+
+    Args:
+    -----
+    context: salome context
+        Context variable provided by the Salome environment
+    """
+    global main, QtGui
     # get active module and check if SMESH
     active_module = context.sg.getActiveComponent()
     if active_module != "SMESH":
@@ -469,7 +719,7 @@ def readSif(context):
                                 "Functionality is only provided in mesh module.")
         return
 
-    main.sif_read()
+    main.showKeywordSearch()
 
 # %% declare Elmer-Functions to plugin manager
 sp.AddFunction('Elmer FEM', 'Elmer plugin control window', control)